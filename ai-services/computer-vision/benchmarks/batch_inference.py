@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark batched player detection on a video clip
+
+Usage (from ai-services/computer-vision):
+    python benchmarks/batch_inference.py path/to/clip.mp4 --max-frames 200
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+import cv2
+
+# Add the service root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.player_detection import PlayerDetectionService
+
+BATCH_SIZES = [1, 4, 8, 16]
+
+
+def trim_video(video_path: str, max_frames: int) -> str:
+    """Copy the first ``max_frames`` frames into a temporary clip"""
+    cap = cv2.VideoCapture(video_path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 25.0
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    
+    clip_path = os.path.join(tempfile.mkdtemp(), "clip.mp4")
+    writer = cv2.VideoWriter(clip_path, cv2.VideoWriter_fourcc(*'mp4v'), fps, (width, height))
+    
+    written = 0
+    while written < max_frames:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        writer.write(frame)
+        written += 1
+    
+    cap.release()
+    writer.release()
+    return clip_path
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("video_path")
+    parser.add_argument("--max-frames", type=int, default=200)
+    parser.add_argument("--model-path", default="models/yolov8n.pt")
+    args = parser.parse_args()
+    
+    clip_path = trim_video(args.video_path, args.max_frames)
+    service = PlayerDetectionService(args.model_path)
+    
+    # Warm up so the first measured run does not pay model initialisation
+    await service.process_video(clip_path, batch_size=1)
+    
+    print(f"🧪 Batched inference on {clip_path} ({service.device})")
+    print("=" * 50)
+    
+    baseline = None
+    for batch_size in BATCH_SIZES:
+        start = time.perf_counter()
+        results = await service.process_video(clip_path, batch_size=batch_size)
+        elapsed = time.perf_counter() - start
+        
+        if baseline is None:
+            baseline = results
+        identical = [r.model_dump() for r in results] == [r.model_dump() for r in baseline]
+        
+        fps = len(results) / elapsed if elapsed > 0 else 0.0
+        status = "✅" if identical else "❌ results differ from batch_size=1"
+        print(f"batch_size={batch_size:>2}  frames={len(results):>5}  {fps:8.2f} frames/sec  {status}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
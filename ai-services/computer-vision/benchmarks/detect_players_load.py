@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Load test single-image player detection with and without request coalescing
+
+Simulates many clients each sending one /detect-players image at a time and
+reports p50/p99 latency and throughput, first with every request running its
+own model call and then through the DetectionBatcher.
+
+Usage (from ai-services/computer-vision):
+    python benchmarks/detect_players_load.py path/to/clip.mp4 --clients 16 --requests 400
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import List
+
+import cv2
+import numpy as np
+
+# Add the service root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.inference_executor import InferenceExecutor
+from services.micro_batching import DetectionBatcher
+from services.player_detection import PlayerDetectionService
+
+
+def read_frames(video_path: str, max_frames: int) -> List[np.ndarray]:
+    """Read the first ``max_frames`` frames of a video to use as request images"""
+    cap = cv2.VideoCapture(video_path)
+    frames = []
+    while len(frames) < max_frames:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+
+    if not frames:
+        raise SystemExit(f"Could not read any frames from {video_path}")
+    return frames
+
+
+async def run_load(
+    batcher: DetectionBatcher,
+    frames: List[np.ndarray],
+    clients: int,
+    requests: int
+) -> dict:
+    """Send ``requests`` single-image requests from ``clients`` concurrent callers"""
+    latencies: List[float] = []
+    next_request = 0
+
+    async def client() -> None:
+        nonlocal next_request
+        while next_request < requests:
+            image = frames[next_request % len(frames)]
+            next_request += 1
+
+            start = time.perf_counter()
+            await batcher.detect_players(image)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        "p50_ms": float(np.percentile(latencies_ms, 50)),
+        "p99_ms": float(np.percentile(latencies_ms, 99)),
+        "throughput": len(latencies) / elapsed if elapsed > 0 else 0.0,
+        "avg_batch_size": batcher.get_metrics()["avg_batch_size"],
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("video_path")
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--window-ms", type=float, default=10.0)
+    parser.add_argument("--max-batch-size", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--model-path", default="models/yolov8n.pt")
+    args = parser.parse_args()
+
+    frames = read_frames(args.video_path, 64)
+    # Large queue so the load test measures latency rather than rejections
+    executor = InferenceExecutor(max_workers=args.workers, max_queue=args.clients * 2, timeout=None)
+    service = PlayerDetectionService(args.model_path, executor=executor)
+
+    # Warm up so the first measured run does not pay model initialisation
+    await service.detect_players_batch(frames[:args.max_batch_size])
+
+    print(f"🧪 /detect-players load: {args.clients} clients, {args.requests} requests ({service.device})")
+    print("=" * 50)
+
+    modes = [
+        ("no coalescing", DetectionBatcher(service, window_ms=0)),
+        (
+            f"coalescing {args.window_ms:g}ms/{args.max_batch_size}",
+            DetectionBatcher(service, window_ms=args.window_ms, max_batch_size=args.max_batch_size)
+        ),
+    ]
+    for name, batcher in modes:
+        stats = await run_load(batcher, frames, args.clients, args.requests)
+        print(
+            f"{name:<22}  p50={stats['p50_ms']:8.1f}ms  p99={stats['p99_ms']:8.1f}ms  "
+            f"{stats['throughput']:7.2f} req/sec  avg batch={stats['avg_batch_size']:.1f}"
+        )
+
+    executor.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Compare inference backends for player detection on a sample clip
+
+Every backend runs on the same frames. Throughput is single-frame
+frames/sec after a warm-up; accuracy is the agreement of the person boxes
+with the stock PyTorch model, matched greedily at IoU >= 0.5 (F1 of the
+matches and their mean IoU).
+
+Backends are given as ``name`` or ``name:int8``, e.g.
+    pytorch,onnxruntime,onnxruntime:int8,openvino,openvino:int8
+
+Usage (from ai-services/computer-vision):
+    python benchmarks/inference_backends.py path/to/clip.mp4 --max-frames 100 --threads 4
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+# Add the service root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.inference_backends import BackendConfig, load_detector
+
+PERSON_CLASS_ID = 0
+
+
+def read_frames(video_path: str, max_frames: int):
+    """First ``max_frames`` frames of a clip"""
+    cap = cv2.VideoCapture(video_path)
+    frames = []
+    while len(frames) < max_frames:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def person_boxes(result) -> np.ndarray:
+    """``(N, 4)`` xyxy person boxes of one result"""
+    boxes = result.boxes
+    if boxes is None or len(boxes) == 0:
+        return np.empty((0, 4), dtype=np.float32)
+    return boxes.xyxy.cpu().numpy()[boxes.cls.cpu().numpy() == PERSON_CLASS_ID]
+
+
+def iou_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pairwise IoU of two sets of xyxy boxes"""
+    top_left = np.maximum(a[:, None, :2], b[None, :, :2])
+    bottom_right = np.minimum(a[:, None, 2:], b[None, :, 2:])
+    intersection = np.prod(np.clip(bottom_right - top_left, 0, None), axis=2)
+    area_a = np.prod(a[:, 2:] - a[:, :2], axis=1)
+    area_b = np.prod(b[:, 2:] - b[:, :2], axis=1)
+    return intersection / np.maximum(area_a[:, None] + area_b[None, :] - intersection, 1e-9)
+
+
+def agreement(reference, boxes, min_iou: float = 0.5):
+    """F1 and mean IoU of boxes matched greedily to the reference boxes, over all frames"""
+    matched, ious, total_reference, total_boxes = 0, [], 0, 0
+    for ref, own in zip(reference, boxes):
+        total_reference += len(ref)
+        total_boxes += len(own)
+        if len(ref) == 0 or len(own) == 0:
+            continue
+        iou = iou_matrix(ref, own)
+        while True:
+            i, j = np.unravel_index(np.argmax(iou), iou.shape)
+            if iou[i, j] < min_iou:
+                break
+            matched += 1
+            ious.append(iou[i, j])
+            iou[i, :] = 0
+            iou[:, j] = 0
+
+    f1 = 2 * matched / max(total_reference + total_boxes, 1)
+    return f1, float(np.mean(ious)) if ious else 0.0
+
+
+def run_backend(model, frames, imgsz: int, confidence: float):
+    """Person boxes per frame and frames/sec of one model"""
+    # Warm up so the measured run does not pay initialisation
+    for frame in frames[:3]:
+        model(frame, conf=confidence, imgsz=imgsz, verbose=False)
+
+    boxes = []
+    start = time.perf_counter()
+    for frame in frames:
+        boxes.append(person_boxes(model(frame, conf=confidence, imgsz=imgsz, verbose=False)[0]))
+    return boxes, len(frames) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("video_path")
+    parser.add_argument("--max-frames", type=int, default=100)
+    parser.add_argument("--model-path", default="models/yolov8n.pt")
+    parser.add_argument("--backends", default="pytorch,onnxruntime,onnxruntime:int8,openvino,openvino:int8")
+    parser.add_argument("--imgsz", type=int, default=640)
+    parser.add_argument("--threads", type=int, default=0, help="intra-op threads, 0 for the runtime default")
+    parser.add_argument("--inter-op-threads", type=int, default=0)
+    parser.add_argument("--confidence", type=float, default=0.5)
+    args = parser.parse_args()
+
+    frames = read_frames(args.video_path, args.max_frames)
+    if not frames:
+        sys.exit(f"No frames read from {args.video_path}")
+
+    def config(spec: str) -> BackendConfig:
+        name, _, quantize = spec.partition(":")
+        return BackendConfig(name, quantize or None, args.threads, args.inter_op_threads, args.imgsz)
+
+    reference, _ = run_backend(load_detector(args.model_path, config("pytorch")), frames, args.imgsz, args.confidence)
+
+    print(f"🧪 Inference backends: {len(frames)} frames at {args.imgsz}px, {args.threads or 'default'} threads")
+    print("=" * 60)
+    print(f"{'backend':<20} {'frames/sec':>10} {'box F1':>8} {'mean IoU':>9}")
+    for spec in args.backends.split(","):
+        try:
+            model = load_detector(args.model_path, config(spec))
+        except Exception as e:
+            print(f"{spec:<20} skipped: {e}")
+            continue
+        boxes, fps = run_backend(model, frames, args.imgsz, args.confidence)
+        f1, mean_iou = agreement(reference, boxes)
+        print(f"{spec:<20} {fps:10.1f} {f1:8.3f} {mean_iou:9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark batched jersey-colour team assignment against the per-player loop
+
+Usage (from ai-services/computer-vision):
+    python benchmarks/team_assignment.py --players 22 --frames 200
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+# Add the service root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.player_detection import DETECTION_DTYPE, UNASSIGNED, PlayerDetectionService
+
+
+def legacy_team_ids(image: np.ndarray, detections: np.ndarray) -> np.ndarray:
+    """The previous per-player implementation, kept here as the baseline"""
+    team_ids = detections["team_id"].copy()
+    hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
+    
+    for i, detection in enumerate(detections):
+        x, y = int(detection["x"]), int(detection["y"])
+        w, h = int(detection["width"]), int(detection["height"])
+        
+        x1 = max(0, x - w//2)
+        y1 = max(0, y - h//2)
+        x2 = min(image.shape[1], x + w//2)
+        y2 = min(image.shape[0], y + h//2)
+        
+        if x1 < x2 and y1 < y2:
+            region = hsv[y1:y2, x1:x2]
+            cv2.calcHist([region], [0, 1], None, [180, 256], [0, 180, 0, 256])
+            
+            red_pixels = cv2.countNonZero(cv2.inRange(region, np.array([0, 50, 50]), np.array([10, 255, 255])))
+            blue_pixels = cv2.countNonZero(cv2.inRange(region, np.array([100, 50, 50]), np.array([130, 255, 255])))
+            
+            if red_pixels > blue_pixels and red_pixels > 100:
+                team_ids[i] = 1
+            elif blue_pixels > red_pixels and blue_pixels > 100:
+                team_ids[i] = 2
+            else:
+                team_ids[i] = UNASSIGNED
+    
+    return team_ids
+
+
+def synthetic_frame(rng: np.random.Generator, players: int, width: int, height: int):
+    """Grass-coloured frame with red and blue players painted onto it"""
+    frame = np.empty((height, width, 3), dtype=np.uint8)
+    frame[:] = (40, 140, 40)
+    frame += rng.integers(0, 20, frame.shape, dtype=np.uint8)
+    
+    detections = np.empty(players, dtype=DETECTION_DTYPE)
+    for i in range(players):
+        w, h = rng.uniform(15, 60), rng.uniform(40, 140)
+        x, y = rng.uniform(0, width), rng.uniform(0, height)
+        kit = (0, 0, 200) if i % 2 else (200, 60, 0)
+        cv2.rectangle(frame, (int(x - w / 3), int(y - h / 3)), (int(x + w / 3), int(y)), kit, -1)
+        detections[i] = (x, y, w, h, rng.uniform(0.5, 1.0), UNASSIGNED, UNASSIGNED, np.nan, np.nan)
+    
+    return frame, detections
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--players", type=int, default=22)
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    args = parser.parse_args()
+    
+    rng = np.random.default_rng(0)
+    samples = [synthetic_frame(rng, args.players, args.width, args.height) for _ in range(args.frames)]
+    service = PlayerDetectionService()
+    
+    timings = {}
+    outputs = {}
+    for name, assign in [("per-player loop", legacy_team_ids), ("batched", service._team_ids)]:
+        start = time.perf_counter()
+        outputs[name] = [assign(frame, detections) for frame, detections in samples]
+        timings[name] = time.perf_counter() - start
+    
+    identical = all(
+        np.array_equal(a, b) for a, b in zip(outputs["per-player loop"], outputs["batched"])
+    )
+    
+    print(f"🧪 Team assignment, {args.players} players, {args.frames} frames of {args.width}x{args.height}")
+    print("=" * 50)
+    for name, elapsed in timings.items():
+        print(f"{name:<16} {elapsed / args.frames * 1000:8.3f} ms/frame")
+    print(f"Speed-up: {timings['per-player loop'] / timings['batched']:.1f}x")
+    print("✅ Identical team IDs" if identical else "❌ Team IDs differ")
+
+
+if __name__ == "__main__":
+    main()
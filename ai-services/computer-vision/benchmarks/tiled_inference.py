@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Compare tiled inference with upscaling whole frames for small players
+
+Each mode runs on the same frames of a sample clip. Recall is measured
+against the person boxes found by the most expensive configuration
+(upscaling to --reference-imgsz), overall and for small players (boxes
+at most --small-height pixels tall), and divided by the CPU seconds the
+mode used per frame.
+
+Usage (from ai-services/computer-vision):
+    python benchmarks/tiled_inference.py path/to/broadcast.mp4 --max-frames 50
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+# Add the service root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.inference_backends import BackendConfig, load_detector
+from services.tiled_inference import TiledInference, TilingConfig, box_overlap
+
+PERSON_CLASS_ID = 0
+
+
+def read_frames(video_path: str, max_frames: int):
+    """First ``max_frames`` frames of a clip"""
+    cap = cv2.VideoCapture(video_path)
+    frames = []
+    while len(frames) < max_frames:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def person_boxes(result) -> np.ndarray:
+    """``(N, 4)`` xyxy person boxes of one result"""
+    boxes = result.boxes
+    if boxes is None or len(boxes) == 0:
+        return np.empty((0, 4), dtype=np.float32)
+    return boxes.xyxy.cpu().numpy()[boxes.cls.cpu().numpy() == PERSON_CLASS_ID]
+
+
+def run_mode(model, frames, imgsz: int, confidence: float, tiling: TiledInference = None):
+    """Person boxes per frame and CPU seconds per frame of one mode"""
+    boxes = []
+    start = time.process_time()
+    for frame in frames:
+        if tiling is None:
+            result = model(frame, conf=confidence, imgsz=imgsz, verbose=False)[0]
+        else:
+            crops, regions = tiling.crops(frame)
+            results = model(crops, conf=confidence, imgsz=tiling.config.tile_size, verbose=False)
+            result = tiling.merge(results, regions)
+        boxes.append(person_boxes(result))
+    return boxes, (time.process_time() - start) / len(frames)
+
+
+def recall(reference, boxes, small_height: float, min_iou: float = 0.5):
+    """Share of reference boxes, all and small ones, overlapped by a box at IoU >= ``min_iou``"""
+    found = total = small_found = small_total = 0
+    for ref, own in zip(reference, boxes):
+        if len(ref) == 0:
+            continue
+        hit = (box_overlap(ref, own).max(axis=1) >= min_iou) if len(own) else np.zeros(len(ref), dtype=bool)
+        small = (ref[:, 3] - ref[:, 1]) <= small_height
+        found += int(hit.sum())
+        total += len(ref)
+        small_found += int(hit[small].sum())
+        small_total += int(small.sum())
+    return found / max(total, 1), small_found / max(small_total, 1), small_total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("video_path")
+    parser.add_argument("--max-frames", type=int, default=50)
+    parser.add_argument("--model-path", default="models/yolov8n.pt")
+    parser.add_argument("--backend", default="pytorch")
+    parser.add_argument("--tile-size", type=int, default=640)
+    parser.add_argument("--overlap", type=float, default=0.2)
+    parser.add_argument("--upscale-sizes", default="1280,1920")
+    parser.add_argument("--reference-imgsz", type=int, default=2560)
+    parser.add_argument("--small-height", type=float, default=40)
+    parser.add_argument("--confidence", type=float, default=0.3)
+    args = parser.parse_args()
+
+    frames = read_frames(args.video_path, args.max_frames)
+    if not frames:
+        sys.exit(f"No frames read from {args.video_path}")
+
+    model = load_detector(args.model_path, BackendConfig(args.backend))
+    # Warm up so the first mode does not pay initialisation
+    model(frames[0], conf=args.confidence, verbose=False)
+
+    reference, _ = run_mode(model, frames, args.reference_imgsz, args.confidence)
+
+    modes = [("frame @640", 640, None)]
+    modes += [(f"frame @{size}", int(size), None) for size in args.upscale_sizes.split(",")]
+    modes += [
+        (f"tiled {mode} @{args.tile_size}", args.tile_size,
+         TiledInference(TilingConfig(mode, args.tile_size, args.overlap)))
+        for mode in ("full", "adaptive")
+    ]
+
+    print(f"🧪 Small-player detection: {len(frames)} frames, reference upscaled to {args.reference_imgsz}px")
+    print("=" * 72)
+    print(f"{'mode':<24} {'CPU s/frame':>11} {'recall':>7} {'small':>7} {'recall/CPU-s':>13}")
+    for name, imgsz, tiling in modes:
+        boxes, cpu_seconds = run_mode(model, frames, imgsz, args.confidence, tiling)
+        overall, small, _ = recall(reference, boxes, args.small_height)
+        print(f"{name:<24} {cpu_seconds:11.3f} {overall:7.3f} {small:7.3f} {overall / cpu_seconds:13.2f}")
+
+
+if __name__ == "__main__":
+    main()
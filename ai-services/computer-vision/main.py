@@ -1,22 +1,58 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException
+from fastapi import Depends, FastAPI, File, UploadFile, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from contextlib import asynccontextmanager
 import uvicorn
 from loguru import logger
 import cv2
 import numpy as np
-from typing import List, Dict, Any
+from typing import Awaitable, Callable, List, Dict, Any, Optional, Tuple
+import asyncio
 import json
 import os
+import time
+import uuid
 
 from services.player_detection import PlayerDetectionService
 from services.ball_tracking import BallTrackingService
 from services.field_mapping import FieldMappingService
+from services.frame_sampling import FrameSampler
+from services.video_jobs import VideoJobQueue, VideoJobWorker
+from services.micro_batching import DetectionBatcher
+from services.result_store import ResultWriter, iter_result_lines, read_results
+from services.tracking_store import TrackingStore, TrackingStoreWriter
+from services.frame_ring import SharedFrameRing, SharedFrameRings, StaleFrameError
+from services.inference_backends import BackendConfig
+from services.tiled_inference import TilingConfig
+from services.result_cache import FrameResultCache
+from services.inference_executor import (
+    InferenceExecutor,
+    InferenceQueueFullError,
+    InferenceTimeoutError
+)
 from models.detection_models import DetectionResult, PlayerPosition, BallPosition
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application lifespan events"""
+    # Startup: load the models in the background so /health answers at once
+    # and /ready reports when inference can be served
+    loader = asyncio.create_task(prepare_models())
+    
+    yield
+    
+    # Shutdown
+    loader.cancel()
+    video_job_worker.stop(timeout=5)
+    inference_executor.shutdown(wait=False)
+
+
 app = FastAPI(
     title="Computer Vision Service",
     description="AI-powered player detection and ball tracking for football analysis",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -28,10 +64,188 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Bounded pool for inference and image decoding, kept off the event loop
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", str(os.cpu_count() or 1)))
+inference_executor = InferenceExecutor(
+    max_workers=INFERENCE_WORKERS,
+    max_queue=int(os.getenv("INFERENCE_MAX_QUEUE", "32")),
+    timeout=float(os.getenv("INFERENCE_TIMEOUT_SECONDS", "30"))
+)
+
+# One model replica per concurrent inference call, up to 4 per model; the
+# cores are split between the replicas so concurrent calls do not
+# oversubscribe them
+MODEL_REPLICAS = int(os.getenv("MODEL_REPLICAS", str(min(INFERENCE_WORKERS, 4))))
+DEFAULT_INTRA_OP_THREADS = max(1, (os.cpu_count() or 1) // MODEL_REPLICAS) if MODEL_REPLICAS > 1 else 0
+
+# Models are loaded and warmed up in the lifespan rather than at import
+INFERENCE_BACKEND = BackendConfig(
+    name=os.getenv("INFERENCE_BACKEND", "pytorch"),
+    quantize=os.getenv("INFERENCE_QUANTIZE") or None,
+    intra_op_threads=int(os.getenv("INFERENCE_INTRA_OP_THREADS", str(DEFAULT_INTRA_OP_THREADS))),
+    inter_op_threads=int(os.getenv("INFERENCE_INTER_OP_THREADS", "0")),
+    imgsz=int(os.getenv("INFERENCE_IMGSZ", "640"))
+)
+WARMUP_FRAME_SIZE = (
+    int(os.getenv("WARMUP_FRAME_HEIGHT", "720")),
+    int(os.getenv("WARMUP_FRAME_WIDTH", "1280"))
+)
+
+# Results of frames seen before, keyed by frame content
+result_cache = FrameResultCache(
+    max_bytes=int(os.getenv("RESULT_CACHE_BYTES", str(64 * 1024 * 1024))),
+    disk_dir=os.getenv("RESULT_CACHE_DIR") or None,
+    max_disk_bytes=int(os.getenv("RESULT_CACHE_DISK_BYTES", str(1024 * 1024 * 1024)))
+)
+
 # Initialize services
-player_detection = PlayerDetectionService()
-ball_tracking = BallTrackingService()
-field_mapping = FieldMappingService()
+field_mapping = FieldMappingService(
+    executor=inference_executor,
+    keyframe_interval=int(os.getenv("FIELD_KEYFRAME_INTERVAL", "250"))
+)
+player_detection = PlayerDetectionService(
+    model_path=os.getenv("PLAYER_MODEL_PATH", "models/yolov8n.pt"),
+    executor=inference_executor,
+    model_replicas=MODEL_REPLICAS,
+    field_mapping=field_mapping,
+    backend=INFERENCE_BACKEND,
+    preload=False,
+    tiling=TilingConfig(
+        mode=os.getenv("TILING_MODE", "off"),
+        tile_size=int(os.getenv("TILE_SIZE", "640")),
+        overlap=float(os.getenv("TILE_OVERLAP", "0.2"))
+    )
+)
+ball_tracking = BallTrackingService(
+    model_path=os.getenv("BALL_MODEL_PATH", "models/yolov8n.pt"),
+    executor=inference_executor,
+    roi_size=int(os.getenv("BALL_ROI_SIZE", "320")),
+    max_lost_frames=int(os.getenv("BALL_MAX_LOST_FRAMES", "5")),
+    model_replicas=MODEL_REPLICAS,
+    backend=INFERENCE_BACKEND,
+    preload=False,
+    result_cache=result_cache
+)
+
+# Coalesce concurrent /detect-players requests into batched model calls
+detection_batcher = DetectionBatcher(
+    player_detection,
+    window_ms=float(os.getenv("DETECT_BATCH_WINDOW_MS", "10")),
+    max_batch_size=int(os.getenv("DETECT_MAX_BATCH_SIZE", "8"))
+)
+
+# Shared-memory frame rings of producers on the same host
+frame_rings = SharedFrameRings(max_rings=int(os.getenv("SHARED_FRAME_MAX_RINGS", "16")))
+
+# Per-frame results of /process-video runs
+PROCESS_VIDEO_RESULTS_DIR = os.getenv("PROCESS_VIDEO_RESULTS_DIR", "results")
+
+# Background video analysis jobs
+video_jobs = VideoJobQueue(
+    db_path=os.getenv("VIDEO_JOBS_DB", "jobs/video_jobs.db"),
+    jobs_dir=os.getenv("VIDEO_JOBS_DIR", "jobs"),
+    stale_after=float(os.getenv("VIDEO_JOB_STALE_SECONDS", "120"))
+)
+video_job_worker = VideoJobWorker(
+    video_jobs,
+    player_detection,
+    workers=int(os.getenv("VIDEO_JOB_WORKERS", "1")),
+    checkpoint_interval=int(os.getenv("VIDEO_JOB_CHECKPOINT_INTERVAL", "500")),
+    heartbeat_interval=float(os.getenv("VIDEO_JOB_HEARTBEAT_SECONDS", "10"))
+)
+
+
+# Start-up state reported by /ready and /models/status
+model_startup: Dict[str, Any] = {"ready": False, "error": None, "startup_seconds": None}
+
+
+def load_models() -> None:
+    """Load and warm up every model, raising if one cannot be loaded"""
+    logger.info(
+        f"Inference: {INFERENCE_WORKERS} workers, {MODEL_REPLICAS} replica(s) per model, "
+        f"{INFERENCE_BACKEND.intra_op_threads or 'default'} intra-op threads"
+    )
+    if MODEL_REPLICAS == 1 and INFERENCE_WORKERS > 1:
+        logger.warning("MODEL_REPLICAS=1: concurrent inference calls of a model run one at a time")
+    for name, service in (("player detection", player_detection), ("ball tracking", ball_tracking)):
+        if not service.is_model_loaded():
+            service.load_model()
+        if not service.is_model_loaded():
+            raise RuntimeError(f"Failed to load {name} model")
+        service.warm_up(WARMUP_FRAME_SIZE)
+
+
+async def prepare_models() -> None:
+    """Load the models off the event loop, then start the video job workers"""
+    start = time.perf_counter()
+    try:
+        await asyncio.to_thread(load_models)
+    except Exception as e:
+        logger.error(f"Model start-up failed: {e}")
+        model_startup["error"] = str(e)
+        return
+    
+    video_job_worker.start()
+    model_startup["startup_seconds"] = time.perf_counter() - start
+    model_startup["ready"] = True
+    logger.info(f"Models ready in {model_startup['startup_seconds']:.2f}s")
+
+
+async def require_models_ready() -> None:
+    """Reject inference requests until the models are loaded and warmed up"""
+    if not model_startup["ready"]:
+        raise HTTPException(
+            status_code=503,
+            detail=model_startup["error"] or "Models are still loading",
+            headers={"Retry-After": "5"}
+        )
+
+
+def decode_image(contents: bytes) -> Optional[np.ndarray]:
+    """Decode an uploaded image into a BGR frame"""
+    nparr = np.frombuffer(contents, np.uint8)
+    return cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+
+
+async def cached_frame_result(
+    contents: bytes,
+    kind: str,
+    params: tuple,
+    compute: Callable[[np.ndarray], Awaitable[Any]]
+) -> Any:
+    """Answer an upload from the result cache, or decode it and ``compute`` the result
+    
+    A byte-identical re-upload is answered without decoding; otherwise the
+    frame is decoded and looked up by its pixels, so the same frame in a
+    different encoding is a hit too.
+    """
+    if not result_cache.enabled:
+        image = await inference_executor.run(decode_image, contents)
+        if image is None:
+            raise HTTPException(status_code=400, detail="Invalid image file")
+        return await compute(image)
+    
+    upload_digest = result_cache.digest(contents)
+    frame_digest = result_cache.upload_frame(upload_digest)
+    if frame_digest is not None:
+        cached = result_cache.get(result_cache.key(kind, frame_digest, *params))
+        if cached is not None:
+            return json.loads(cached)
+    
+    image = await inference_executor.run(decode_image, contents)
+    if image is None:
+        raise HTTPException(status_code=400, detail="Invalid image file")
+    
+    frame_digest = await inference_executor.run(result_cache.digest, image)
+    result_cache.remember_upload(upload_digest, frame_digest)
+    key = result_cache.key(kind, frame_digest, *params)
+    cached = result_cache.get(key)
+    if cached is not None:
+        return json.loads(cached)
+    
+    result = await compute(image)
+    result_cache.put(key, json.dumps(jsonable_encoder(result)).encode())
+    return result
 
 
 @app.get("/health")
@@ -44,117 +258,549 @@ async def health_check():
     }
 
 
-@app.post("/detect-players", response_model=DetectionResult)
+@app.get("/ready")
+async def readiness_check():
+    """Readiness check: models loaded and warmed up"""
+    await require_models_ready()
+    return {"status": "ready", "startup_seconds": model_startup["startup_seconds"]}
+
+
+@app.post("/detect-players", response_model=DetectionResult, dependencies=[Depends(require_models_ready)])
 async def detect_players(
     file: UploadFile = File(...),
     confidence_threshold: float = 0.5
 ) -> DetectionResult:
-    """Detect players in a video frame"""
-    try:
-        # Read image file
-        contents = await file.read()
-        nparr = np.frombuffer(contents, np.uint8)
-        image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-        
-        if image is None:
-            raise HTTPException(status_code=400, detail="Invalid image file")
-        
-        # Detect players
-        players = await player_detection.detect_players(image, confidence_threshold)
-        
+    """Detect players in a video frame
+    
+    Results are cached by frame content, model version and threshold.
+    """
+    async def detect(image: np.ndarray) -> DetectionResult:
+        players = await detection_batcher.detect_players(image, confidence_threshold)
         return DetectionResult(
             players=players,
             frame_timestamp=0.0,
             confidence_threshold=confidence_threshold
         )
+    
+    try:
+        # Read image file
+        contents = await file.read()
         
+        # Detect players, unless this frame was seen before
+        return await cached_frame_result(
+            contents,
+            "detect-players",
+            (player_detection.model_version, confidence_threshold),
+            detect
+        )
+        
+    except HTTPException:
+        raise
+    except InferenceQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except InferenceTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
         logger.error(f"Error in player detection: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/track-ball")
+@app.post("/track-ball", dependencies=[Depends(require_models_ready)])
 async def track_ball(
     file: UploadFile = File(...),
-    previous_positions: List[BallPosition] = []
+    previous_positions: List[BallPosition] = [],
+    session_id: Optional[str] = None
 ) -> BallPosition:
-    """Track ball position in video frame"""
+    """Track ball position in video frame
+    
+    The predictor state is kept per ``session_id`` on the server, so
+    ``previous_positions`` is only needed to seed a new session. Without a
+    ``session_id`` a new session is started and its ID returned in the
+    response; send it with the following frames of the same video. Full-frame
+    searches are answered from the result cache for frames seen before.
+    """
     try:
         # Read image file
         contents = await file.read()
-        nparr = np.frombuffer(contents, np.uint8)
-        image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+        image = await inference_executor.run(decode_image, contents)
         
         if image is None:
             raise HTTPException(status_code=400, detail="Invalid image file")
         
         # Track ball
-        ball_position = await ball_tracking.track_ball(image, previous_positions)
+        ball_position = await ball_tracking.track_ball(image, previous_positions, session_id)
         
         return ball_position
         
+    except HTTPException:
+        raise
+    except InferenceQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except InferenceTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
         logger.error(f"Error in ball tracking: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.delete("/track-ball/{session_id}")
+async def reset_ball_tracking(session_id: str) -> Dict[str, Any]:
+    """Forget the ball track of a session"""
+    if not ball_tracking.reset_session(session_id):
+        raise HTTPException(status_code=404, detail="Session not found")
+    return {"session_id": session_id, "status": "reset"}
+
+
 @app.post("/map-field")
 async def map_field(
-    file: UploadFile = File(...)
+    file: UploadFile = File(...),
+    camera_id: str = "default"
 ) -> Dict[str, Any]:
-    """Map camera view to top-down field view"""
+    """Map camera view to top-down field view
+    
+    The homography is cached per ``camera_id`` and only re-estimated on
+    keyframes, scene cuts and camera motion. The result depends on that
+    per-camera state, so it does not go through the result cache.
+    """
     try:
         # Read image file
         contents = await file.read()
-        nparr = np.frombuffer(contents, np.uint8)
-        image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+        image = await inference_executor.run(decode_image, contents)
         
         if image is None:
             raise HTTPException(status_code=400, detail="Invalid image file")
         
         # Map field
-        field_data = await field_mapping.map_field(image)
+        field_data = await field_mapping.map_field(image, camera_id)
         
         return field_data
         
+    except HTTPException:
+        raise
+    except InferenceQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except InferenceTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
         logger.error(f"Error in field mapping: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/process-video")
-async def process_video(
-    video_path: str,
-    output_path: str = None
-) -> Dict[str, Any]:
-    """Process entire video for player and ball tracking"""
+def read_shared_frame(ring: str, slot: int, sequence: int) -> Tuple[SharedFrameRing, np.ndarray]:
+    """Get a zero-copy view of a frame in a shared-memory ring"""
+    try:
+        return frame_rings.read(ring, slot, sequence)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Frame ring not found")
+    except (ValueError, IndexError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except StaleFrameError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+def check_shared_frame(frame_ring: SharedFrameRing, slot: int, sequence: int) -> None:
+    """Reject a result if the producer overwrote the frame while it was processed"""
+    if not frame_ring.is_current(slot, sequence):
+        raise HTTPException(status_code=409, detail="Frame was overwritten while it was processed")
+
+
+@app.post("/shm/detect-players", response_model=DetectionResult, dependencies=[Depends(require_models_ready)])
+async def detect_players_shared(
+    ring: str,
+    slot: int,
+    sequence: int,
+    confidence_threshold: float = 0.5
+) -> DetectionResult:
+    """Detect players in a frame from a shared-memory ring
+    
+    Same-host variant of ``/detect-players``: the producer writes the raw
+    BGR frame with ``SharedFrameRing.write`` and sends its slot and
+    sequence number, so nothing is encoded, uploaded or decoded.
+    """
     try:
-        if not os.path.exists(video_path):
-            raise HTTPException(status_code=404, detail="Video file not found")
+        frame_ring, image = read_shared_frame(ring, slot, sequence)
+        players = await detection_batcher.detect_players(image, confidence_threshold)
+        check_shared_frame(frame_ring, slot, sequence)
         
-        # Process video
-        results = await player_detection.process_video(video_path, output_path)
+        return DetectionResult(
+            players=players,
+            frame_timestamp=0.0,
+            confidence_threshold=confidence_threshold
+        )
         
-        return {
-            "status": "completed",
-            "video_path": video_path,
-            "output_path": output_path,
-            "frames_processed": len(results),
-            "results": results
-        }
+    except HTTPException:
+        raise
+    except InferenceQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except InferenceTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error in player detection: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/shm/track-ball", dependencies=[Depends(require_models_ready)])
+async def track_ball_shared(
+    ring: str,
+    slot: int,
+    sequence: int,
+    previous_positions: List[BallPosition] = [],
+    session_id: Optional[str] = None
+) -> BallPosition:
+    """Track the ball in a frame from a shared-memory ring
+    
+    Sessions work as for ``/track-ball``.
+    """
+    try:
+        frame_ring, image = read_shared_frame(ring, slot, sequence)
+        ball_position = await ball_tracking.track_ball(image, previous_positions, session_id)
+        check_shared_frame(frame_ring, slot, sequence)
+        
+        return ball_position
         
+    except HTTPException:
+        raise
+    except InferenceQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except InferenceTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error in ball tracking: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/shm/map-field")
+async def map_field_shared(
+    ring: str,
+    slot: int,
+    sequence: int,
+    camera_id: str = "default"
+) -> Dict[str, Any]:
+    """Map the camera view of a frame from a shared-memory ring"""
+    try:
+        frame_ring, image = read_shared_frame(ring, slot, sequence)
+        field_data = await field_mapping.map_field(image, camera_id)
+        check_shared_frame(frame_ring, slot, sequence)
+        
+        return field_data
+        
+    except HTTPException:
+        raise
+    except InferenceQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except InferenceTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error in field mapping: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.delete("/shm/rings/{ring}")
+async def detach_frame_ring(ring: str) -> Dict[str, Any]:
+    """Forget an attached frame ring, e.g. before its producer recreates it"""
+    if not frame_rings.detach(ring):
+        raise HTTPException(status_code=404, detail="Frame ring not attached")
+    return {"ring": ring, "status": "detached"}
+
+
+@app.post("/process-video", dependencies=[Depends(require_models_ready)])
+async def process_video(
+    video_path: str,
+    output_path: str = None,
+    batch_size: int = 1,
+    pipelined: bool = False,
+    queue_size: int = 8,
+    stride: int = 1,
+    target_fps: Optional[float] = None,
+    motion_threshold: Optional[float] = None,
+    keyframe_interval: Optional[int] = None,
+    match_id: Optional[str] = None,
+    stream: bool = False
+):
+    """Process entire video for player and ball tracking
+    
+    Per-frame results are written to an NDJSON file as they are produced
+    and read back with ``GET /process-video/results/{results_id}``. With
+    ``stream=true`` the results are streamed as NDJSON while the video is
+    processed.
+    """
+    if not os.path.exists(video_path):
+        raise HTTPException(status_code=404, detail="Video file not found")
+    
+    try:
+        sampler = FrameSampler(
+            stride=stride,
+            target_fps=target_fps,
+            motion_threshold=motion_threshold,
+            keyframe_interval=keyframe_interval
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    results_id = uuid.uuid4().hex
+    writer = ResultWriter(results_file(results_id))
+    tracks = TrackingStoreWriter(tracks_dir(results_id))
+    
+    def on_result(frame_index: int, result: DetectionResult) -> None:
+        writer.append(frame_index, result)
+        if stream:
+            writer.flush()
+    
+    async def run() -> None:
+        try:
+            await player_detection.process_video(
+                video_path,
+                output_path,
+                batch_size=batch_size,
+                pipelined=pipelined,
+                queue_size=queue_size,
+                sampler=sampler,
+                team_profile_key=match_id or video_path,
+                on_result=on_result,
+                tracks=tracks,
+                raise_errors=True
+            )
+        finally:
+            writer.close()
+            tracks.close()
+    
+    if stream:
+        task = asyncio.create_task(run())
+        return StreamingResponse(
+            follow_results(results_file(results_id), task),
+            media_type="application/x-ndjson",
+            headers={"X-Results-Id": results_id}
+        )
+    
+    try:
+        await run()
     except Exception as e:
         logger.error(f"Error in video processing: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+    
+    return {
+        "status": "completed",
+        "video_path": video_path,
+        "output_path": output_path,
+        "frames_processed": writer.count,
+        "inferred_frames": sampler.inferred_frames,
+        "results_id": results_id
+    }
+
+
+def results_file(results_id: str) -> str:
+    """Path of the NDJSON results of a /process-video run"""
+    return os.path.join(PROCESS_VIDEO_RESULTS_DIR, f"{results_id}.ndjson")
+
+
+def tracks_dir(results_id: str) -> str:
+    """Directory of the columnar tracking store of a /process-video run"""
+    return os.path.join(PROCESS_VIDEO_RESULTS_DIR, f"{results_id}.tracks")
+
+
+async def follow_results(path: str, task: asyncio.Task, poll_interval: float = 0.05):
+    """Stream the lines of a results file as they are written until ``task`` finishes"""
+    sent = 0
+    while True:
+        finished = task.done()
+        for _, line in iter_result_lines(path, offset=sent):
+            sent += 1
+            yield line
+        if finished:
+            break
+        await asyncio.sleep(poll_interval)
+    
+    # The response has started, so report a failure in the stream itself
+    if task.exception() is not None:
+        logger.error(f"Error in video processing: {task.exception()}")
+        yield json.dumps({"error": str(task.exception())}).encode() + b"\n"
+
+
+@app.get("/process-video/results/{results_id}")
+async def get_video_results(
+    results_id: str,
+    start_frame: int = 0,
+    end_frame: Optional[int] = None,
+    offset: int = 0,
+    limit: int = 1000,
+    stream: bool = False
+):
+    """Page or stream the per-frame results of a /process-video run by frame range"""
+    path = results_file(results_id)
+    if not results_id.isalnum() or not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Results not found")
+    
+    if stream:
+        lines = iter_result_lines(path, start_frame, end_frame, offset)
+        return StreamingResponse(
+            (line for _, line in lines),
+            media_type="application/x-ndjson"
+        )
+    
+    results = read_results(path, start_frame, end_frame, offset, limit)
+    return {
+        "results_id": results_id,
+        "start_frame": start_frame,
+        "end_frame": end_frame,
+        "next_start_frame": results[-1]["frame_index"] + 1 if len(results) == limit else None,
+        "results": results
+    }
+
+
+@app.get("/process-video/results/{results_id}/tracks")
+async def get_video_tracks(
+    results_id: str,
+    start_time: Optional[float] = None,
+    end_time: Optional[float] = None,
+    player_id: Optional[int] = None,
+    limit: int = 100000
+) -> Dict[str, Any]:
+    """Get tracked detections of a /process-video run by time range and/or player"""
+    if not results_id.isalnum():
+        raise HTTPException(status_code=404, detail="Tracks not found")
+    return read_tracks(tracks_dir(results_id), start_time, end_time, player_id, limit)
+
+
+def read_tracks(
+    path: str,
+    start_time: Optional[float],
+    end_time: Optional[float],
+    player_id: Optional[int],
+    limit: int
+) -> Dict[str, Any]:
+    """Select rows of a tracking store and return them column by column"""
+    try:
+        store = TrackingStore(path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Tracks not found")
+    
+    columns = store.select(start_time, end_time, player_id)
+    rows = len(columns["frame"])
+    return {
+        "rows": min(rows, limit),
+        "truncated": rows > limit,
+        "columns": {name: json_column(values[:limit]) for name, values in columns.items()}
+    }
+
+
+def json_column(values: np.ndarray) -> list:
+    """Convert a column to a JSON-safe list, with NaN (unknown) as null"""
+    if values.dtype.kind != "f":
+        return values.tolist()
+    converted = values.astype(object)
+    converted[np.isnan(values)] = None
+    return converted.tolist()
+
+
+@app.post("/jobs/process-video")
+async def submit_video_job(
+    video_path: str,
+    output_path: str = None,
+    batch_size: int = 1,
+    pipelined: bool = False,
+    queue_size: int = 8,
+    stride: int = 1,
+    target_fps: Optional[float] = None,
+    motion_threshold: Optional[float] = None,
+    keyframe_interval: Optional[int] = None,
+    match_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """Queue a video for background player tracking and return the job ID"""
+    if not os.path.exists(video_path):
+        raise HTTPException(status_code=404, detail="Video file not found")
+    
+    job_id = video_jobs.submit({
+        "video_path": video_path,
+        "output_path": output_path,
+        "batch_size": batch_size,
+        "pipelined": pipelined,
+        "queue_size": queue_size,
+        "sampling": {
+            "stride": stride,
+            "target_fps": target_fps,
+            "motion_threshold": motion_threshold,
+            "keyframe_interval": keyframe_interval
+        },
+        "team_profile_key": match_id or video_path
+    })
+    
+    return {"job_id": job_id, "status": "queued"}
+
+
+@app.get("/jobs/{job_id}")
+async def get_video_job(job_id: str) -> Dict[str, Any]:
+    """Get status and progress of a video job"""
+    job = video_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return {
+        "job_id": job_id,
+        "status": job["status"],
+        "video_path": job["params"]["video_path"],
+        "frames_processed": job["frames_processed"],
+        "total_frames": job["total_frames"],
+        "error": job["error"]
+    }
+
+
+@app.get("/jobs/{job_id}/results")
+async def get_video_job_results(
+    job_id: str,
+    offset: int = 0,
+    limit: int = 1000,
+    start_frame: int = 0,
+    end_frame: Optional[int] = None
+) -> Dict[str, Any]:
+    """Get a page of per-frame results of a video job"""
+    job = video_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    checkpoint = job["checkpoint"] or {}
+    return {
+        "job_id": job_id,
+        "status": job["status"],
+        "offset": offset,
+        "inferred_frames": checkpoint.get("inferred_frames", []),
+        "results": video_jobs.read_results(job_id, offset, limit, start_frame, end_frame)
+    }
+
+
+@app.get("/jobs/{job_id}/tracks")
+async def get_video_job_tracks(
+    job_id: str,
+    start_time: Optional[float] = None,
+    end_time: Optional[float] = None,
+    player_id: Optional[int] = None,
+    limit: int = 100000
+) -> Dict[str, Any]:
+    """Get tracked detections of a video job by time range and/or player"""
+    if video_jobs.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return read_tracks(video_jobs.tracks_path(job_id), start_time, end_time, player_id, limit)
 
 
 @app.get("/models/status")
 async def get_model_status():
-    """Get status of loaded AI models"""
+    """Get status of loaded AI models with their load and warm-up timings"""
+    return {
+        **model_startup,
+        "player_detection": player_detection.model_status(),
+        "ball_tracking": ball_tracking.model_status(),
+        "field_mapping": {"loaded": field_mapping.is_model_loaded()}
+    }
+
+
+@app.get("/metrics")
+async def get_metrics():
+    """Get load metrics of the service"""
     return {
-        "player_detection": player_detection.is_model_loaded(),
-        "ball_tracking": ball_tracking.is_model_loaded(),
-        "field_mapping": field_mapping.is_model_loaded()
+        "inference_executor": inference_executor.get_metrics(),
+        "detection_batcher": detection_batcher.get_metrics(),
+        "ball_tracking": ball_tracking.get_metrics(),
+        "frame_rings": frame_rings.get_metrics(),
+        "result_cache": result_cache.get_metrics()
     }
 
 
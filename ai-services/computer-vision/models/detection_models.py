@@ -0,0 +1,28 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class PlayerPosition(BaseModel):
+    x: float  # box centre in pixels
+    y: float
+    width: float
+    height: float
+    confidence: float
+    team_id: Optional[int] = None
+    player_id: Optional[int] = None
+    pitch_x: Optional[float] = None  # feet position on the pitch in metres
+    pitch_y: Optional[float] = None
+
+
+class BallPosition(BaseModel):
+    x: float
+    y: float
+    confidence: float = 0.0
+    detected: bool = True  # False when the position is only predicted
+    session_id: Optional[str] = None  # Ball tracking session to send with the next frame
+
+
+class DetectionResult(BaseModel):
+    players: List[PlayerPosition]
+    frame_timestamp: float
+    confidence_threshold: float
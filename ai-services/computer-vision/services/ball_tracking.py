@@ -0,0 +1,317 @@
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+import torch
+from loguru import logger
+
+from models.detection_models import BallPosition
+from services.inference_executor import InferenceExecutor
+from services.result_cache import FrameResultCache
+from services.inference_backends import BackendConfig, load_detector, model_version
+from services.model_replicas import ModelReplicas
+
+
+# "sports ball" in the COCO classes
+BALL_CLASS_ID = 32
+
+
+class BallTrack:
+    """Constant-velocity Kalman filter state of the ball in one session"""
+
+    def __init__(self, process_noise: float, measurement_noise: float):
+        self.kalman = cv2.KalmanFilter(4, 2)
+        self.kalman.transitionMatrix = np.array(
+            [[1, 0, 1, 0], [0, 1, 0, 1], [0, 0, 1, 0], [0, 0, 0, 1]], dtype=np.float32
+        )
+        self.kalman.measurementMatrix = np.array([[1, 0, 0, 0], [0, 1, 0, 0]], dtype=np.float32)
+        self.kalman.processNoiseCov = np.eye(4, dtype=np.float32) * process_noise
+        self.kalman.measurementNoiseCov = np.eye(2, dtype=np.float32) * measurement_noise
+
+        self.initialized = False
+        self.lost_frames = 0
+        self.lock = threading.Lock()
+
+    def reset(self, x: float, y: float) -> None:
+        """Start the filter at a known position with zero velocity"""
+        self.kalman.statePost = np.array([[x], [y], [0], [0]], dtype=np.float32)
+        self.kalman.errorCovPost = np.eye(4, dtype=np.float32) * 100
+        self.initialized = True
+        self.lost_frames = 0
+
+    def position(self) -> Tuple[float, float]:
+        """Last filtered position, or the origin before the first detection"""
+        if not self.initialized:
+            return 0.0, 0.0
+        return float(self.kalman.statePost[0, 0]), float(self.kalman.statePost[1, 0])
+
+    def predict(self) -> Tuple[float, float]:
+        """Advance the filter one frame and return the predicted position"""
+        state = self.kalman.predict()
+        return float(state[0, 0]), float(state[1, 0])
+
+    def correct(self, x: float, y: float) -> Tuple[float, float]:
+        """Update the filter with a detection and return the filtered position"""
+        state = self.kalman.correct(np.array([[x], [y]], dtype=np.float32))
+        self.lost_frames = 0
+        return float(state[0, 0]), float(state[1, 0])
+
+
+class BallTrackingService:
+    """Track the ball with a Kalman filter and a detector run on a small region
+
+    Each session (a video or live feed) keeps a ``BallTrack`` on the server,
+    so clients only send the new frame. The filter predicts where the ball
+    will be and the detector only looks at a ``roi_size`` square around the
+    prediction, run at ``roi_size`` resolution instead of the full frame.
+    The region grows by ``roi_growth`` pixels for every frame the ball is
+    missed, and after ``max_lost_frames`` misses the full frame is searched
+    again. While the ball is missed the prediction is returned with
+    ``detected=False``.
+
+    ``backend``, ``preload`` and ``model_replicas`` work as for
+    ``PlayerDetectionService``; the full-frame search runs at
+    ``backend.imgsz``. With ``result_cache`` the
+    outcome of full-frame searches is cached by frame content, so a frame
+    seen before (e.g. the same clip uploaded again) is not searched twice.
+    Region searches depend on the session's prediction and are not cached.
+    """
+
+    def __init__(
+        self,
+        model_path: str = "models/yolov8n.pt",
+        executor: Optional[InferenceExecutor] = None,
+        confidence_threshold: float = 0.25,
+        roi_size: int = 320,
+        roi_growth: int = 64,
+        max_lost_frames: int = 5,
+        process_noise: float = 1.0,
+        measurement_noise: float = 4.0,
+        max_sessions: int = 64,
+        model_replicas: int = 1,
+        backend: Optional[BackendConfig] = None,
+        preload: bool = True,
+        result_cache: Optional[FrameResultCache] = None
+    ):
+        self.model_path = model_path
+        self.backend = backend or BackendConfig()
+        self.model = None
+        self.load_seconds: Optional[float] = None
+        self.warmup_seconds: Optional[float] = None
+        self.executor = executor or InferenceExecutor()
+        self.confidence_threshold = confidence_threshold
+        self.roi_size = roi_size
+        self.roi_growth = roi_growth
+        self.max_lost_frames = max_lost_frames
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+        self.max_sessions = max_sessions
+        self.result_cache = result_cache
+        self.model_replicas = max(1, model_replicas)
+
+        self._sessions: "OrderedDict[str, BallTrack]" = OrderedDict()
+        self._sessions_lock = threading.Lock()
+        self._replicas = ModelReplicas(lambda: load_detector(self.model_path, self.backend), self.model_replicas)
+        self._searches_lock = threading.Lock()
+        self._searches = {"roi": 0, "full_frame": 0}
+        self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        if preload:
+            self.load_model()
+
+    def load_model(self):
+        """Load YOLOv8 model for ball detection"""
+        try:
+            start = time.perf_counter()
+            self.model = load_detector(self.model_path, self.backend)
+            self._replicas.reset(self.model)
+            self.load_seconds = time.perf_counter() - start
+            logger.info(f"Ball tracking model loaded successfully on {self.device} in {self.load_seconds:.2f}s")
+        except Exception as e:
+            logger.error(f"Failed to load ball tracking model: {e}")
+            self.model = None
+
+    def warm_up(self, image_size: Tuple[int, int] = (720, 1280)) -> None:
+        """Create every model replica and run a full-frame and a region search with each on a blank frame"""
+        if not self.is_model_loaded():
+            raise RuntimeError("Ball tracking model not loaded")
+
+        start = time.perf_counter()
+        self._replicas.fill()
+        dummy = np.zeros((*image_size, 3), dtype=np.uint8)
+        # Idle replicas are handed out in turn, so each loop reaches every replica
+        for _ in range(self.model_replicas):
+            self._detect(dummy, None)
+        for _ in range(self.model_replicas):
+            self._detect(dummy, (image_size[1] / 2, image_size[0] / 2))
+        # Warm-up searches are not traffic
+        self._searches = {"roi": 0, "full_frame": 0}
+        self.warmup_seconds = time.perf_counter() - start
+        logger.info(f"Warmed up {self.model_replicas} ball tracking model(s) in {self.warmup_seconds:.2f}s")
+
+    @property
+    def model_version(self) -> str:
+        """Weights and backend settings, part of cached result keys"""
+        return model_version(self.model_path, self.backend)
+
+    def model_status(self) -> Dict[str, Any]:
+        """Load state and start-up timings of the model"""
+        return {
+            "loaded": self.is_model_loaded(),
+            "warmed_up": self.warmup_seconds is not None,
+            "model_path": self.model_path,
+            "backend": self.backend.name,
+            "quantize": self.backend.quantize,
+            "device": self.device if self.backend.name == "pytorch" else "cpu",
+            "replicas": self._replicas.created,
+            "load_seconds": self.load_seconds,
+            "warmup_seconds": self.warmup_seconds
+        }
+
+    def is_model_loaded(self) -> bool:
+        """Check if model is loaded"""
+        return self.model is not None
+
+    def session(self, session_id: str) -> BallTrack:
+        """Get the ball track of a session, least recently used evicted first"""
+        with self._sessions_lock:
+            track = self._sessions.get(session_id)
+            if track is None:
+                track = BallTrack(self.process_noise, self.measurement_noise)
+                self._sessions[session_id] = track
+                if len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+            else:
+                self._sessions.move_to_end(session_id)
+            return track
+
+    def reset_session(self, session_id: str) -> bool:
+        """Forget the ball track of a session"""
+        with self._sessions_lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    async def track_ball(
+        self,
+        image: np.ndarray,
+        previous_positions: Optional[List[BallPosition]] = None,
+        session_id: Optional[str] = None
+    ) -> BallPosition:
+        """Track the ball in the next frame of a session
+
+        Without ``session_id`` a new session is started; its ID is returned
+        in the position for the client to send with the next frame.
+        ``previous_positions`` is only used to seed a session that has no
+        track yet.
+        """
+        if not self.is_model_loaded():
+            raise RuntimeError("Ball tracking model not loaded")
+
+        session_id = session_id or uuid.uuid4().hex
+        position = await self.executor.run(
+            self._track, image, self.session(session_id), previous_positions or []
+        )
+        position.session_id = session_id
+        return position
+
+    def _track(
+        self,
+        image: np.ndarray,
+        track: BallTrack,
+        previous_positions: List[BallPosition]
+    ) -> BallPosition:
+        """Predict, search the region around the prediction and update the filter"""
+        with track.lock:
+            if not track.initialized and previous_positions:
+                track.reset(previous_positions[0].x, previous_positions[0].y)
+                for position in previous_positions[1:]:
+                    track.predict()
+                    track.correct(position.x, position.y)
+
+            full_search = not track.initialized or track.lost_frames >= self.max_lost_frames
+            if full_search:
+                predicted = None
+                detection = self._detect_full_frame(image)
+            else:
+                predicted = track.predict()
+                detection = self._detect(image, predicted, track.lost_frames)
+
+            if detection is None:
+                track.lost_frames += 1
+                x, y = predicted or track.position()
+                return BallPosition(x=x, y=y, confidence=0.0, detected=False)
+
+            x, y, confidence = detection
+            if full_search:
+                # Found by a full-frame search: restart the filter from here
+                track.reset(x, y)
+            else:
+                x, y = track.correct(x, y)
+            return BallPosition(x=x, y=y, confidence=confidence, detected=True)
+
+    def _detect_full_frame(self, image: np.ndarray) -> Optional[Tuple[float, float, float]]:
+        """Search the whole frame, reusing the cached outcome for a frame searched before"""
+        if self.result_cache is None or not self.result_cache.enabled:
+            return self._detect(image, None)
+
+        key = self.result_cache.key(
+            "ball", self.result_cache.digest(image), self.model_version, self.confidence_threshold
+        )
+        cached = self.result_cache.get(key)
+        if cached is not None:
+            detection = json.loads(cached)
+            return tuple(detection) if detection else None
+
+        detection = self._detect(image, None)
+        self.result_cache.put(key, json.dumps(detection).encode())
+        return detection
+
+    def _detect(
+        self,
+        image: np.ndarray,
+        predicted: Optional[Tuple[float, float]],
+        lost_frames: int = 0
+    ) -> Optional[Tuple[float, float, float]]:
+        """Run the detector on the region around ``predicted``, or the full frame without one"""
+        height, width = image.shape[:2]
+        if predicted is None:
+            x1, y1, crop = 0, 0, image
+            imgsz = self.backend.imgsz
+            search = "full_frame"
+        else:
+            size = self.roi_size + self.roi_growth * lost_frames
+            x1 = int(np.clip(predicted[0] - size / 2, 0, max(0, width - size)))
+            y1 = int(np.clip(predicted[1] - size / 2, 0, max(0, height - size)))
+            crop = image[y1:y1 + size, x1:x1 + size]
+            # The model input must be a multiple of its 32 pixel stride
+            imgsz = int(np.ceil(size / 32) * 32)
+            search = "roi"
+
+        with self._searches_lock:
+            self._searches[search] += 1
+        with self._replicas.acquire() as model:
+            results = model(
+                crop, conf=self.confidence_threshold, classes=[BALL_CLASS_ID], imgsz=imgsz, verbose=False
+            )
+
+        boxes = results[0].boxes
+        if boxes is None or len(boxes) == 0:
+            return None
+
+        xyxy = boxes.xyxy.cpu().numpy()
+        confidence = boxes.conf.cpu().numpy()
+        centres = np.column_stack([(xyxy[:, 0] + xyxy[:, 2]) / 2 + x1, (xyxy[:, 1] + xyxy[:, 3]) / 2 + y1])
+
+        # Prefer the candidate closest to the prediction, otherwise the most confident
+        if predicted is not None:
+            best = int(np.argmin(np.hypot(*(centres - np.array(predicted)).T)))
+        else:
+            best = int(np.argmax(confidence))
+        return float(centres[best, 0]), float(centres[best, 1]), float(confidence[best])
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Number of region and full-frame searches and active sessions"""
+        return {**self._searches, "sessions": len(self._sessions)}
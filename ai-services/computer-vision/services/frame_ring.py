@@ -0,0 +1,198 @@
+import threading
+from collections import OrderedDict
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Tuple
+
+import numpy as np
+
+
+# Only segments with this prefix can be attached by name from a request
+RING_NAME_PREFIX = "cv-frames-"
+
+RING_MAGIC = 0x43564652  # "CVFR"
+HEADER_FIELDS = 8  # magic, slots, height, width, channels, last sequence, 2 reserved
+HEADER_BYTES = HEADER_FIELDS * 8
+DATA_ALIGNMENT = 64
+
+# Sequence number of a slot that is being written or has never been written
+WRITING = -1
+
+
+class StaleFrameError(RuntimeError):
+    """Raised when a ring slot no longer holds the requested frame"""
+
+
+class SharedFrameRing:
+    """Ring buffer of raw BGR frames in POSIX shared memory
+
+    Lets a producer on the same host hand frames to the CV service without
+    encoding them: the producer copies a frame into the next slot with
+    ``write`` and sends only the ring name, slot and sequence number; the
+    service maps the same memory with ``attach`` and ``read`` returns a
+    read-only NumPy view of the slot, without decoding or copying.
+
+    The segment starts with a header (frame shape, slot count and the last
+    written sequence number), followed by one sequence number per slot and
+    the slots themselves. A slot's sequence number is set to ``WRITING``
+    while it is overwritten, so a reader can tell with ``is_current``
+    whether the frame it was given is still there. The ring has no
+    back-pressure: a producer must keep at most ``slots`` frames in flight,
+    and a reader that falls behind gets ``StaleFrameError``.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self.shm = shm
+        self.owner = owner
+        self.name = shm.name
+
+        self._header = np.ndarray((HEADER_FIELDS,), dtype=np.int64, buffer=shm.buf)
+        if self._header[0] != RING_MAGIC:
+            self.close()
+            raise ValueError(f"Shared memory segment {shm.name} is not a frame ring")
+
+        self.slots, self.height, self.width, self.channels = (int(v) for v in self._header[1:5])
+        self._sequences = np.ndarray((self.slots,), dtype=np.int64, buffer=shm.buf, offset=HEADER_BYTES)
+        self._frames = np.ndarray(
+            (self.slots, self.height, self.width, self.channels),
+            dtype=np.uint8,
+            buffer=shm.buf,
+            offset=data_offset(self.slots)
+        )
+        self._write_lock = threading.Lock()
+
+    @classmethod
+    def create(cls, name: str, slots: int, height: int, width: int, channels: int = 3) -> "SharedFrameRing":
+        """Create a ring for frames of one shape; the creator unlinks it on ``close``"""
+        if slots < 1:
+            raise ValueError("A frame ring needs at least one slot")
+
+        size = data_offset(slots) + slots * height * width * channels
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        header = np.ndarray((HEADER_FIELDS,), dtype=np.int64, buffer=shm.buf)
+        header[:] = [RING_MAGIC, slots, height, width, channels, 0, 0, 0]
+        np.ndarray((slots,), dtype=np.int64, buffer=shm.buf, offset=HEADER_BYTES)[:] = WRITING
+        del header
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedFrameRing":
+        """Map an existing ring created by another process"""
+        shm = shared_memory.SharedMemory(name=name)
+        # The resource tracker would otherwise unlink the producer's segment
+        # when this process exits
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return cls(shm, owner=False)
+
+    @property
+    def last_sequence(self) -> int:
+        """Sequence number of the most recently written frame, 0 before the first"""
+        return int(self._header[5])
+
+    def write(self, frame: np.ndarray) -> Tuple[int, int]:
+        """Copy a frame into the next slot and return its ``(slot, sequence)``"""
+        if frame.shape != (self.height, self.width, self.channels) or frame.dtype != np.uint8:
+            raise ValueError(
+                f"Frame of shape {frame.shape} does not fit a ring of "
+                f"{self.height}x{self.width}x{self.channels} uint8 frames"
+            )
+
+        with self._write_lock:
+            sequence = self.last_sequence + 1
+            slot = (sequence - 1) % self.slots
+            self._sequences[slot] = WRITING
+            self._frames[slot] = frame
+            self._sequences[slot] = sequence
+            self._header[5] = sequence
+        return slot, sequence
+
+    def is_current(self, slot: int, sequence: int) -> bool:
+        """Check if a slot still holds the frame with this sequence number"""
+        return 0 <= slot < self.slots and int(self._sequences[slot]) == sequence
+
+    def read(self, slot: int, sequence: int) -> np.ndarray:
+        """Read-only view of the frame in a slot, without copying
+
+        The view stays backed by the ring, so callers should check
+        ``is_current`` again once they are done with it.
+        """
+        if not 0 <= slot < self.slots:
+            raise IndexError(f"Slot {slot} out of range for a ring of {self.slots} slots")
+        if not self.is_current(slot, sequence):
+            raise StaleFrameError(f"Frame {sequence} is no longer in slot {slot} of {self.name}")
+
+        frame = self._frames[slot]
+        frame.flags.writeable = False
+        return frame
+
+    def close(self) -> None:
+        """Unmap the ring, and remove it if this process created it"""
+        # Views into the buffer must be released before it can be closed
+        self._header = self._sequences = self._frames = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+    def __enter__(self) -> "SharedFrameRing":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def data_offset(slots: int) -> int:
+    """Byte offset of the first slot, after the header and slot sequence numbers"""
+    offset = HEADER_BYTES + slots * 8
+    return (offset + DATA_ALIGNMENT - 1) // DATA_ALIGNMENT * DATA_ALIGNMENT
+
+
+class SharedFrameRings:
+    """Rings attached by the service, kept open between requests
+
+    Attaching maps the segment, so rings are cached by name and the least
+    recently used one is unmapped when more than ``max_rings`` are open.
+    Only names starting with ``RING_NAME_PREFIX`` are accepted, so requests
+    cannot map arbitrary shared memory of the host.
+    """
+
+    def __init__(self, max_rings: int = 16):
+        self.max_rings = max_rings
+        self._rings: "OrderedDict[str, SharedFrameRing]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._reads = {"frames": 0, "stale": 0}
+
+    def get(self, name: str) -> SharedFrameRing:
+        """Get an attached ring, attaching it on first use"""
+        if not name.startswith(RING_NAME_PREFIX):
+            raise ValueError(f"Frame ring names must start with {RING_NAME_PREFIX}")
+
+        with self._lock:
+            ring = self._rings.get(name)
+            if ring is None:
+                ring = SharedFrameRing.attach(name)
+                self._rings[name] = ring
+                if len(self._rings) > self.max_rings:
+                    # Frames still referenced keep their mapping alive
+                    self._rings.popitem(last=False)
+            else:
+                self._rings.move_to_end(name)
+            return ring
+
+    def read(self, name: str, slot: int, sequence: int) -> Tuple[SharedFrameRing, np.ndarray]:
+        """Get the ring and a zero-copy view of one of its frames"""
+        ring = self.get(name)
+        try:
+            frame = ring.read(slot, sequence)
+        except StaleFrameError:
+            self._reads["stale"] += 1
+            raise
+        self._reads["frames"] += 1
+        return ring, frame
+
+    def detach(self, name: str) -> bool:
+        """Forget an attached ring, e.g. after its producer recreated it"""
+        with self._lock:
+            return self._rings.pop(name, None) is not None
+
+    def get_metrics(self) -> Dict[str, int]:
+        """Number of frames read, stale reads and attached rings"""
+        return {**self._reads, "rings": len(self._rings)}
@@ -0,0 +1,131 @@
+from enum import Enum
+from typing import Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+class FrameAction(str, Enum):
+    """What the video loop should do with a frame"""
+    INFER = "infer"              # run detection on the frame
+    CARRY = "carry"              # reuse the previous detections, still reported
+    PASSTHROUGH = "passthrough"  # only written to the output video, not reported
+
+
+class FrameSampler:
+    """Decide which frames of a video are decoded and run through detection
+
+    Three sampling modes can be combined:
+
+    * ``stride`` - only every Nth frame is sampled
+    * ``target_fps`` - the stride is derived from the source frame rate
+    * ``motion_threshold`` - a sampled frame is only inferred when the mean
+      absolute difference of a downscaled grayscale thumbnail against the
+      last inferred frame reaches the threshold; otherwise the previous
+      detections are carried forward. ``keyframe_interval`` forces an
+      inference after that many consecutive carried frames.
+
+    Frames outside the stride are only grabbed, not decoded, unless they are
+    needed for the output video. The indices of inferred frames are kept in
+    ``inferred_frames``.
+    """
+
+    def __init__(
+        self,
+        stride: int = 1,
+        target_fps: Optional[float] = None,
+        motion_threshold: Optional[float] = None,
+        keyframe_interval: Optional[int] = None,
+        motion_scale: float = 0.25
+    ):
+        if stride < 1:
+            raise ValueError("stride must be at least 1")
+        if target_fps is not None and target_fps <= 0:
+            raise ValueError("target_fps must be positive")
+
+        self.stride = stride
+        self.target_fps = target_fps
+        self.motion_threshold = motion_threshold
+        self.keyframe_interval = keyframe_interval
+        self.motion_scale = motion_scale
+
+        self.effective_stride = stride
+        self.inferred_frames: List[int] = []
+        self._reference: Optional[np.ndarray] = None
+        self._carried_since_inference = 0
+
+    def configure(self, source_fps: float) -> None:
+        """Derive the effective stride from the source frame rate"""
+        self.effective_stride = self.stride
+        if self.target_fps and source_fps > 0:
+            self.effective_stride = max(self.stride, int(round(source_fps / self.target_fps)))
+
+        self.inferred_frames = []
+        self._reference = None
+        self._carried_since_inference = 0
+
+    def is_sampled(self, frame_index: int) -> bool:
+        """Check if a frame falls on the sampling stride"""
+        return frame_index % self.effective_stride == 0
+
+    def action_for(self, frame_index: int, frame: np.ndarray) -> FrameAction:
+        """Decide between inferring and carrying forward for a sampled frame"""
+        if self.motion_threshold is None:
+            self.inferred_frames.append(frame_index)
+            return FrameAction.INFER
+
+        thumbnail = self._thumbnail(frame)
+        keyframe_due = (
+            self.keyframe_interval is not None
+            and self._carried_since_inference >= self.keyframe_interval
+        )
+
+        if self._reference is None or keyframe_due or self._motion_energy(thumbnail) >= self.motion_threshold:
+            self._reference = thumbnail
+            self._carried_since_inference = 0
+            self.inferred_frames.append(frame_index)
+            return FrameAction.INFER
+
+        self._carried_since_inference += 1
+        return FrameAction.CARRY
+
+    def _thumbnail(self, frame: np.ndarray) -> np.ndarray:
+        """Downscaled grayscale copy of a frame used for motion estimation"""
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        return cv2.resize(
+            gray, None, fx=self.motion_scale, fy=self.motion_scale, interpolation=cv2.INTER_AREA
+        )
+
+    def _motion_energy(self, thumbnail: np.ndarray) -> float:
+        """Mean absolute difference against the last inferred frame"""
+        return float(cv2.absdiff(thumbnail, self._reference).mean())
+
+    def frames(
+        self,
+        cap: cv2.VideoCapture,
+        decode_skipped: bool = False,
+        start_index: int = 0
+    ) -> Iterator[Tuple[int, np.ndarray, FrameAction]]:
+        """Iterate over ``(frame_index, frame, action)`` for a capture
+
+        Frames off the stride are skipped with ``cap.grab()`` so they are not
+        retrieved and colour converted. With ``decode_skipped`` they are
+        decoded as well and yielded as PASSTHROUGH so they can be written to
+        an output video. ``start_index`` is the index of the next frame the
+        capture will return, for captures that were seeked forward.
+        """
+        frame_index = start_index
+        while True:
+            if self.is_sampled(frame_index) or decode_skipped:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+
+                if self.is_sampled(frame_index):
+                    yield frame_index, frame, self.action_for(frame_index, frame)
+                else:
+                    yield frame_index, frame, FrameAction.PASSTHROUGH
+            elif not cap.grab():
+                break
+
+            frame_index += 1
@@ -0,0 +1,323 @@
+import abc
+import os
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+import torch
+from loguru import logger
+from ultralytics import YOLO
+
+try:
+    import onnxruntime as ort
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+except ImportError:  # onnxruntime is optional, only needed for its backend
+    ort = None
+
+try:
+    import openvino as ov
+except ImportError:  # openvino is optional, only needed for its backend
+    ov = None
+
+
+BACKENDS = ("pytorch", "torchscript", "onnxruntime", "openvino")
+
+# Quantization modes supported by each backend
+QUANTIZATION = {
+    "onnxruntime": ("int8",),
+    "openvino": ("int8",),
+}
+
+# Same defaults as ultralytics predictions
+IOU_THRESHOLD = 0.7
+MAX_DETECTIONS = 300
+LETTERBOX_COLOR = (114, 114, 114)
+STRIDE = 32
+
+
+@dataclass
+class BackendConfig:
+    """How detection models are run
+
+    ``name`` is one of ``BACKENDS``. ``quantize="int8"`` quantizes the
+    exported model: dynamic quantization of the weights for ONNX Runtime,
+    and NNCF post-training quantization for OpenVINO. Thread counts of 0
+    keep the runtime's default. ``imgsz`` is the inference resolution of
+    the longer image side.
+    """
+
+    name: str = "pytorch"
+    quantize: Optional[str] = None
+    intra_op_threads: int = 0
+    inter_op_threads: int = 0
+    imgsz: int = 640
+
+    def validate(self) -> None:
+        """Raise ValueError for an unknown backend or unsupported quantization"""
+        if self.name not in BACKENDS:
+            raise ValueError(f"Unknown inference backend: {self.name} (expected one of {', '.join(BACKENDS)})")
+        if self.quantize and self.quantize not in QUANTIZATION.get(self.name, ()):
+            raise ValueError(f"The {self.name} backend does not support {self.quantize} quantization")
+        if self.imgsz % STRIDE:
+            raise ValueError(f"Input resolution must be a multiple of {STRIDE}")
+
+
+def model_version(model_path: str, config: BackendConfig) -> str:
+    """Identify the weights and backend settings that produce a model's results"""
+    try:
+        stat = os.stat(model_path)
+        weights = f"{os.path.basename(model_path)}@{stat.st_size}-{int(stat.st_mtime)}"
+    except OSError:
+        weights = os.path.basename(model_path)
+    return f"{weights}/{config.name}/{config.quantize or 'fp32'}/{config.imgsz}"
+
+
+def configure_torch_threads(config: BackendConfig) -> None:
+    """Apply the thread counts to PyTorch, which also runs the ultralytics pre-processing"""
+    if config.intra_op_threads:
+        torch.set_num_threads(config.intra_op_threads)
+    if config.inter_op_threads and torch.get_num_interop_threads() != config.inter_op_threads:
+        try:
+            torch.set_num_interop_threads(config.inter_op_threads)
+        except RuntimeError:
+            # Can only be set once, before any inter-op parallel work
+            logger.warning("PyTorch inter-op threads already initialised, keeping the current setting")
+
+
+def load_detector(model_path: str, config: Optional[BackendConfig] = None):
+    """Load a YOLO detection model on the configured backend
+
+    ``pytorch`` and ``torchscript`` return an ultralytics ``YOLO`` model;
+    ``onnxruntime`` and ``openvino`` return a detector that runs the
+    exported model directly on the CPU runtime with its own thread
+    settings. All of them are called the same way,
+    ``model(images, conf=..., classes=..., imgsz=...)``, and return
+    results with ``boxes.xyxy``, ``boxes.conf`` and ``boxes.cls``.
+
+    Exported artifacts are created next to ``model_path`` on first use
+    (the Docker image can do this at build time) and reused afterwards.
+    They are exported with dynamic input shapes so batches and the ball
+    tracker's region crops still work.
+    """
+    config = config or BackendConfig()
+    config.validate()
+    if (config.name == "onnxruntime" and ort is None) or (config.name == "openvino" and ov is None):
+        raise RuntimeError(f"The {config.name} backend is not installed")
+    configure_torch_threads(config)
+
+    if config.name == "pytorch":
+        return YOLO(model_path)
+    if config.name == "torchscript":
+        return YOLO(export_model(model_path, "torchscript", config), task="detect")
+    if config.name == "onnxruntime":
+        path = export_model(model_path, "onnx", config)
+        if config.quantize == "int8":
+            path = quantize_onnx(path)
+        return OnnxRuntimeDetector(path, config)
+    return OpenVinoDetector(export_model(model_path, "openvino", config), config)
+
+
+def export_model(model_path: str, export_format: str, config: BackendConfig) -> str:
+    """Path of the exported artifact of a ``.pt`` model, exporting it if missing"""
+    root = os.path.splitext(model_path)[0]
+    int8 = export_format == "openvino" and config.quantize == "int8"
+    artifact = {
+        "torchscript": f"{root}.torchscript",
+        "onnx": f"{root}.onnx",
+        "openvino": f"{root}{'_int8' if int8 else ''}_openvino_model",
+    }[export_format]
+    if model_path.endswith((".torchscript", ".onnx", "_openvino_model")):
+        return model_path
+    if os.path.exists(artifact):
+        return artifact
+
+    logger.info(f"Exporting {model_path} to {export_format}{' (int8)' if int8 else ''}")
+    return str(YOLO(model_path).export(format=export_format, imgsz=config.imgsz, dynamic=True, int8=int8))
+
+
+def quantize_onnx(path: str) -> str:
+    """Dynamically quantize the weights of an ONNX model to 8 bits"""
+    if ort is None:
+        raise RuntimeError("onnxruntime is not installed")
+
+    quantized = f"{os.path.splitext(path)[0]}.int8.onnx"
+    if not os.path.exists(quantized):
+        logger.info(f"Quantizing {path} to int8")
+        # ConvInteger on the CPU only supports unsigned 8-bit weights
+        quantize_dynamic(path, quantized, weight_type=QuantType.QUInt8)
+    return quantized
+
+
+class HostArray(np.ndarray):
+    """NumPy array with the ``cpu()``/``numpy()`` accessors of a torch tensor"""
+
+    def cpu(self) -> "HostArray":
+        return self
+
+    def numpy(self) -> np.ndarray:
+        return self.view(np.ndarray)
+
+
+class DetectorBoxes:
+    """Boxes of one image, shaped like ultralytics ``Boxes``"""
+
+    def __init__(self, xyxy: np.ndarray, conf: np.ndarray, cls: np.ndarray):
+        self.xyxy = xyxy.view(HostArray)
+        self.conf = conf.view(HostArray)
+        self.cls = cls.view(HostArray)
+
+    def __len__(self) -> int:
+        return len(self.conf)
+
+
+class DetectorResult:
+    """Detections of one image, shaped like an ultralytics ``Results``"""
+
+    def __init__(self, boxes: DetectorBoxes):
+        self.boxes = boxes
+
+
+class ExportedDetector(abc.ABC):
+    """Run an exported YOLOv8 detection model without the ultralytics predictor
+
+    Images are letterboxed to ``imgsz`` on the longer side and padded to
+    the stride, the raw ``(batch, 4 + classes, anchors)`` output is
+    filtered by confidence and class, and overlapping boxes are removed
+    with class-aware NMS. Subclasses only implement ``_forward``.
+    """
+
+    def __init__(self, config: BackendConfig):
+        self.config = config
+
+    def __call__(
+        self,
+        images,
+        conf: float = 0.25,
+        classes: Optional[List[int]] = None,
+        imgsz: Optional[int] = None,
+        iou: float = IOU_THRESHOLD,
+        verbose: bool = False
+    ) -> List[DetectorResult]:
+        if isinstance(images, np.ndarray):
+            images = [images]
+        if not images:
+            return []
+
+        batch, transforms = self._preprocess(images, imgsz or self.config.imgsz)
+        output = self._forward(batch)
+        return [
+            self._postprocess(prediction, transform, image.shape[:2], conf, classes, iou)
+            for prediction, transform, image in zip(output, transforms, images)
+        ]
+
+    @abc.abstractmethod
+    def _forward(self, batch: np.ndarray) -> np.ndarray:
+        """Raw model output for an NCHW float batch"""
+
+    def _preprocess(self, images: List[np.ndarray], imgsz: int) -> Tuple[np.ndarray, list]:
+        """Letterbox a batch to a common stride-aligned shape as an NCHW float blob"""
+        scales = [min(imgsz / image.shape[0], imgsz / image.shape[1]) for image in images]
+        sizes = [
+            (round(image.shape[1] * scale), round(image.shape[0] * scale))
+            for image, scale in zip(images, scales)
+        ]
+        width = -(-max(size[0] for size in sizes) // STRIDE) * STRIDE
+        height = -(-max(size[1] for size in sizes) // STRIDE) * STRIDE
+
+        padded, transforms = [], []
+        for image, scale, (new_width, new_height) in zip(images, scales, sizes):
+            if (new_width, new_height) != (image.shape[1], image.shape[0]):
+                image = cv2.resize(image, (new_width, new_height), interpolation=cv2.INTER_LINEAR)
+            left, top = (width - new_width) // 2, (height - new_height) // 2
+            padded.append(cv2.copyMakeBorder(
+                image, top, height - new_height - top, left, width - new_width - left,
+                cv2.BORDER_CONSTANT, value=LETTERBOX_COLOR
+            ))
+            transforms.append((scale, left, top))
+
+        return cv2.dnn.blobFromImages(padded, 1 / 255.0, swapRB=True), transforms
+
+    def _postprocess(
+        self,
+        prediction: np.ndarray,
+        transform: Tuple[float, int, int],
+        shape: Tuple[int, int],
+        conf: float,
+        classes: Optional[List[int]],
+        iou: float
+    ) -> DetectorResult:
+        """Decode one image's raw output into boxes in original image pixels"""
+        prediction = prediction.T
+        scores = prediction[:, 4:]
+        class_id = scores.argmax(axis=1)
+        confidence = scores[np.arange(len(scores)), class_id]
+
+        keep = confidence >= conf
+        if classes is not None:
+            keep &= np.isin(class_id, classes)
+        boxes, confidence, class_id = prediction[keep, :4], confidence[keep], class_id[keep]
+
+        # Centre x/y, width, height to top-left x/y, width, height for NMS
+        tlwh = np.column_stack([boxes[:, :2] - boxes[:, 2:] / 2, boxes[:, 2:]])
+        indices = cv2.dnn.NMSBoxesBatched(tlwh.tolist(), confidence.tolist(), class_id.tolist(), conf, iou)
+        indices = np.asarray(indices, dtype=np.int64).reshape(-1)[:MAX_DETECTIONS]
+
+        scale, left, top = transform
+        xyxy = np.column_stack([tlwh[indices, :2], tlwh[indices, :2] + tlwh[indices, 2:]])
+        xyxy = (xyxy - [left, top, left, top]) / scale
+        xyxy[:, [0, 2]] = xyxy[:, [0, 2]].clip(0, shape[1])
+        xyxy[:, [1, 3]] = xyxy[:, [1, 3]].clip(0, shape[0])
+
+        return DetectorResult(DetectorBoxes(
+            xyxy.astype(np.float32),
+            confidence[indices].astype(np.float32),
+            class_id[indices].astype(np.float32)
+        ))
+
+
+class OnnxRuntimeDetector(ExportedDetector):
+    """Exported model run by ONNX Runtime on the CPU"""
+
+    def __init__(self, path: str, config: BackendConfig):
+        if ort is None:
+            raise RuntimeError("onnxruntime is not installed")
+        super().__init__(config)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = config.intra_op_threads
+        options.inter_op_num_threads = config.inter_op_threads
+        if config.inter_op_threads > 1:
+            options.execution_mode = ort.ExecutionMode.ORT_PARALLEL
+        self.session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def _forward(self, batch: np.ndarray) -> np.ndarray:
+        return self.session.run(None, {self.input_name: batch})[0]
+
+
+class OpenVinoDetector(ExportedDetector):
+    """Exported model compiled by OpenVINO for the CPU"""
+
+    def __init__(self, path: str, config: BackendConfig):
+        if ov is None:
+            raise RuntimeError("openvino is not installed")
+        super().__init__(config)
+
+        xml = next(
+            (os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith(".xml")), None
+        ) if os.path.isdir(path) else path
+        if xml is None:
+            raise FileNotFoundError(f"No OpenVINO model found in {path}")
+
+        properties = {"PERFORMANCE_HINT": "LATENCY"}
+        if config.intra_op_threads:
+            properties["INFERENCE_NUM_THREADS"] = config.intra_op_threads
+        if config.inter_op_threads:
+            properties["NUM_STREAMS"] = config.inter_op_threads
+        core = ov.Core()
+        self.model = core.compile_model(core.read_model(xml), "CPU", properties)
+
+    def _forward(self, batch: np.ndarray) -> np.ndarray:
+        return self.model([batch])[self.model.output(0)]
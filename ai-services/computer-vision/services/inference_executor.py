@@ -0,0 +1,126 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from loguru import logger
+
+
+class InferenceQueueFullError(RuntimeError):
+    """Raised when the inference executor already has too much queued work"""
+
+
+class InferenceTimeoutError(TimeoutError):
+    """Raised when inference or decoding does not finish within its timeout"""
+
+
+class InferenceExecutor:
+    """Size-limited thread pool for CPU-heavy inference and image decoding
+
+    Keeps model calls and ``cv2.imdecode`` off the event loop so that cheap
+    endpoints such as ``/health`` stay responsive while large uploads are
+    processed. At most ``max_workers`` tasks run at once and at most
+    ``max_queue`` wait for a thread; further submissions are rejected with
+    ``InferenceQueueFullError``. A caller that waits longer than its timeout
+    gets ``InferenceTimeoutError``. A task that has not started yet is then
+    cancelled, but one that is already running cannot be interrupted and
+    finishes in the background.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_queue: int = 32,
+        timeout: Optional[float] = 30.0
+    ):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.timeout = timeout
+
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="inference")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._wait_seconds_total = 0.0
+        self._wait_seconds_max = 0.0
+        self._run_seconds_total = 0.0
+
+    async def run(self, fn: Callable[..., Any], *args, timeout: Optional[float] = None) -> Any:
+        """Run ``fn(*args)`` on the pool and await its result"""
+        with self._lock:
+            if self._queued >= self.max_queue:
+                self._rejected += 1
+                raise InferenceQueueFullError(
+                    f"Inference queue is full ({self._queued} waiting, {self._in_flight} running)"
+                )
+            self._queued += 1
+
+        submitted = time.perf_counter()
+
+        def task() -> Any:
+            started = time.perf_counter()
+            with self._lock:
+                self._queued -= 1
+                self._in_flight += 1
+                wait = started - submitted
+                self._wait_seconds_total += wait
+                self._wait_seconds_max = max(self._wait_seconds_max, wait)
+
+            succeeded = False
+            try:
+                result = fn(*args)
+                succeeded = True
+                return result
+            finally:
+                with self._lock:
+                    self._in_flight -= 1
+                    self._run_seconds_total += time.perf_counter() - started
+                    if succeeded:
+                        self._completed += 1
+                    else:
+                        self._failed += 1
+
+        future = self._pool.submit(task)
+        timeout = timeout if timeout is not None else self.timeout
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            # Release the queue slot if the task never got a thread
+            if future.cancel():
+                with self._lock:
+                    self._queued -= 1
+            with self._lock:
+                self._timed_out += 1
+            logger.warning(f"Inference task {getattr(fn, '__name__', fn)} timed out after {timeout}s")
+            raise InferenceTimeoutError(f"Inference did not finish within {timeout}s")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Queue depth, in-flight count and wait statistics"""
+        with self._lock:
+            started = self._completed + self._failed + self._in_flight
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queue_depth": self._queued,
+                "in_flight": self._in_flight,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "timed_out": self._timed_out,
+                "avg_wait_ms": self._wait_seconds_total / started * 1000 if started else 0.0,
+                "max_wait_ms": self._wait_seconds_max * 1000,
+                "avg_run_ms": (
+                    self._run_seconds_total / (self._completed + self._failed) * 1000
+                    if self._completed + self._failed else 0.0
+                ),
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker threads"""
+        self._pool.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,131 @@
+import asyncio
+import threading
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+from loguru import logger
+
+from models.detection_models import PlayerPosition
+from services.player_detection import PlayerDetectionService
+
+
+class DetectionBatcher:
+    """Coalesce concurrent single-image detection requests into batched model calls
+
+    The first request to arrive opens a window of ``window_ms``. Requests
+    with the same confidence threshold that arrive before the window closes
+    join it, and the window is flushed early once ``max_batch_size`` images
+    are waiting. Each flush is one ``detect_players_batch`` call and every
+    caller gets back the detections for its own image. A window of 0 or a
+    max batch size of 1 disables coalescing.
+    """
+
+    def __init__(
+        self,
+        service: PlayerDetectionService,
+        window_ms: float = 10.0,
+        max_batch_size: int = 8
+    ):
+        if window_ms < 0:
+            raise ValueError("window_ms must not be negative")
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+
+        self.service = service
+        self.window_ms = window_ms
+        self.max_batch_size = max_batch_size
+
+        self._pending: Dict[float, List[Tuple[np.ndarray, asyncio.Future]]] = {}
+        self._timers: Dict[float, asyncio.TimerHandle] = {}
+        self._running: "set[asyncio.Task]" = set()
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._batches = 0
+        self._max_batch_seen = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Check if requests are coalesced at all"""
+        return self.window_ms > 0 and self.max_batch_size > 1
+
+    async def detect_players(
+        self,
+        image: np.ndarray,
+        confidence_threshold: float = 0.5
+    ) -> List[PlayerPosition]:
+        """Detect players in one image, sharing a model call with concurrent requests"""
+        if not self.enabled:
+            self._record_batch(1)
+            return await self.service.detect_players(image, confidence_threshold)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._pending.setdefault(confidence_threshold, [])
+        pending.append((image, future))
+
+        if len(pending) >= self.max_batch_size:
+            self._flush(confidence_threshold)
+        elif len(pending) == 1:
+            self._timers[confidence_threshold] = loop.call_later(
+                self.window_ms / 1000, self._flush, confidence_threshold
+            )
+
+        return await future
+
+    def _flush(self, confidence_threshold: float) -> None:
+        """Close the window for a threshold and run its batch"""
+        timer = self._timers.pop(confidence_threshold, None)
+        if timer is not None:
+            timer.cancel()
+
+        batch = self._pending.pop(confidence_threshold, [])
+        if not batch:
+            return
+
+        # Keep a reference so the task is not garbage collected mid-flight
+        task = asyncio.get_running_loop().create_task(self._run_batch(batch, confidence_threshold))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run_batch(
+        self,
+        batch: List[Tuple[np.ndarray, asyncio.Future]],
+        confidence_threshold: float
+    ) -> None:
+        """Run one model call for a batch and resolve each caller's future"""
+        self._record_batch(len(batch))
+        images = [image for image, _ in batch]
+        try:
+            results = await self.service.detect_players_batch(images, confidence_threshold)
+        except Exception as e:
+            logger.warning(f"Batched detection of {len(batch)} images failed: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), players in zip(batch, results):
+            # The caller may have gone away while the batch was running
+            if not future.done():
+                future.set_result(players)
+
+    def _record_batch(self, size: int) -> None:
+        """Count a model call of ``size`` requests"""
+        with self._lock:
+            self._requests += size
+            self._batches += 1
+            self._max_batch_seen = max(self._max_batch_seen, size)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Batch counts and sizes"""
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "window_ms": self.window_ms,
+                "max_batch_size": self.max_batch_size,
+                "requests": self._requests,
+                "batches": self._batches,
+                "avg_batch_size": self._requests / self._batches if self._batches else 0.0,
+                "max_batch_seen": self._max_batch_seen,
+                "pending": sum(len(batch) for batch in self._pending.values()),
+            }
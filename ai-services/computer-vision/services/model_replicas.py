@@ -0,0 +1,66 @@
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+
+class ModelReplicas:
+    """Pool of model instances, so concurrent threads never share one
+
+    YOLO models and exported runtimes are not safe to call from several
+    threads at once. Each caller borrows a replica for the duration of a
+    call; a new one is loaded with ``load`` when all are busy and fewer
+    than ``max_replicas`` exist, otherwise the caller waits for one to be
+    returned.
+    """
+
+    def __init__(self, load: Callable[[], Any], max_replicas: int = 1):
+        self.load = load
+        self.max_replicas = max(1, max_replicas)
+        self._idle: "queue.Queue" = queue.Queue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    @property
+    def created(self) -> int:
+        """Number of replicas loaded so far"""
+        return self._created
+
+    def reset(self, model: Any) -> None:
+        """Start over with ``model`` as the only replica"""
+        with self._lock:
+            self._idle = queue.Queue()
+            self._idle.put(model)
+            self._created = 1
+
+    def fill(self) -> None:
+        """Load the missing replicas up to ``max_replicas``"""
+        with self._lock:
+            missing = self.max_replicas - self._created
+            self._created += missing
+        for _ in range(missing):
+            self._idle.put(self.load())
+
+    @contextmanager
+    def acquire(self) -> Iterator[Any]:
+        """Borrow a replica for the calling thread, creating one if allowed"""
+        try:
+            model = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                create = self._created < self.max_replicas
+                if create:
+                    self._created += 1
+            if not create:
+                model = self._idle.get()
+            else:
+                try:
+                    model = self.load()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+        try:
+            yield model
+        finally:
+            self._idle.put(model)
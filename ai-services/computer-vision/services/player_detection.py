@@ -1,12 +1,44 @@
+import asyncio
+import time
 import cv2
 import numpy as np
-from ultralytics import YOLO
-from typing import List, Tuple, Optional
+from typing import Callable, List, Tuple, Optional, Union
 import torch
 from loguru import logger
 import json
 from dataclasses import dataclass
 from models.detection_models import PlayerPosition, DetectionResult
+from services.field_mapping import CameraView, FieldMappingService
+from services.frame_sampling import FrameAction, FrameSampler
+from services.inference_executor import InferenceExecutor
+from services.inference_backends import BackendConfig, load_detector, model_version
+from services.model_replicas import ModelReplicas
+from services.tiled_inference import TiledInference, TilingConfig
+from services.team_colors import UNASSIGNED, TeamColorProfile, TeamColorProfileCache
+from services.player_tracking import PlayerTracker
+from services.tracking_store import TrackingStoreWriter
+from services.video_pipeline import VideoPipeline
+
+
+# Compact per-frame detection record; team_id/player_id use UNASSIGNED (-1) and
+# pitch_x/pitch_y NaN for None
+DETECTION_DTYPE = np.dtype([
+    ("x", np.float32),
+    ("y", np.float32),
+    ("width", np.float32),
+    ("height", np.float32),
+    ("confidence", np.float32),
+    ("team_id", np.int32),
+    ("player_id", np.int32),
+    ("pitch_x", np.float32),
+    ("pitch_y", np.float32),
+])
+
+# Fixed kit colours (red home team vs blue away team), used when no per-match
+# TeamColorProfile has been learned yet
+HOME_KIT_HSV_RANGE = (np.array([0, 50, 50]), np.array([10, 255, 255]))
+AWAY_KIT_HSV_RANGE = (np.array([100, 50, 50]), np.array([130, 255, 255]))
+MIN_KIT_PIXELS = 100
 
 
 @dataclass
@@ -19,22 +51,103 @@ class PlayerDetection:
 
 
 class PlayerDetectionService:
-    def __init__(self, model_path: str = "models/yolov8n.pt"):
-        """Initialize player detection service with YOLOv8 model"""
+    def __init__(
+        self, 
+        model_path: str = "models/yolov8n.pt",
+        executor: Optional[InferenceExecutor] = None,
+        model_replicas: int = 1,
+        field_mapping: Optional[FieldMappingService] = None,
+        backend: Optional[BackendConfig] = None,
+        preload: bool = True,
+        tiling: Optional[TilingConfig] = None
+    ):
+        """Initialize player detection service with YOLOv8 model
+        
+        The async detection methods run on ``executor`` so they do not block
+        the event loop. YOLO models are not safe to call from several
+        threads at once, so each concurrent call uses its own replica of the
+        model, up to ``model_replicas``. With ``field_mapping`` the players
+        of processed videos also get pitch coordinates.
+        
+        ``backend`` selects the runtime, quantization, thread counts and
+        input resolution (see ``load_detector``). With ``preload=False``
+        the model is not loaded here; the caller runs ``load_model`` and
+        ``warm_up``, e.g. in the application lifespan. ``tiling`` runs
+        overlapping tiles of each frame in the same model call to find
+        small, distant players (see ``TilingConfig``).
+        """
         self.model_path = model_path
+        self.backend = backend or BackendConfig()
         self.model = None
+        self.load_seconds: Optional[float] = None
+        self.warmup_seconds: Optional[float] = None
+        self.executor = executor or InferenceExecutor()
+        self.model_replicas = max(1, model_replicas)
+        self.field_mapping = field_mapping
+        self.tiling = TiledInference(tiling) if tiling is not None and tiling.enabled else None
+        self.team_profiles = TeamColorProfileCache()
+        self._replicas = ModelReplicas(lambda: load_detector(self.model_path, self.backend), self.model_replicas)
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
-        self.load_model()
+        if preload:
+            self.load_model()
     
     def load_model(self):
         """Load YOLOv8 model for player detection"""
         try:
-            self.model = YOLO(self.model_path)
-            logger.info(f"Player detection model loaded successfully on {self.device}")
+            start = time.perf_counter()
+            self.model = load_detector(self.model_path, self.backend)
+            self._replicas.reset(self.model)
+            self.load_seconds = time.perf_counter() - start
+            logger.info(
+                f"Player detection model loaded successfully on {self.device} in {self.load_seconds:.2f}s"
+            )
         except Exception as e:
             logger.error(f"Failed to load player detection model: {e}")
             self.model = None
     
+    def warm_up(self, image_size: Tuple[int, int] = (720, 1280)) -> None:
+        """Create every model replica and run each once on a blank frame
+        
+        The first call of a YOLO model sets up its predictor, fuses layers
+        and allocates buffers; doing that here keeps it out of the first
+        requests.
+        """
+        if not self.is_model_loaded():
+            raise RuntimeError("Player detection model not loaded")
+        
+        start = time.perf_counter()
+        self._replicas.fill()
+        
+        dummy = np.zeros((*image_size, 3), dtype=np.uint8)
+        for _ in range(self.model_replicas):
+            self._detect_batch([dummy])
+        self.warmup_seconds = time.perf_counter() - start
+        logger.info(f"Warmed up {self.model_replicas} player detection model(s) in {self.warmup_seconds:.2f}s")
+    
+    @property
+    def model_version(self) -> str:
+        """Weights and backend settings, part of cached result keys"""
+        version = model_version(self.model_path, self.backend)
+        if self.tiling is not None:
+            tiling = self.tiling.config
+            version += f"/tiles-{tiling.mode}-{tiling.tile_size}-{tiling.overlap}-{tiling.merge_threshold}"
+        return version
+    
+    def model_status(self) -> dict:
+        """Load state and start-up timings of the model"""
+        return {
+            "loaded": self.is_model_loaded(),
+            "warmed_up": self.warmup_seconds is not None,
+            "model_path": self.model_path,
+            "backend": self.backend.name,
+            "quantize": self.backend.quantize,
+            "imgsz": self.backend.imgsz,
+            "device": self.device if self.backend.name == "pytorch" else "cpu",
+            "replicas": self._replicas.created,
+            "load_seconds": self.load_seconds,
+            "warmup_seconds": self.warmup_seconds
+        }
+    
     def is_model_loaded(self) -> bool:
         """Check if model is loaded"""
         return self.model is not None
@@ -42,122 +155,342 @@ class PlayerDetectionService:
     async def detect_players(
         self, 
         image: np.ndarray, 
+        confidence_threshold: float = 0.5,
+        compact: bool = False
+    ) -> Union[List[PlayerPosition], np.ndarray]:
+        """Detect players in an image
+        
+        With ``compact=True`` the detections are returned as a structured
+        array of ``DETECTION_DTYPE`` instead of ``PlayerPosition`` objects.
+        """
+        batch_players = await self.detect_players_batch([image], confidence_threshold, compact)
+        return batch_players[0]
+    
+    async def detect_players_batch(
+        self, 
+        images: List[np.ndarray], 
+        confidence_threshold: float = 0.5,
+        compact: bool = False
+    ) -> List[Union[List[PlayerPosition], np.ndarray]]:
+        """Detect players in several images with a single model call"""
+        detections = await self.executor.run(self._detect_batch, images, confidence_threshold)
+        if compact:
+            return detections
+        return [self._to_player_positions(frame_detections) for frame_detections in detections]
+    
+    def _detect_batch(
+        self, 
+        images: List[np.ndarray], 
         confidence_threshold: float = 0.5
-    ) -> List[PlayerPosition]:
-        """Detect players in an image"""
+    ) -> List[np.ndarray]:
+        """Run the model on a batch of images and return one detection array per image"""
         if not self.is_model_loaded():
             raise RuntimeError("Player detection model not loaded")
         
+        if not images:
+            return []
+        
         try:
-            # Run inference
-            results = self.model(image, conf=confidence_threshold, verbose=False)
-            
-            players = []
-            for result in results:
-                boxes = result.boxes
-                if boxes is not None:
-                    for box in boxes:
-                        # Get bounding box coordinates
-                        x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                        confidence = box.conf[0].cpu().numpy()
-                        class_id = int(box.cls[0].cpu().numpy())
-                        
-                        # Filter for person class (class 0 in COCO)
-                        if class_id == 0:
-                            player = PlayerPosition(
-                                x=float((x1 + x2) / 2),
-                                y=float((y1 + y2) / 2),
-                                width=float(x2 - x1),
-                                height=float(y2 - y1),
-                                confidence=float(confidence),
-                                team_id=None,  # Will be assigned later
-                                player_id=None
-                            )
-                            players.append(player)
-            
-            return players
+            # Run inference on the whole batch at once
+            with self._replicas.acquire() as model:
+                if self.tiling is None:
+                    results = model(images, conf=confidence_threshold, imgsz=self.backend.imgsz, verbose=False)
+                else:
+                    results = self._detect_tiled(model, images, confidence_threshold)
+            return [self._detections_from_result(result) for result in results]
             
         except Exception as e:
             logger.error(f"Error in player detection: {e}")
-            return []
+            return [np.empty(0, dtype=DETECTION_DTYPE) for _ in images]
+    
+    def _detect_tiled(self, model, images: List[np.ndarray], confidence_threshold: float) -> list:
+        """Run the tiles of all images in one model call and merge them per image"""
+        crops, regions = zip(*(self.tiling.crops(image) for image in images))
+        results = model(
+            [crop for image_crops in crops for crop in image_crops],
+            conf=confidence_threshold,
+            imgsz=self.tiling.config.tile_size,
+            verbose=False
+        )
+        
+        merged, start = [], 0
+        for image_regions in regions:
+            merged.append(self.tiling.merge(results[start:start + len(image_regions)], image_regions))
+            start += len(image_regions)
+        return merged
+    
+    def _detections_from_result(self, result) -> np.ndarray:
+        """Convert a single YOLO result into a detection array
+        
+        Each tensor is copied to the host once per frame and the person
+        boxes are converted with array operations.
+        """
+        boxes = result.boxes
+        if boxes is None or len(boxes) == 0:
+            return np.empty(0, dtype=DETECTION_DTYPE)
+        
+        xyxy = boxes.xyxy.cpu().numpy()
+        confidence = boxes.conf.cpu().numpy()
+        class_id = boxes.cls.cpu().numpy()
+        
+        # Filter for person class (class 0 in COCO)
+        is_person = class_id == 0
+        xyxy = xyxy[is_person]
+        
+        detections = np.empty(len(xyxy), dtype=DETECTION_DTYPE)
+        detections["x"] = (xyxy[:, 0] + xyxy[:, 2]) / 2
+        detections["y"] = (xyxy[:, 1] + xyxy[:, 3]) / 2
+        detections["width"] = xyxy[:, 2] - xyxy[:, 0]
+        detections["height"] = xyxy[:, 3] - xyxy[:, 1]
+        detections["confidence"] = confidence[is_person]
+        detections["team_id"] = UNASSIGNED  # Will be assigned later
+        detections["player_id"] = UNASSIGNED
+        detections["pitch_x"] = np.nan
+        detections["pitch_y"] = np.nan
+        return detections
+    
+    def _to_player_positions(self, detections: np.ndarray) -> List[PlayerPosition]:
+        """Convert a detection array into player positions"""
+        return [
+            PlayerPosition(
+                x=float(row["x"]),
+                y=float(row["y"]),
+                width=float(row["width"]),
+                height=float(row["height"]),
+                confidence=float(row["confidence"]),
+                team_id=int(row["team_id"]) if row["team_id"] != UNASSIGNED else None,
+                player_id=int(row["player_id"]) if row["player_id"] != UNASSIGNED else None,
+                pitch_x=float(row["pitch_x"]) if not np.isnan(row["pitch_x"]) else None,
+                pitch_y=float(row["pitch_y"]) if not np.isnan(row["pitch_y"]) else None
+            )
+            for row in detections
+        ]
+    
+    def _to_detection_array(self, players: List[PlayerPosition]) -> np.ndarray:
+        """Convert player positions into a detection array"""
+        detections = np.empty(len(players), dtype=DETECTION_DTYPE)
+        for i, player in enumerate(players):
+            detections[i] = (
+                player.x,
+                player.y,
+                player.width,
+                player.height,
+                player.confidence,
+                player.team_id if player.team_id is not None else UNASSIGNED,
+                player.player_id if player.player_id is not None else UNASSIGNED,
+                player.pitch_x if player.pitch_x is not None else np.nan,
+                player.pitch_y if player.pitch_y is not None else np.nan
+            )
+        return detections
     
     async def detect_teams(
         self, 
         image: np.ndarray, 
-        players: List[PlayerPosition]
+        players: List[PlayerPosition],
+        profile_key: Optional[str] = None
     ) -> List[PlayerPosition]:
-        """Assign team IDs to detected players based on jersey colors"""
+        """Assign team IDs to detected players based on jersey colors
+        
+        With a ``profile_key`` (a match or video ID) the team colours are
+        learned per match, see ``TeamColorProfile``.
+        """
         if not players:
             return players
         
+        profile = self.team_profiles.get(profile_key) if profile_key else None
+        team_ids = await self.executor.run(
+            self._team_ids, image, self._to_detection_array(players), profile
+        )
+        for player, team_id in zip(players, team_ids):
+            player.team_id = int(team_id) if team_id != UNASSIGNED else None
+        return players
+    
+    def _team_ids(
+        self, 
+        image: np.ndarray, 
+        detections: np.ndarray, 
+        profile: Optional[TeamColorProfile] = None
+    ) -> np.ndarray:
+        """Determine a team ID for every detection, UNASSIGNED where unknown
+        
+        Without a fitted ``profile`` kit pixels are counted for all boxes in
+        one pass: the pixels of every player region are gathered into a
+        single strip, which is converted to HSV and masked once, and the
+        counts per box are read with a segmented sum. Only pixels inside
+        boxes are converted, not the whole frame.
+        
+        With a fitted profile each box's mean torso colour is looked up
+        against the learned centroids instead.
+        """
+        team_ids = detections["team_id"].copy()
+        if len(detections) == 0:
+            return team_ids
+        
         try:
-            # Convert to HSV for better color detection
-            hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
-            
-            for player in players:
-                # Get player region
-                x, y = int(player.x), int(player.y)
-                w, h = int(player.width), int(player.height)
-                
-                # Ensure coordinates are within image bounds
-                x1 = max(0, x - w//2)
-                y1 = max(0, y - h//2)
-                x2 = min(image.shape[1], x + w//2)
-                y2 = min(image.shape[0], y + h//2)
-                
-                if x1 < x2 and y1 < y2:
-                    player_region = hsv[y1:y2, x1:x2]
-                    
-                    # Analyze dominant colors in player region
-                    team_id = self._analyze_jersey_colors(player_region)
-                    player.team_id = team_id
+            # Player regions, clipped to the image bounds
+            x = detections["x"].astype(np.int64)
+            y = detections["y"].astype(np.int64)
+            half_w = detections["width"].astype(np.int64) // 2
+            half_h = detections["height"].astype(np.int64) // 2
             
-            return players
+            x1 = np.maximum(0, x - half_w)
+            y1 = np.maximum(0, y - half_h)
+            x2 = np.minimum(image.shape[1], x + half_w)
+            y2 = np.minimum(image.shape[0], y + half_h)
+            
+            valid = (x1 < x2) & (y1 < y2)
+            if not valid.any():
+                return team_ids
+            boxes = (x1[valid], y1[valid], x2[valid], y2[valid])
+            
+            if profile is not None:
+                features = self._jersey_features(image, *boxes)
+                if profile.is_fitted:
+                    team_ids[valid] = profile.classify(features)
+                    return team_ids
+            
+            strip, starts = self._gather_regions(image, *boxes)
+            hsv = cv2.cvtColor(strip, cv2.COLOR_BGR2HSV)
+            home_pixels = self._count_per_region(cv2.inRange(hsv, *HOME_KIT_HSV_RANGE), starts)
+            away_pixels = self._count_per_region(cv2.inRange(hsv, *AWAY_KIT_HSV_RANGE), starts)
+            team_ids[valid] = self._teams_from_pixel_counts(home_pixels, away_pixels)
+            
+            if profile is not None:
+                profile.observe(features, team_ids[valid])
+            return team_ids
             
         except Exception as e:
             logger.error(f"Error in team detection: {e}")
-            return players
+            return team_ids
     
-    def _analyze_jersey_colors(self, region: np.ndarray) -> Optional[int]:
-        """Analyze jersey colors to determine team"""
-        try:
-            if region.size == 0:
-                return None
-            
-            # Calculate color histogram
-            hist = cv2.calcHist([region], [0, 1], None, [180, 256], [0, 180, 0, 256])
-            
-            # Find dominant colors
-            # This is a simplified approach - in production, you'd use more sophisticated
-            # color analysis and team-specific color profiles
-            
-            # Example: detect red vs blue teams
-            red_mask = cv2.inRange(region, np.array([0, 50, 50]), np.array([10, 255, 255]))
-            blue_mask = cv2.inRange(region, np.array([100, 50, 50]), np.array([130, 255, 255]))
-            
-            red_pixels = cv2.countNonZero(red_mask)
-            blue_pixels = cv2.countNonZero(blue_mask)
-            
-            if red_pixels > blue_pixels and red_pixels > 100:
-                return 1  # Home team (red)
-            elif blue_pixels > red_pixels and blue_pixels > 100:
-                return 2  # Away team (blue)
-            else:
-                return None
-                
-        except Exception as e:
-            logger.error(f"Error in color analysis: {e}")
-            return None
+    def _gather_regions(
+        self, 
+        image: np.ndarray, 
+        x1: np.ndarray, 
+        y1: np.ndarray, 
+        x2: np.ndarray, 
+        y2: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Gather image regions into one single-row (1, pixels, 3) strip
+        
+        Returns the strip and the offset at which each region starts.
+        """
+        regions = [
+            image[top:bottom, left:right].reshape(-1, 3)
+            for left, top, right, bottom in zip(x1, y1, x2, y2)
+        ]
+        starts = np.cumsum([0] + [len(region) for region in regions[:-1]])
+        return np.concatenate(regions)[np.newaxis], starts
+    
+    def _count_per_region(self, mask: np.ndarray, starts: np.ndarray) -> np.ndarray:
+        """Count non-zero mask pixels in consecutive regions beginning at ``starts``"""
+        return np.add.reduceat(mask.ravel(), starts, dtype=np.int64) // 255
+    
+    def _jersey_features(
+        self, 
+        image: np.ndarray, 
+        x1: np.ndarray, 
+        y1: np.ndarray, 
+        x2: np.ndarray, 
+        y2: np.ndarray
+    ) -> np.ndarray:
+        """Mean Lab colour of the torso of each player region"""
+        width = x2 - x1
+        height = y2 - y1
+        
+        # Central half of the width, from below the head to the waist
+        torso_x1 = x1 + width // 4
+        torso_x2 = np.maximum(torso_x1 + 1, x2 - width // 4)
+        torso_y1 = y1 + height // 6
+        torso_y2 = np.maximum(torso_y1 + 1, y1 + height // 2)
+        
+        strip, starts = self._gather_regions(image, torso_x1, torso_y1, torso_x2, torso_y2)
+        lab = cv2.cvtColor(strip, cv2.COLOR_BGR2Lab)[0]
+        
+        sums = np.add.reduceat(lab, starts, axis=0, dtype=np.float64)
+        counts = np.diff(np.append(starts, len(lab)))
+        return (sums / counts[:, np.newaxis]).astype(np.float32)
+    
+    def _teams_from_pixel_counts(
+        self, 
+        home_pixels: np.ndarray, 
+        away_pixels: np.ndarray
+    ) -> np.ndarray:
+        """Pick the team whose kit colour dominates each region"""
+        return np.select(
+            [
+                (home_pixels > away_pixels) & (home_pixels > MIN_KIT_PIXELS),
+                (away_pixels > home_pixels) & (away_pixels > MIN_KIT_PIXELS),
+            ],
+            [1, 2],  # Home team (red), away team (blue)
+            default=UNASSIGNED
+        )
     
     async def process_video(
         self, 
         video_path: str, 
-        output_path: Optional[str] = None
-    ) -> List[DetectionResult]:
-        """Process entire video for player detection"""
+        output_path: Optional[str] = None,
+        batch_size: int = 1,
+        pipelined: bool = False,
+        queue_size: int = 8,
+        compact: bool = False,
+        sampler: Optional[FrameSampler] = None,
+        team_profile_key: Optional[str] = None,
+        start_frame: int = 0,
+        on_result: Optional[Callable[[int, Union[DetectionResult, np.ndarray]], None]] = None,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+        tracks: Optional[TrackingStoreWriter] = None,
+        tracker: Optional[PlayerTracker] = None,
+        raise_errors: bool = False
+    ) -> List[Union[DetectionResult, np.ndarray]]:
+        """Process entire video for player detection
+        
+        Frames are decoded into batches of ``batch_size`` and each batch is
+        run through the model in one call. The results are identical to the
+        per-frame path (``batch_size=1``).
+        
+        With ``pipelined=True`` decoding, inference and annotate+encode run
+        on separate threads connected by queues holding at most
+        ``queue_size`` batches (see ``VideoPipeline``).
+        
+        With ``compact=True`` each frame is returned as a structured array
+        of ``DETECTION_DTYPE`` instead of a ``DetectionResult``; the frame
+        timestamp is ``index / fps``.
+        
+        ``sampler`` selects which frames are inferred (see ``FrameSampler``);
+        by default every frame is. Results are returned for sampled frames
+        only, and ``sampler.inferred_frames`` lists the frames that actually
+        went through the model.
+        
+        ``team_profile_key`` (usually the match ID or video path) enables
+        team colour profiles learned per match instead of the fixed red/blue
+        kit ranges; see ``TeamColorProfile``.
+        
+        After team assignment the detections of each inferred frame are
+        associated with those of earlier frames by ``tracker`` (a fresh
+        ``PlayerTracker`` by default), which fills in ``player_id``. With
+        field mapping their feet are then projected to ``pitch_x``/``pitch_y``.
+        
+        Processing can begin at ``start_frame`` to resume an interrupted
+        run. ``on_result`` receives ``(frame_index, result)`` as each frame
+        completes instead of results being collected and returned, and
+        ``on_progress`` is called with the frame count and total frames
+        whenever progress is logged. The detections of every reported frame
+        are also appended to ``tracks`` when given (see
+        ``TrackingStoreWriter``). Errors are logged and an empty list
+        returned unless ``raise_errors`` is set.
+        """
         if not self.is_model_loaded():
             raise RuntimeError("Player detection model not loaded")
         
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        
+        sampler = sampler or FrameSampler()
+        tracker = tracker if tracker is not None else PlayerTracker()
+        camera = CameraView() if self.field_mapping else None
+        profile = self.team_profiles.get(team_profile_key) if team_profile_key else None
+        
         try:
             cap = cv2.VideoCapture(video_path)
             if not cap.isOpened():
@@ -165,9 +498,7 @@ class PlayerDetectionService:
             
             fps = cap.get(cv2.CAP_PROP_FPS)
             total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            
-            results = []
-            frame_count = 0
+            sampler.configure(fps)
             
             # Setup video writer if output path is provided
             writer = None
@@ -177,67 +508,153 @@ class PlayerDetectionService:
                 height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
                 writer = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
             
-            while True:
-                ret, frame = cap.read()
-                if not ret:
-                    break
-                
-                # Detect players
-                players = await self.detect_players(frame)
-                
-                # Assign teams
-                players = await self.detect_teams(frame, players)
-                
-                # Create detection result
-                result = DetectionResult(
-                    players=players,
-                    frame_timestamp=frame_count / fps,
-                    confidence_threshold=0.5
-                )
-                results.append(result)
-                
-                # Draw detections on frame if output is requested
+            pipeline = VideoPipeline(
+                infer_batch=self._detect_batch,
+                finish_frame=lambda index, frame, detections, action: self._finish_frame(
+                    index,
+                    frame,
+                    detections,
+                    fps,
+                    action,
+                    annotate=writer is not None,
+                    compact=compact,
+                    profile=profile,
+                    tracks=tracks,
+                    tracker=tracker,
+                    camera=camera
+                ),
+                batch_size=batch_size,
+                queue_size=queue_size
+            )
+            if start_frame > 0:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+            frames = sampler.frames(
+                cap, decode_skipped=writer is not None, start_index=start_frame
+            )
+            
+            results = []
+            result_count = 0
+            
+            def emit(frame_index: int, result: Union[DetectionResult, np.ndarray]) -> None:
+                nonlocal result_count
+                result_count += 1
+                if on_result:
+                    on_result(frame_index, result)
+                else:
+                    results.append(result)
+            
+            log_progress = self._progress_logger(total_frames, on_progress)
+            
+            # Whole videos run on the loop's default executor rather than the
+            # inference executor, so they do not hold its threads for minutes
+            run = pipeline.run if pipelined else pipeline.run_inline
+            try:
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(None, run, frames, writer, log_progress, emit)
+            finally:
+                cap.release()
                 if writer:
-                    annotated_frame = self._draw_detections(frame, players)
-                    writer.write(annotated_frame)
-                
-                frame_count += 1
-                
-                # Log progress
-                if frame_count % 100 == 0:
-                    logger.info(f"Processed {frame_count}/{total_frames} frames")
-            
-            cap.release()
-            if writer:
-                writer.release()
-            
-            logger.info(f"Video processing completed. Processed {len(results)} frames")
+                    writer.release()
+            
+            logger.info(
+                f"Video processing completed. Processed {result_count} frames, "
+                f"inferred {len(sampler.inferred_frames)}"
+            )
             return results
             
         except Exception as e:
+            if raise_errors:
+                raise
             logger.error(f"Error in video processing: {e}")
             return []
     
+    def _finish_frame(
+        self, 
+        frame_index: int, 
+        frame: np.ndarray, 
+        detections: Optional[np.ndarray], 
+        fps: float, 
+        action: FrameAction = FrameAction.INFER,
+        annotate: bool = False,
+        compact: bool = False,
+        profile: Optional[TeamColorProfile] = None,
+        tracks: Optional[TrackingStoreWriter] = None,
+        tracker: Optional[PlayerTracker] = None,
+        camera: Optional[CameraView] = None
+    ) -> Tuple[Union[DetectionResult, np.ndarray], Optional[np.ndarray]]:
+        """Assign teams, player IDs and pitch positions, build the frame result and optionally annotate the frame
+        
+        Detections of CARRY and PASSTHROUGH frames come from the last inferred
+        frame and already have their teams and player IDs assigned.
+        """
+        if detections is None:
+            detections = np.empty(0, dtype=DETECTION_DTYPE)
+        elif action == FrameAction.INFER:
+            detections["team_id"] = self._team_ids(frame, detections, profile)
+            if tracker is not None:
+                detections["player_id"] = tracker.update(detections, frame_index)
+            if camera is not None:
+                self.field_mapping.update(frame, camera)
+                pitch = self.field_mapping.project_detections(detections, camera.homography)
+                detections["pitch_x"] = pitch[:, 0]
+                detections["pitch_y"] = pitch[:, 1]
+        else:
+            detections = detections.copy()
+        
+        if tracks is not None and action != FrameAction.PASSTHROUGH:
+            tracks.append(frame_index, frame_index / fps, detections)
+        
+        if compact:
+            result = detections
+        else:
+            result = DetectionResult(
+                players=self._to_player_positions(detections),
+                frame_timestamp=frame_index / fps,
+                confidence_threshold=0.5
+            )
+        
+        # Draw detections on frame if output is requested
+        annotated_frame = self._draw_detections(frame, detections) if annotate else None
+        return result, annotated_frame
+    
+    def _progress_logger(
+        self, 
+        total_frames: int, 
+        on_progress: Optional[Callable[[int, int], None]] = None
+    ) -> Callable[[int], None]:
+        """Build a callback that logs each time another 100 frames are done"""
+        previous_count = 0
+        
+        def log_progress(frame_count: int) -> None:
+            nonlocal previous_count
+            if frame_count // 100 > previous_count // 100:
+                logger.info(f"Processed {frame_count}/{total_frames} frames")
+                if on_progress:
+                    on_progress(frame_count, total_frames)
+            previous_count = frame_count
+        
+        return log_progress
+    
     def _draw_detections(
         self, 
         image: np.ndarray, 
-        players: List[PlayerPosition]
+        detections: np.ndarray
     ) -> np.ndarray:
         """Draw player detections on image"""
         annotated = image.copy()
         
-        for player in players:
-            x, y = int(player.x), int(player.y)
-            w, h = int(player.width), int(player.height)
+        for detection in detections:
+            x, y = int(detection["x"]), int(detection["y"])
+            w, h = int(detection["width"]), int(detection["height"])
             
             # Draw bounding box
-            color = (0, 255, 0) if player.team_id == 1 else (255, 0, 0)
+            color = (0, 255, 0) if detection["team_id"] == 1 else (255, 0, 0)
             cv2.rectangle(annotated, (x - w//2, y - h//2), (x + w//2, y + h//2), color, 2)
             
             # Draw confidence score
             cv2.putText(
                 annotated, 
-                f"{player.confidence:.2f}", 
+                f"{detection['confidence']:.2f}", 
                 (x - w//2, y - h//2 - 10), 
                 cv2.FONT_HERSHEY_SIMPLEX, 
                 0.5, 
@@ -245,4 +662,4 @@ class PlayerDetectionService:
                 1
             )
         
-        return annotated 
\ No newline at end of file
+        return annotated
\ No newline at end of file
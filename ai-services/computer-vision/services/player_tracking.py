@@ -0,0 +1,195 @@
+import numpy as np
+
+from services.team_colors import UNASSIGNED
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:  # scipy is optional, greedy matching is used without it
+    linear_sum_assignment = None
+
+
+# Cost given to pairs that must not be matched
+_INFEASIBLE = 1e6
+
+
+class PlayerTracker:
+    """Associate detections across frames and assign persistent player IDs
+
+    Each track keeps its last box, a constant-velocity motion estimate and
+    its team. On every inferred frame the tracks are moved forward by their
+    velocity and matched to the new detections in one assignment over a
+    cost matrix built with array operations:
+
+    * ``1 - IoU`` plus the centroid distance in track heights, for pairs
+      that overlap by at least ``min_iou`` or lie within ``max_distance``
+      track heights of each other
+    * re-identification of tracks that have been lost for a few frames:
+      a detection of the same team within ``reid_speed`` pixels per missed
+      frame of the predicted position can take the track back
+    * pairs whose team IDs are both known and differ are never matched
+
+    A track gets a player ID once it has been matched ``min_hits`` times
+    and is dropped after ``max_age`` frames without a match. Unmatched
+    detections start new tracks. Pairs are chosen with the Hungarian
+    algorithm when scipy is installed and greedily by cost otherwise.
+    """
+
+    def __init__(
+        self,
+        max_age: int = 30,
+        min_hits: int = 3,
+        min_iou: float = 0.1,
+        max_distance: float = 1.0,
+        reid_speed: float = 15.0,
+        velocity_smoothing: float = 0.6,
+        first_id: int = 1
+    ):
+        self.max_age = max_age
+        self.min_hits = min_hits
+        self.min_iou = min_iou
+        self.max_distance = max_distance
+        self.reid_speed = reid_speed
+        self.velocity_smoothing = velocity_smoothing
+        self.next_id = first_id
+
+        self._boxes = np.empty((0, 4), dtype=np.float32)      # x, y, width, height
+        self._velocity = np.empty((0, 2), dtype=np.float32)   # pixels per frame
+        self._team_ids = np.empty(0, dtype=np.int32)
+        self._player_ids = np.empty(0, dtype=np.int32)
+        self._hits = np.empty(0, dtype=np.int32)
+        self._last_frame = np.empty(0, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self._boxes)
+
+    def update(self, detections: np.ndarray, frame_index: int) -> np.ndarray:
+        """Match a frame's detections (``DETECTION_DTYPE``) to tracks and return their player IDs
+
+        Detections on tracks that are not confirmed yet get UNASSIGNED.
+        """
+        boxes = np.stack(
+            [detections["x"], detections["y"], detections["width"], detections["height"]], axis=1
+        ).astype(np.float32) if len(detections) else np.empty((0, 4), dtype=np.float32)
+        team_ids = detections["team_id"].astype(np.int32)
+
+        track_of = np.full(len(detections), -1, dtype=np.int64)
+        if len(self) and len(detections):
+            rows, cols = self._match(boxes, team_ids, frame_index)
+            self._update_tracks(rows, boxes[cols], team_ids[cols], frame_index)
+            track_of[cols] = rows
+
+        # Drop tracks that have not been seen for too long
+        alive = frame_index - self._last_frame <= self.max_age
+        if not alive.all():
+            remap = np.cumsum(alive) - 1
+            track_of = np.where(track_of >= 0, remap[np.maximum(track_of, 0)], -1)
+            self._keep(alive)
+
+        unmatched = np.flatnonzero(track_of < 0)
+        if len(unmatched):
+            track_of[unmatched] = len(self) + np.arange(len(unmatched))
+            self._start_tracks(boxes[unmatched], team_ids[unmatched], frame_index)
+
+        self._confirm()
+        return self._player_ids[track_of] if len(detections) else np.empty(0, dtype=np.int32)
+
+    def _match(self, boxes: np.ndarray, team_ids: np.ndarray, frame_index: int):
+        """Build the track x detection cost matrix and solve the assignment"""
+        gap = (frame_index - self._last_frame).astype(np.float32)
+        predicted = self._boxes.copy()
+        predicted[:, :2] += self._velocity * gap[:, np.newaxis]
+
+        iou = self._iou(predicted, boxes)
+        offset = predicted[:, np.newaxis, :2] - boxes[np.newaxis, :, :2]
+        pixels = np.sqrt((offset ** 2).sum(axis=2))
+        distance = pixels / np.maximum(predicted[:, 3:4], 1.0)
+
+        known = (self._team_ids[:, np.newaxis] != UNASSIGNED) & (team_ids[np.newaxis, :] != UNASSIGNED)
+        same_team = known & (self._team_ids[:, np.newaxis] == team_ids[np.newaxis, :])
+        team_conflict = known & ~same_team
+
+        close = (iou >= self.min_iou) | (distance <= self.max_distance)
+        lost = (gap > 1)[:, np.newaxis]
+        reid = lost & same_team & (pixels <= self.reid_speed * gap[:, np.newaxis])
+
+        cost = 1.0 - iou + distance
+        feasible = (close | reid) & ~team_conflict
+        cost = np.where(feasible, cost, _INFEASIBLE)
+
+        rows, cols = self._assign(cost)
+        keep = feasible[rows, cols]
+        return rows[keep], cols[keep]
+
+    def _assign(self, cost: np.ndarray):
+        """Minimum-cost one-to-one assignment of tracks to detections"""
+        if linear_sum_assignment is not None:
+            return linear_sum_assignment(cost)
+
+        cost = cost.copy()
+        rows, cols = [], []
+        for _ in range(min(cost.shape)):
+            row, col = np.unravel_index(np.argmin(cost), cost.shape)
+            if cost[row, col] >= _INFEASIBLE:
+                break
+            rows.append(row)
+            cols.append(col)
+            cost[row, :] = _INFEASIBLE
+            cost[:, col] = _INFEASIBLE
+        return np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64)
+
+    def _iou(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """Pairwise IoU of two sets of centre-format boxes"""
+        a_min = a[:, np.newaxis, :2] - a[:, np.newaxis, 2:] / 2
+        a_max = a[:, np.newaxis, :2] + a[:, np.newaxis, 2:] / 2
+        b_min = b[np.newaxis, :, :2] - b[np.newaxis, :, 2:] / 2
+        b_max = b[np.newaxis, :, :2] + b[np.newaxis, :, 2:] / 2
+
+        overlap = np.clip(np.minimum(a_max, b_max) - np.maximum(a_min, b_min), 0, None)
+        intersection = overlap[..., 0] * overlap[..., 1]
+        union = (a[:, 2] * a[:, 3])[:, np.newaxis] + (b[:, 2] * b[:, 3])[np.newaxis, :] - intersection
+        return intersection / np.maximum(union, 1e-6)
+
+    def _update_tracks(
+        self,
+        rows: np.ndarray,
+        boxes: np.ndarray,
+        team_ids: np.ndarray,
+        frame_index: int
+    ) -> None:
+        """Move matched tracks to their detections and refresh the motion estimate"""
+        gap = (frame_index - self._last_frame[rows]).astype(np.float32)[:, np.newaxis]
+        step = (boxes[:, :2] - self._boxes[rows, :2]) / np.maximum(gap, 1.0)
+        self._velocity[rows] = (
+            self.velocity_smoothing * self._velocity[rows] + (1 - self.velocity_smoothing) * step
+        )
+        self._boxes[rows] = boxes
+        # Keep the known team when a detection's colour was inconclusive
+        self._team_ids[rows] = np.where(team_ids != UNASSIGNED, team_ids, self._team_ids[rows])
+        self._hits[rows] += 1
+        self._last_frame[rows] = frame_index
+
+    def _start_tracks(self, boxes: np.ndarray, team_ids: np.ndarray, frame_index: int) -> None:
+        """Start a tentative track for each unmatched detection"""
+        count = len(boxes)
+        self._boxes = np.concatenate([self._boxes, boxes])
+        self._velocity = np.concatenate([self._velocity, np.zeros((count, 2), dtype=np.float32)])
+        self._team_ids = np.concatenate([self._team_ids, team_ids])
+        self._player_ids = np.concatenate([self._player_ids, np.full(count, UNASSIGNED, dtype=np.int32)])
+        self._hits = np.concatenate([self._hits, np.ones(count, dtype=np.int32)])
+        self._last_frame = np.concatenate([self._last_frame, np.full(count, frame_index, dtype=np.int64)])
+
+    def _keep(self, mask: np.ndarray) -> None:
+        """Keep only the tracks selected by ``mask``"""
+        self._boxes = self._boxes[mask]
+        self._velocity = self._velocity[mask]
+        self._team_ids = self._team_ids[mask]
+        self._player_ids = self._player_ids[mask]
+        self._hits = self._hits[mask]
+        self._last_frame = self._last_frame[mask]
+
+    def _confirm(self) -> None:
+        """Give a player ID to tracks that have been matched often enough"""
+        new = np.flatnonzero((self._player_ids == UNASSIGNED) & (self._hits >= self.min_hits))
+        if len(new):
+            self._player_ids[new] = self.next_id + np.arange(len(new), dtype=np.int32)
+            self.next_id += len(new)
@@ -0,0 +1,205 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+from loguru import logger
+
+
+class FrameResultCache:
+    """Content-addressed cache of per-frame results
+
+    Results are stored as bytes (JSON) under a key built from a digest of
+    the decoded frame plus everything else the result depends on (model
+    version, confidence threshold, ...), so a frame uploaded again, even
+    re-encoded, is answered without running the model.
+
+    The memory tier is an LRU bounded by ``max_bytes`` of stored values.
+    With ``disk_dir`` every entry is also written to disk, up to
+    ``max_disk_bytes`` with the oldest removed first, so results outlive
+    memory evictions and restarts; a disk hit is promoted back to memory.
+
+    Hashing a decoded 1080p frame costs a few milliseconds, so the digest
+    of each upload is also remembered with the frame digest it decoded to
+    (``remember_upload``). A byte-identical re-upload then finds its result
+    without decoding or hashing the frame.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        disk_dir: Optional[str] = None,
+        max_disk_bytes: int = 1024 * 1024 * 1024,
+        max_uploads: int = 10000
+    ):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.max_uploads = max_uploads
+
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._uploads: "OrderedDict[str, str]" = OrderedDict()
+        self._disk: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self._counts = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+        if disk_dir:
+            self._load_disk_index()
+
+    @property
+    def enabled(self) -> bool:
+        """Check if results are cached at all"""
+        return self.max_bytes > 0 or bool(self.disk_dir)
+
+    @staticmethod
+    def digest(data: Union[bytes, np.ndarray]) -> str:
+        """Digest of upload bytes or of a decoded frame's pixels and shape"""
+        hasher = hashlib.sha256()
+        if isinstance(data, np.ndarray):
+            hasher.update(f"{data.shape}{data.dtype}".encode())
+            data = np.ascontiguousarray(data).data
+        hasher.update(data)
+        return hasher.hexdigest()
+
+    @staticmethod
+    def key(kind: str, frame_digest: str, *params: Any) -> str:
+        """Cache key of one kind of result for a frame and the parameters it depends on"""
+        return hashlib.sha256("|".join([kind, frame_digest, *map(str, params)]).encode()).hexdigest()
+
+    def upload_frame(self, upload_digest: str) -> Optional[str]:
+        """Frame digest an upload decoded to earlier, if remembered"""
+        with self._lock:
+            frame_digest = self._uploads.get(upload_digest)
+            if frame_digest is not None:
+                self._uploads.move_to_end(upload_digest)
+            return frame_digest
+
+    def remember_upload(self, upload_digest: str, frame_digest: str) -> None:
+        """Remember which frame an upload decoded to"""
+        with self._lock:
+            self._uploads[upload_digest] = frame_digest
+            self._uploads.move_to_end(upload_digest)
+            if len(self._uploads) > self.max_uploads:
+                self._uploads.popitem(last=False)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Cached result of a key, from memory or disk"""
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self._counts["memory_hits"] += 1
+                return value
+            on_disk = key in self._disk
+
+        value = self._read_disk(key) if on_disk else None
+        with self._lock:
+            if value is None:
+                self._counts["misses"] += 1
+                return None
+            self._counts["disk_hits"] += 1
+            if key in self._disk:
+                self._disk.move_to_end(key)
+            self._store_memory(key, value)
+            return value
+
+    def put(self, key: str, value: bytes) -> None:
+        """Cache a result in memory and, with a disk tier, on disk"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._store_memory(key, value)
+        if self.disk_dir:
+            self._write_disk(key, value)
+
+    def _store_memory(self, key: str, value: bytes) -> None:
+        """Insert into the memory LRU, evicting least recently used entries over budget"""
+        if len(value) > self.max_bytes:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+        self._memory[key] = value
+        self._memory_bytes += len(value)
+        while self._memory_bytes > self.max_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self._counts["evictions"] += 1
+
+    def _disk_path(self, key: str) -> str:
+        """File of a key in the disk tier, fanned out by its first two characters"""
+        return os.path.join(self.disk_dir, key[:2], key)
+
+    def _load_disk_index(self) -> None:
+        """Index the disk tier left by an earlier run, oldest first"""
+        entries = []
+        for root, _, files in os.walk(self.disk_dir):
+            for name in files:
+                if name.endswith(".tmp"):
+                    continue
+                stat = os.stat(os.path.join(root, name))
+                entries.append((stat.st_mtime, name, stat.st_size))
+        for _, name, size in sorted(entries):
+            self._disk[name] = size
+            self._disk_bytes += size
+        if entries:
+            logger.info(f"Result cache: {len(entries)} entries on disk ({self._disk_bytes} bytes)")
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self._disk_path(key), "rb") as f:
+                return f.read()
+        except OSError:
+            with self._lock:
+                size = self._disk.pop(key, None)
+                if size is not None:
+                    self._disk_bytes -= size
+            return None
+
+    def _write_disk(self, key: str, value: bytes) -> None:
+        """Write an entry atomically and evict the oldest ones over the disk budget"""
+        if len(value) > self.max_disk_bytes:
+            return
+        path = self._disk_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temporary = f"{path}.{threading.get_ident()}.tmp"
+            with open(temporary, "wb") as f:
+                f.write(value)
+            os.replace(temporary, path)
+        except OSError as e:
+            logger.warning(f"Result cache: failed to write {key}: {e}")
+            return
+
+        evicted = []
+        with self._lock:
+            self._disk_bytes += len(value) - self._disk.pop(key, 0)
+            self._disk[key] = len(value)
+            while self._disk_bytes > self.max_disk_bytes:
+                old_key, size = self._disk.popitem(last=False)
+                self._disk_bytes -= size
+                evicted.append(old_key)
+        for old_key in evicted:
+            try:
+                os.remove(self._disk_path(old_key))
+            except OSError:
+                pass
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Hit and miss counts and the size of both tiers"""
+        with self._lock:
+            hits = self._counts["memory_hits"] + self._counts["disk_hits"]
+            lookups = hits + self._counts["misses"]
+            return {
+                **self._counts,
+                "hits": hits,
+                "hit_rate": round(hits / lookups, 4) if lookups else None,
+                "entries": len(self._memory),
+                "bytes": self._memory_bytes,
+                "disk_entries": len(self._disk),
+                "disk_bytes": self._disk_bytes,
+            }
@@ -0,0 +1,136 @@
+import json
+import os
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from pydantic import BaseModel
+
+
+# One record per NDJSON line: the frame it belongs to and where the line starts
+INDEX_DTYPE = np.dtype([("frame_index", np.int64), ("offset", np.int64)])
+
+
+def index_path(path: str) -> str:
+    """Path of the frame index kept next to an NDJSON results file"""
+    return path + ".idx"
+
+
+class ResultWriter:
+    """Append per-frame results to an NDJSON file as they are produced
+
+    Each result is one JSON line. A binary frame index (``INDEX_DTYPE``)
+    is written alongside so readers can seek straight to a frame range
+    without scanning the file. Nothing is kept in memory, so writing a
+    full match costs the same as writing a single frame.
+
+    ``resume_count`` and ``resume_offset`` reopen an existing file and
+    drop everything after that many lines / bytes, for resuming from a
+    checkpoint.
+    """
+
+    def __init__(self, path: str, resume_count: int = 0, resume_offset: int = 0):
+        self.path = path
+        self.count = resume_count
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._results = self._open(path, resume_offset)
+        self._index = self._open(index_path(path), resume_count * INDEX_DTYPE.itemsize)
+
+    def _open(self, path: str, size: int):
+        """Open a file for writing, truncated to ``size`` bytes"""
+        f = open(path, "r+b" if size and os.path.exists(path) else "wb")
+        f.truncate(size)
+        f.seek(size)
+        return f
+
+    @property
+    def offset(self) -> int:
+        """Byte offset of the end of the results file"""
+        return self._results.tell()
+
+    def append(self, frame_index: int, result: BaseModel) -> None:
+        """Write the result of one frame"""
+        record = np.array([(frame_index, self._results.tell())], dtype=INDEX_DTYPE)
+        self._results.write(result.model_dump_json().encode() + b"\n")
+        self._index.write(record.tobytes())
+        self.count += 1
+
+    def flush(self, sync: bool = False) -> None:
+        """Make written results visible to readers, optionally forcing them to disk"""
+        self._results.flush()
+        self._index.flush()
+        if sync:
+            os.fsync(self._results.fileno())
+            os.fsync(self._index.fileno())
+
+    def close(self) -> None:
+        """Flush and close both files"""
+        self.flush()
+        self._results.close()
+        self._index.close()
+
+    def __enter__(self) -> "ResultWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def read_index(path: str) -> np.ndarray:
+    """Memory-map the frame index of a results file
+
+    A record still being written by a running job is ignored.
+    """
+    idx = index_path(path)
+    records = os.path.getsize(idx) // INDEX_DTYPE.itemsize if os.path.exists(idx) else 0
+    if records == 0:
+        return np.empty(0, dtype=INDEX_DTYPE)
+    return np.memmap(idx, dtype=INDEX_DTYPE, mode="r", shape=(records,))
+
+
+def iter_result_lines(
+    path: str,
+    start_frame: int = 0,
+    end_frame: Optional[int] = None,
+    offset: int = 0,
+    limit: Optional[int] = None
+) -> Iterator[Tuple[int, bytes]]:
+    """Iterate over ``(frame_index, json_line)`` for frames in ``[start_frame, end_frame)``
+
+    ``offset`` skips that many results of the range and ``limit`` caps how
+    many are returned. Iteration stops at a line that has not been fully
+    written yet.
+    """
+    if not os.path.exists(path):
+        return
+
+    index = read_index(path)
+    frames = index["frame_index"]
+    first = int(np.searchsorted(frames, start_frame, side="left")) + offset
+    last = len(index) if end_frame is None else int(np.searchsorted(frames, end_frame, side="left"))
+    if limit is not None:
+        last = min(last, first + limit)
+    if first >= last:
+        return
+
+    with open(path, "rb") as f:
+        f.seek(int(index["offset"][first]))
+        for position in range(first, last):
+            line = f.readline()
+            if not line.endswith(b"\n"):
+                break
+            yield int(frames[position]), line
+
+
+def read_results(
+    path: str,
+    start_frame: int = 0,
+    end_frame: Optional[int] = None,
+    offset: int = 0,
+    limit: int = 1000
+) -> List[Dict[str, Any]]:
+    """Read a page of results, each tagged with its ``frame_index``"""
+    return [
+        {"frame_index": frame_index, **json.loads(line)}
+        for frame_index, line in iter_result_lines(path, start_frame, end_frame, offset, limit)
+    ]
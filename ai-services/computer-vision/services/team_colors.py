@@ -0,0 +1,149 @@
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+
+import cv2
+import numpy as np
+from loguru import logger
+
+
+UNASSIGNED = -1
+
+
+class TeamColorProfile:
+    """Jersey colour centroids learned from the first detections of a match
+
+    Until ``warmup_detections`` jersey features have been observed, callers
+    keep using their fallback team assignment. The features are then
+    clustered with k-means into ``n_clusters`` groups (home, away and, with
+    three clusters, the referee). The two largest clusters become the teams
+    and any smaller one is treated as the referee (UNASSIGNED). Clusters are
+    mapped to team IDs by majority vote of the fallback labels seen during
+    warm-up where that is unambiguous, otherwise by size.
+
+    After fitting, ``classify`` is a nearest-centroid lookup. Features
+    further than ``max_distance`` from every centroid are UNASSIGNED.
+
+    A profile is shared by the video jobs and requests of one match, so
+    ``observe`` and the fit hold a lock; ``classify`` only reads the
+    fitted arrays.
+    """
+
+    def __init__(
+        self,
+        warmup_detections: int = 300,
+        n_clusters: int = 3,
+        max_distance: float = 60.0
+    ):
+        if n_clusters not in (2, 3):
+            raise ValueError("n_clusters must be 2 (teams) or 3 (teams and referee)")
+
+        self.warmup_detections = warmup_detections
+        self.n_clusters = n_clusters
+        self.max_distance = max_distance
+
+        self.centroids: Optional[np.ndarray] = None
+        self.centroid_team_ids: Optional[np.ndarray] = None
+        self._features: List[np.ndarray] = []
+        self._fallback_team_ids: List[np.ndarray] = []
+        self._observed = 0
+        self._lock = threading.Lock()
+
+    @property
+    def is_fitted(self) -> bool:
+        """Check if the centroids have been learned"""
+        return self.centroids is not None
+
+    def observe(self, features: np.ndarray, fallback_team_ids: np.ndarray) -> None:
+        """Collect warm-up features and fit once enough have been seen"""
+        if self.is_fitted or len(features) == 0:
+            return
+
+        with self._lock:
+            # Another thread may have fitted while this one waited
+            if self.is_fitted:
+                return
+
+            self._features.append(features.astype(np.float32))
+            self._fallback_team_ids.append(fallback_team_ids)
+            self._observed += len(features)
+
+            if self._observed >= max(self.warmup_detections, self.n_clusters):
+                self._fit()
+
+    def classify(self, features: np.ndarray) -> np.ndarray:
+        """Nearest-centroid team lookup for a batch of jersey features"""
+        if not self.is_fitted:
+            raise RuntimeError("Team colour profile has not been fitted yet")
+
+        centroids, centroid_team_ids = self.centroids, self.centroid_team_ids
+        distances = np.linalg.norm(features[:, np.newaxis, :] - centroids[np.newaxis], axis=2)
+        nearest = distances.argmin(axis=1)
+
+        team_ids = centroid_team_ids[nearest]
+        team_ids[distances[np.arange(len(features)), nearest] > self.max_distance] = UNASSIGNED
+        return team_ids
+
+    def _fit(self) -> None:
+        """Cluster the warm-up features and map clusters to team IDs; called with the lock held"""
+        features = np.concatenate(self._features)
+        fallback = np.concatenate(self._fallback_team_ids)
+
+        criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 50, 0.5)
+        _, labels, centroids = cv2.kmeans(
+            features, self.n_clusters, None, criteria, 3, cv2.KMEANS_PP_CENTERS
+        )
+        labels = labels.ravel()
+
+        sizes = np.bincount(labels, minlength=self.n_clusters)
+        teams = np.argsort(-sizes)[:2]
+
+        # Keep the fallback's team numbering when it clearly agrees
+        votes = []
+        for cluster in teams:
+            cluster_labels = fallback[(labels == cluster) & (fallback != UNASSIGNED)]
+            votes.append(np.bincount(cluster_labels).argmax() if len(cluster_labels) else UNASSIGNED)
+        if sorted(votes) != [1, 2]:
+            votes = [1, 2]
+
+        centroid_team_ids = np.full(self.n_clusters, UNASSIGNED, dtype=np.int32)
+        centroid_team_ids[teams] = votes
+
+        # Set last: is_fitted checks the centroids
+        self.centroid_team_ids = centroid_team_ids
+        self.centroids = centroids
+        self._features = []
+        self._fallback_team_ids = []
+
+        logger.info(
+            f"Team colour profile fitted from {len(features)} detections: "
+            f"cluster sizes {sizes.tolist()}, team IDs {centroid_team_ids.tolist()}"
+        )
+
+
+class TeamColorProfileCache:
+    """Team colour profiles keyed by match or video, least recently used evicted first"""
+
+    def __init__(self, max_profiles: int = 64, **profile_options):
+        self.max_profiles = max_profiles
+        self.profile_options = profile_options
+        self._profiles: "OrderedDict[str, TeamColorProfile]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> TeamColorProfile:
+        """Get the profile for a match or video, creating it if needed"""
+        with self._lock:
+            profile = self._profiles.get(key)
+            if profile is None:
+                profile = TeamColorProfile(**self.profile_options)
+                self._profiles[key] = profile
+                if len(self._profiles) > self.max_profiles:
+                    self._profiles.popitem(last=False)
+            else:
+                self._profiles.move_to_end(key)
+            return profile
+
+    def discard(self, key: str) -> None:
+        """Forget the profile for a match or video"""
+        with self._lock:
+            self._profiles.pop(key, None)
@@ -0,0 +1,178 @@
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from services.field_mapping import GRASS_HSV_RANGE
+from services.inference_backends import DetectorBoxes, DetectorResult
+
+
+TILING_MODES = ("off", "full", "adaptive")
+
+# Rows with at least this share of grass pixels belong to the pitch
+MIN_GRASS_ROW_SHARE = 0.3
+
+
+@dataclass
+class TilingConfig:
+    """How frames are split into tiles for detecting small players
+
+    ``full`` tiles the whole frame; ``adaptive`` only tiles the far half
+    of the pitch (the upper half of the grass in a broadcast view), where
+    players are smallest. In both modes the whole frame is run too, so
+    near players larger than a tile are still found. Tiles are
+    ``tile_size`` pixels square, run at that resolution, and overlap by
+    ``overlap`` of their size. ``merge_threshold`` is the overlap, as
+    intersection over the smaller box, above which boxes of the same class
+    are merged.
+    """
+
+    mode: str = "off"
+    tile_size: int = 640
+    overlap: float = 0.2
+    merge_threshold: float = 0.6
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def validate(self) -> None:
+        """Raise ValueError for an unknown mode or unusable tile settings"""
+        if self.mode not in TILING_MODES:
+            raise ValueError(f"Unknown tiling mode: {self.mode} (expected one of {', '.join(TILING_MODES)})")
+        if self.tile_size % 32:
+            raise ValueError("Tile size must be a multiple of 32")
+        if not 0 <= self.overlap < 1:
+            raise ValueError("Tile overlap must be in [0, 1)")
+
+
+def tile_grid(
+    height: int,
+    width: int,
+    tile_size: int,
+    overlap: float,
+    rows: Optional[Tuple[int, int]] = None
+) -> np.ndarray:
+    """``(N, 4)`` xyxy tiles covering the frame, or only the given row range
+
+    Tiles are spread evenly so the last one ends at the border instead of
+    overhanging it; an axis shorter than a tile gets a single tile.
+    """
+    top, bottom = rows or (0, height)
+
+    def starts(start: int, length: int) -> np.ndarray:
+        if length <= tile_size:
+            return np.array([start])
+        step = tile_size * (1 - overlap)
+        count = int(np.ceil((length - tile_size) / step)) + 1
+        return np.round(np.linspace(start, start + length - tile_size, count)).astype(np.int64)
+
+    ys, xs = np.meshgrid(starts(top, bottom - top), starts(0, width), indexing="ij")
+    x1, y1 = xs.ravel(), ys.ravel()
+    return np.column_stack([x1, y1, np.minimum(x1 + tile_size, width), np.minimum(y1 + tile_size, bottom)])
+
+
+def box_overlap(a: np.ndarray, b: np.ndarray, metric: str = "iou") -> np.ndarray:
+    """Pairwise overlap of two sets of xyxy boxes, as IoU or intersection over the smaller box"""
+    width = np.clip(np.minimum(a[:, None, 2], b[None, :, 2]) - np.maximum(a[:, None, 0], b[None, :, 0]), 0, None)
+    height = np.clip(np.minimum(a[:, None, 3], b[None, :, 3]) - np.maximum(a[:, None, 1], b[None, :, 1]), 0, None)
+    intersection = width * height
+    area_a = ((a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1]))[:, None]
+    area_b = ((b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1]))[None, :]
+    if metric == "ios":
+        denominator = np.minimum(area_a, area_b)
+    else:
+        denominator = area_a + area_b - intersection
+    return intersection / np.maximum(denominator, 1e-9)
+
+
+def nms(
+    boxes: np.ndarray,
+    scores: np.ndarray,
+    threshold: float,
+    classes: Optional[np.ndarray] = None,
+    metric: str = "iou"
+) -> np.ndarray:
+    """Indices of the boxes kept by greedy non-maximum suppression, best first
+
+    The overlaps of all pairs are computed at once; the greedy pass then
+    only touches one row of the matrix per kept box.
+    """
+    if len(boxes) == 0:
+        return np.empty(0, dtype=np.int64)
+
+    order = np.argsort(-scores, kind="stable")
+    overlap = box_overlap(boxes[order], boxes[order], metric)
+    if classes is not None:
+        overlap *= classes[order][:, None] == classes[order][None, :]
+    # Only a higher-scored box can suppress a lower-scored one
+    suppresses = np.triu(overlap > threshold, k=1)
+
+    suppressed = np.zeros(len(order), dtype=bool)
+    for i in range(len(order)):
+        if not suppressed[i]:
+            suppressed |= suppresses[i]
+    return order[~suppressed]
+
+
+class TiledInference:
+    """Split frames into tiles for one batched model call and merge the detections"""
+
+    def __init__(self, config: TilingConfig):
+        config.validate()
+        self.config = config
+
+    def tiles(self, image: np.ndarray) -> np.ndarray:
+        """xyxy regions to run for a frame: the whole frame first, then the tiles"""
+        height, width = image.shape[:2]
+        rows = self.far_rows(image) if self.config.mode == "adaptive" else None
+        grid = tile_grid(height, width, self.config.tile_size, self.config.overlap, rows)
+        return np.vstack([[0, 0, width, height], grid])
+
+    def far_rows(self, image: np.ndarray) -> Tuple[int, int]:
+        """Row range of the far half of the pitch, from a downscaled grass mask
+
+        Falls back to the upper half of the frame when no grass is found.
+        """
+        height = image.shape[0]
+        scale = min(1.0, 160 / image.shape[1])
+        small = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        grass = cv2.inRange(cv2.cvtColor(small, cv2.COLOR_BGR2HSV), *GRASS_HSV_RANGE)
+
+        pitch_rows = np.flatnonzero((grass > 0).mean(axis=1) >= MIN_GRASS_ROW_SHARE)
+        if len(pitch_rows) == 0:
+            return 0, height // 2
+        top = int(pitch_rows[0] / scale)
+        bottom = int((pitch_rows[-1] + 1) / scale)
+        # Players standing on the far touchline reach above the grass
+        top = max(0, top - self.config.tile_size // 4)
+        return top, min(height, max(top + 1, (top + bottom) // 2))
+
+    def crops(self, image: np.ndarray) -> Tuple[List[np.ndarray], np.ndarray]:
+        """Views of the regions of a frame, with the regions"""
+        regions = self.tiles(image)
+        return [image[y1:y2, x1:x2] for x1, y1, x2, y2 in regions], regions
+
+    def merge(self, results: list, regions: np.ndarray) -> DetectorResult:
+        """Move the detections of each region into frame pixels and suppress duplicates"""
+        xyxy, conf, cls = [], [], []
+        for result, (x1, y1, _, _) in zip(results, regions):
+            boxes = result.boxes
+            if boxes is None or len(boxes) == 0:
+                continue
+            xyxy.append(boxes.xyxy.cpu().numpy() + np.array([x1, y1, x1, y1], dtype=np.float32))
+            conf.append(boxes.conf.cpu().numpy())
+            cls.append(boxes.cls.cpu().numpy())
+
+        if not xyxy:
+            empty = np.empty(0, dtype=np.float32)
+            return DetectorResult(DetectorBoxes(np.empty((0, 4), dtype=np.float32), empty, empty))
+
+        xyxy, conf, cls = np.concatenate(xyxy), np.concatenate(conf), np.concatenate(cls)
+        # Intersection over the smaller box also merges a player cut at a
+        # tile border with the whole box from the neighbouring tile
+        keep = nms(xyxy, conf, self.config.merge_threshold, cls, metric="ios")
+        return DetectorResult(DetectorBoxes(
+            xyxy[keep].astype(np.float32), conf[keep].astype(np.float32), cls[keep].astype(np.float32)
+        ))
@@ -0,0 +1,214 @@
+import json
+import os
+from typing import Dict, Optional
+
+import numpy as np
+
+
+# One fixed-width file per column, one row per detection
+TRACK_COLUMNS = {
+    "frame": np.dtype(np.int32),
+    "timestamp": np.dtype(np.float64),
+    "x": np.dtype(np.float32),
+    "y": np.dtype(np.float32),
+    "width": np.dtype(np.float32),
+    "height": np.dtype(np.float32),
+    "confidence": np.dtype(np.float32),
+    "team_id": np.dtype(np.int32),
+    "player_id": np.dtype(np.int32),
+    "pitch_x": np.dtype(np.float32),
+    "pitch_y": np.dtype(np.float32),
+}
+
+META_FILE = "meta.json"
+PLAYER_INDEX_FILE = "player_index.bin"
+
+
+def column_path(path: str, name: str) -> str:
+    """Path of one column file of a tracking store"""
+    return os.path.join(path, f"{name}.bin")
+
+
+class TrackingStoreWriter:
+    """Append-only columnar store of per-frame detections
+
+    Each column of ``TRACK_COLUMNS`` is a raw little-endian array in its own
+    file under ``path``, so a reader can memory-map just the columns it
+    needs. Rows are appended in frame order, which keeps ``frame`` and
+    ``timestamp`` sorted for range lookups.
+
+    ``close`` finalises the store: it writes ``meta.json`` with the row
+    count and a per-player row index used by ``TrackingStore.select``.
+    ``resume_rows`` reopens an existing store and drops everything after
+    that many rows, for resuming from a checkpoint.
+    """
+
+    def __init__(self, path: str, resume_rows: int = 0):
+        self.path = path
+        self.rows = resume_rows
+        self._closed = False
+
+        os.makedirs(path, exist_ok=True)
+        # The store is being written again, so any earlier finalisation is stale
+        for name in (META_FILE, PLAYER_INDEX_FILE):
+            if os.path.exists(os.path.join(path, name)):
+                os.remove(os.path.join(path, name))
+
+        self._files = {}
+        for name, dtype in TRACK_COLUMNS.items():
+            size = resume_rows * dtype.itemsize
+            column = column_path(path, name)
+            f = open(column, "r+b" if size and os.path.exists(column) else "wb")
+            f.truncate(size)
+            f.seek(size)
+            self._files[name] = f
+
+    def append(self, frame_index: int, timestamp: float, detections: np.ndarray) -> None:
+        """Append the detections of one frame (a ``DETECTION_DTYPE`` array)"""
+        count = len(detections)
+        if count == 0:
+            return
+
+        self._files["frame"].write(np.full(count, frame_index, dtype=TRACK_COLUMNS["frame"]).tobytes())
+        self._files["timestamp"].write(np.full(count, timestamp, dtype=TRACK_COLUMNS["timestamp"]).tobytes())
+        for name in list(TRACK_COLUMNS)[2:]:
+            self._files[name].write(np.ascontiguousarray(detections[name], dtype=TRACK_COLUMNS[name]).tobytes())
+        self.rows += count
+
+    def flush(self, sync: bool = False) -> None:
+        """Make appended rows visible to readers, optionally forcing them to disk"""
+        for f in self._files.values():
+            f.flush()
+            if sync:
+                os.fsync(f.fileno())
+
+    def close(self, finalize: bool = True) -> None:
+        """Close the column files and, with ``finalize``, write the metadata and player index"""
+        if self._closed:
+            return
+        self._closed = True
+
+        for f in self._files.values():
+            f.close()
+        if finalize:
+            self._finalize()
+
+    def _finalize(self) -> None:
+        """Write the per-player row index and the metadata"""
+        players: Dict[str, list] = {}
+        if self.rows:
+            player_ids = np.memmap(
+                column_path(self.path, "player_id"), dtype=TRACK_COLUMNS["player_id"], mode="r", shape=(self.rows,)
+            )
+            # Stable sort keeps each player's rows in frame order
+            order = np.argsort(player_ids, kind="stable").astype(np.int64)
+            sorted_ids = player_ids[order]
+            ids, starts, counts = np.unique(sorted_ids, return_index=True, return_counts=True)
+            players = {
+                str(player_id): [int(start), int(start + count)]
+                for player_id, start, count in zip(ids, starts, counts)
+            }
+            order.tofile(os.path.join(self.path, PLAYER_INDEX_FILE))
+
+        meta = {
+            "rows": self.rows,
+            "columns": {name: dtype.str for name, dtype in TRACK_COLUMNS.items()},
+            "players": players,
+        }
+        with open(os.path.join(self.path, META_FILE), "w") as f:
+            json.dump(meta, f)
+
+    def __enter__(self) -> "TrackingStoreWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class TrackingStore:
+    """Memory-mapped reader for a store written by ``TrackingStoreWriter``
+
+    Columns are mapped on first access and only the selected rows are
+    copied out, so slicing a full match by time range or player does not
+    load or parse the whole store. A store that is still being written can
+    be read too; it is then limited to the rows written so far and player
+    lookups scan the ``player_id`` column instead of using the index.
+    """
+
+    def __init__(self, path: str):
+        if not os.path.isdir(path):
+            raise FileNotFoundError(f"Tracking store not found: {path}")
+
+        self.path = path
+        self._columns: Dict[str, np.ndarray] = {}
+        self._players: Optional[Dict[str, list]] = None
+
+        meta_path = os.path.join(path, META_FILE)
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+            self.rows = meta["rows"]
+            self._players = meta["players"]
+        else:
+            self.rows = min(
+                os.path.getsize(column_path(path, name)) // dtype.itemsize
+                if os.path.exists(column_path(path, name)) else 0
+                for name, dtype in TRACK_COLUMNS.items()
+            )
+
+    @property
+    def is_finalized(self) -> bool:
+        """Check if the writer has finished and the player index is available"""
+        return self._players is not None
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def column(self, name: str) -> np.ndarray:
+        """Memory-mapped view of one column"""
+        if name not in TRACK_COLUMNS:
+            raise KeyError(f"Unknown tracking column: {name}")
+        if name not in self._columns:
+            self._columns[name] = (
+                np.memmap(column_path(self.path, name), dtype=TRACK_COLUMNS[name], mode="r", shape=(self.rows,))
+                if self.rows else np.empty(0, dtype=TRACK_COLUMNS[name])
+            )
+        return self._columns[name]
+
+    def time_range(self, start_time: Optional[float] = None, end_time: Optional[float] = None) -> slice:
+        """Rows with ``start_time <= timestamp < end_time``"""
+        timestamps = self.column("timestamp")
+        start = 0 if start_time is None else int(np.searchsorted(timestamps, start_time, side="left"))
+        end = self.rows if end_time is None else int(np.searchsorted(timestamps, end_time, side="left"))
+        return slice(start, max(start, end))
+
+    def player_rows(self, player_id: int, rows: Optional[slice] = None) -> np.ndarray:
+        """Row numbers of one player, in frame order, optionally within a row range"""
+        rows = rows or slice(0, self.rows)
+
+        if self.is_finalized:
+            span = self._players.get(str(player_id))
+            if span is None:
+                return np.empty(0, dtype=np.int64)
+            order = np.memmap(
+                os.path.join(self.path, PLAYER_INDEX_FILE), dtype=np.int64, mode="r", shape=(self.rows,)
+            )
+            player_rows = order[span[0]:span[1]]
+            lo, hi = np.searchsorted(player_rows, [rows.start, rows.stop], side="left")
+            return np.asarray(player_rows[lo:hi])
+
+        matches = np.flatnonzero(self.column("player_id")[rows] == player_id)
+        return matches + rows.start
+
+    def select(
+        self,
+        start_time: Optional[float] = None,
+        end_time: Optional[float] = None,
+        player_id: Optional[int] = None,
+        columns: Optional[list] = None
+    ) -> Dict[str, np.ndarray]:
+        """Copy out the selected columns for a time range and/or a single player"""
+        rows = self.time_range(start_time, end_time)
+        if player_id is not None:
+            rows = self.player_rows(player_id, rows)
+        return {name: np.array(self.column(name)[rows]) for name in (columns or TRACK_COLUMNS)}
@@ -0,0 +1,405 @@
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from loguru import logger
+
+from services.frame_sampling import FrameSampler
+from services.player_detection import PlayerDetectionService
+from services.player_tracking import PlayerTracker
+from services.result_store import ResultWriter, read_results
+from services.tracking_store import TrackingStoreWriter
+
+
+class JobStatus:
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class VideoJobQueue:
+    """SQLite-backed queue of video analysis jobs
+
+    Job state survives a restart of the service: jobs that were running when
+    the process died are put back on the queue by ``requeue_interrupted`` and
+    resume from their last checkpoint. Several processes may share the
+    database: a claimed job records its ``owner`` (host and pid) and the
+    owner keeps ``updated_at`` fresh with ``heartbeat``, so only jobs whose
+    owner has exited or has not sent a heartbeat for ``stale_after``
+    seconds are requeued. Per-frame results of a job are
+    appended to an NDJSON file in ``jobs_dir`` (see ``ResultWriter``) and
+    the detections to a columnar tracking store (see ``TrackingStoreWriter``).
+    """
+
+    def __init__(self, db_path: str = "jobs/video_jobs.db", jobs_dir: str = "jobs", stale_after: float = 120.0):
+        self.db_path = db_path
+        self.jobs_dir = jobs_dir
+        self.stale_after = stale_after
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._claim_lock = threading.Lock()
+
+        os.makedirs(jobs_dir, exist_ok=True)
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS video_jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    frames_processed INTEGER NOT NULL DEFAULT 0,
+                    total_frames INTEGER,
+                    checkpoint TEXT,
+                    error TEXT,
+                    owner TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(video_jobs)")}
+            if "owner" not in columns:
+                conn.execute("ALTER TABLE video_jobs ADD COLUMN owner TEXT")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection, committing on success and always closing it"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _update(self, job_id: str, **fields) -> None:
+        """Set columns of a job row"""
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._connect() as conn:
+            conn.execute(
+                f"UPDATE video_jobs SET {assignments} WHERE id = ?",
+                (*fields.values(), job_id)
+            )
+
+    def _to_dict(self, row: sqlite3.Row) -> Dict[str, Any]:
+        """Convert a job row, decoding its JSON columns"""
+        job = dict(row)
+        job["params"] = json.loads(job["params"])
+        job["checkpoint"] = json.loads(job["checkpoint"]) if job["checkpoint"] else None
+        return job
+
+    def submit(self, params: Dict[str, Any]) -> str:
+        """Queue a job and return its ID"""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO video_jobs (id, status, params, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (job_id, JobStatus.QUEUED, json.dumps(params), now, now)
+            )
+        logger.info(f"Queued video job {job_id} for {params.get('video_path')}")
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job by ID"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM video_jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def claim(self) -> Optional[Dict[str, Any]]:
+        """Take the oldest queued job and mark it running"""
+        with self._claim_lock, self._connect() as conn:
+            # Lock the database so other processes cannot claim the same job
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT * FROM video_jobs WHERE status = ? ORDER BY created_at LIMIT 1",
+                (JobStatus.QUEUED,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE video_jobs SET status = ?, owner = ?, updated_at = ? WHERE id = ?",
+                (JobStatus.RUNNING, self.owner, time.time(), row["id"])
+            )
+        job = self._to_dict(row)
+        job["status"] = JobStatus.RUNNING
+        job["owner"] = self.owner
+        return job
+
+    def heartbeat(self, job_ids: List[str]) -> None:
+        """Mark running jobs of this process as alive"""
+        if not job_ids:
+            return
+        with self._connect() as conn:
+            conn.execute(
+                f"UPDATE video_jobs SET updated_at = ? "
+                f"WHERE status = ? AND owner = ? AND id IN ({', '.join('?' * len(job_ids))})",
+                (time.time(), JobStatus.RUNNING, self.owner, *job_ids)
+            )
+
+    def requeue_interrupted(self) -> int:
+        """Put running jobs whose owner has exited or stopped sending heartbeats back on the queue"""
+        stale_before = time.time() - self.stale_after
+        with self._claim_lock, self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(
+                "SELECT id, owner, updated_at FROM video_jobs WHERE status = ?",
+                (JobStatus.RUNNING,)
+            ).fetchall()
+            interrupted = [
+                row["id"] for row in rows
+                if row["updated_at"] < stale_before or self._owner_exited(row["owner"])
+            ]
+            for job_id in interrupted:
+                conn.execute(
+                    "UPDATE video_jobs SET status = ?, owner = NULL, updated_at = ? WHERE id = ?",
+                    (JobStatus.QUEUED, time.time(), job_id)
+                )
+        if interrupted:
+            logger.info(f"Requeued {len(interrupted)} interrupted video jobs")
+        return len(interrupted)
+
+    def _owner_exited(self, owner: Optional[str]) -> bool:
+        """Check if a job owner is a process on this host that no longer exists
+
+        Owners on other hosts are only judged by their heartbeat.
+        """
+        if not owner or owner == self.owner:
+            return False
+        host, _, pid = owner.rpartition(":")
+        if host != socket.gethostname() or not pid.isdigit():
+            return False
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            return True
+        except PermissionError:
+            pass
+        return False
+
+    def update_progress(self, job_id: str, frames_processed: int, total_frames: Optional[int] = None) -> None:
+        """Record how many frames a job has processed"""
+        fields = {"frames_processed": frames_processed}
+        if total_frames is not None:
+            fields["total_frames"] = total_frames
+        self._update(job_id, **fields)
+
+    def save_checkpoint(self, job_id: str, checkpoint: Dict[str, Any]) -> None:
+        """Record the point a job can resume from"""
+        self._update(
+            job_id,
+            checkpoint=json.dumps(checkpoint),
+            frames_processed=checkpoint["next_frame"]
+        )
+
+    def complete(self, job_id: str) -> None:
+        """Mark a job completed"""
+        self._update(job_id, status=JobStatus.COMPLETED, error=None)
+
+    def fail(self, job_id: str, error: str) -> None:
+        """Mark a job failed with the error message"""
+        self._update(job_id, status=JobStatus.FAILED, error=error)
+
+    def results_path(self, job_id: str) -> str:
+        """Path of the NDJSON file holding a job's per-frame results"""
+        return os.path.join(self.jobs_dir, f"{job_id}.ndjson")
+
+    def tracks_path(self, job_id: str) -> str:
+        """Directory of the columnar tracking store of a job (see ``TrackingStore``)"""
+        return os.path.join(self.jobs_dir, f"{job_id}.tracks")
+
+    def read_results(
+        self,
+        job_id: str,
+        offset: int = 0,
+        limit: int = 1000,
+        start_frame: int = 0,
+        end_frame: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Read a page of a job's per-frame results, optionally within a frame range"""
+        return read_results(self.results_path(job_id), start_frame, end_frame, offset, limit)
+
+
+class VideoJobWorker:
+    """Worker threads that pull video jobs from a ``VideoJobQueue``
+
+    Results are appended to the job's NDJSON file as frames complete, and
+    every ``checkpoint_interval`` frames the file is flushed and the resume
+    point is saved. A job that crashes is resumed from its last checkpoint
+    instead of frame 0. Jobs that write an annotated output video always
+    restart from frame 0, as the video cannot be appended to.
+
+    While jobs run, a heartbeat thread refreshes them every
+    ``heartbeat_interval`` seconds (keep it well below the queue's
+    ``stale_after``) and requeues jobs abandoned by other processes.
+    """
+
+    def __init__(
+        self,
+        queue: VideoJobQueue,
+        service: PlayerDetectionService,
+        workers: int = 1,
+        checkpoint_interval: int = 500,
+        poll_interval: float = 0.5,
+        heartbeat_interval: float = 10.0
+    ):
+        self.queue = queue
+        self.service = service
+        self.workers = workers
+        self.checkpoint_interval = checkpoint_interval
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._heartbeat_thread: Optional[threading.Thread] = None
+        self._active: set = set()
+        self._active_lock = threading.Lock()
+
+    def start(self) -> None:
+        """Requeue interrupted jobs and start the worker threads"""
+        self.queue.requeue_interrupted()
+        self._stop.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"video-job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        if self._heartbeat_thread is None or not self._heartbeat_thread.is_alive():
+            self._heartbeat_thread = threading.Thread(target=self._heartbeat, name="video-job-heartbeat", daemon=True)
+            self._heartbeat_thread.start()
+        logger.info(f"Started {self.workers} video job workers")
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop taking new jobs and wait for the threads to exit
+
+        A job still running when the timeout expires keeps its heartbeat
+        until it finishes; if the process exits first, the job is resumed
+        from its checkpoint once its heartbeat is stale.
+        """
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _run(self) -> None:
+        """Worker loop: claim and process jobs until stopped"""
+        while not self._stop.is_set():
+            job = self.queue.claim()
+            if job is None:
+                self._stop.wait(self.poll_interval)
+                continue
+
+            with self._active_lock:
+                self._active.add(job["id"])
+            try:
+                asyncio.run(self._process(job))
+                self.queue.complete(job["id"])
+                logger.info(f"Video job {job['id']} completed")
+            except Exception as e:
+                logger.error(f"Video job {job['id']} failed: {e}")
+                self.queue.fail(job["id"], str(e))
+            finally:
+                with self._active_lock:
+                    self._active.discard(job["id"])
+
+    def _heartbeat(self) -> None:
+        """Keep this process's running jobs alive and requeue abandoned ones, until stopped and idle"""
+        while True:
+            with self._active_lock:
+                job_ids = list(self._active)
+            stopped = self._stop.is_set()
+            if stopped and not job_ids:
+                return
+            try:
+                self.queue.heartbeat(job_ids)
+                if not stopped:
+                    self.queue.requeue_interrupted()
+            except sqlite3.Error as e:
+                logger.warning(f"Video job heartbeat failed: {e}")
+            if stopped:
+                time.sleep(self.heartbeat_interval)
+            else:
+                self._stop.wait(self.heartbeat_interval)
+
+    async def _process(self, job: Dict[str, Any]) -> None:
+        """Run a job, appending results and saving checkpoints as it goes"""
+        job_id = job["id"]
+        params = job["params"]
+
+        checkpoint = job["checkpoint"] if not params.get("output_path") else None
+        if checkpoint:
+            logger.info(f"Resuming video job {job_id} from frame {checkpoint['next_frame']}")
+        else:
+            checkpoint = {
+                "next_frame": 0, "results_offset": 0, "results_count": 0, "track_rows": 0,
+                "next_player_id": 1, "inferred_frames": []
+            }
+
+        sampler = FrameSampler(**params.get("sampling", {}))
+        inferred_before = checkpoint["inferred_frames"]
+        state = dict(checkpoint)
+
+        # Drop anything written after the last checkpoint
+        writer = ResultWriter(
+            self.queue.results_path(job_id),
+            resume_count=checkpoint["results_count"],
+            resume_offset=checkpoint["results_offset"]
+        )
+        tracks = TrackingStoreWriter(self.queue.tracks_path(job_id), resume_rows=checkpoint["track_rows"])
+        # Tracks cannot be carried across a restart, but player IDs stay unique
+        tracker = PlayerTracker(first_id=checkpoint["next_player_id"])
+        finished = False
+        try:
+            def save_checkpoint() -> None:
+                writer.flush(sync=True)
+                tracks.flush(sync=True)
+                state["results_offset"] = writer.offset
+                state["track_rows"] = tracks.rows
+                state["next_player_id"] = tracker.next_id
+                # The pipeline may have inferred frames whose results are not written yet
+                state["inferred_frames"] = inferred_before + [
+                    frame_index for frame_index in sampler.inferred_frames
+                    if frame_index < state["next_frame"]
+                ]
+                self.queue.save_checkpoint(job_id, state)
+
+            def on_result(frame_index: int, result) -> None:
+                writer.append(frame_index, result)
+                state["results_count"] += 1
+                state["next_frame"] = frame_index + 1
+                if state["results_count"] % self.checkpoint_interval == 0:
+                    save_checkpoint()
+
+            await self.service.process_video(
+                params["video_path"],
+                params.get("output_path"),
+                batch_size=params.get("batch_size", 1),
+                pipelined=params.get("pipelined", False),
+                queue_size=params.get("queue_size", 8),
+                sampler=sampler,
+                team_profile_key=params.get("team_profile_key"),
+                start_frame=checkpoint["next_frame"],
+                on_result=on_result,
+                on_progress=lambda frame_count, total_frames: self.queue.update_progress(
+                    job_id, frame_count, total_frames
+                ),
+                tracks=tracks,
+                tracker=tracker,
+                raise_errors=True
+            )
+            save_checkpoint()
+            finished = True
+        finally:
+            writer.close()
+            # Only a completed job gets its player index; a failed one resumes appending
+            tracks.close(finalize=finished)
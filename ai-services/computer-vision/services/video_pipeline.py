@@ -0,0 +1,244 @@
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+from loguru import logger
+
+from services.frame_sampling import FrameAction
+
+
+# Marks the end of the stream on a stage queue
+_END = object()
+
+
+class VideoPipeline:
+    """Producer/consumer pipeline for decode, inference and annotate+encode
+
+    Each stage runs on its own thread and hands work to the next one through
+    a bounded queue, so decoding and encoding overlap with inference and a
+    video is processed at the speed of the slowest stage. ``queue_size`` is
+    the backpressure knob: a stage blocks once that many batches are waiting
+    downstream. Each stage has a single thread, so frames leave the pipeline
+    in the order they were decoded.
+
+    Frames arrive as ``(frame_index, frame, action)`` tuples (see
+    ``FrameSampler.frames``). Only INFER frames reach the model; CARRY and
+    PASSTHROUGH frames reuse the most recent detections, and PASSTHROUGH
+    frames are encoded without producing a result.
+    """
+
+    def __init__(
+        self,
+        infer_batch: Callable[[List[np.ndarray]], List[Any]],
+        finish_frame: Callable[
+            [int, np.ndarray, Any, FrameAction], Tuple[Any, Optional[np.ndarray]]
+        ],
+        batch_size: int = 1,
+        queue_size: int = 8
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        if queue_size < 1:
+            raise ValueError("queue_size must be at least 1")
+
+        self.infer_batch = infer_batch
+        self.finish_frame = finish_frame
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+
+        self._decoded: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._inferred: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._error: Optional[BaseException] = None
+        self.stage_seconds: Dict[str, float] = {"decode": 0.0, "infer": 0.0, "annotate": 0.0}
+        self._last_index = -1
+        self._last_detections: Any = None
+
+    def run(
+        self,
+        frames: Iterator[Tuple[int, np.ndarray, FrameAction]],
+        writer: Optional[cv2.VideoWriter] = None,
+        on_progress: Optional[Callable[[int], None]] = None,
+        on_result: Optional[Callable[[int, Any], None]] = None
+    ) -> List[Any]:
+        """Run the pipeline to completion and return per-frame results in order
+
+        The decode and inference stages get their own threads; the calling
+        thread acts as the annotate+encode stage. When ``on_result`` is given
+        each result is handed to it with its frame index as soon as it is
+        ready instead of being collected in the returned list.
+        """
+        decode_thread = threading.Thread(
+            target=self._guard, args=(self._decode, frames), name="video-decode", daemon=True
+        )
+        infer_thread = threading.Thread(
+            target=self._guard, args=(self._infer,), name="video-infer", daemon=True
+        )
+        decode_thread.start()
+        infer_thread.start()
+
+        results: List[Any] = []
+        try:
+            self._guard(self._annotate, writer, on_result or self._collect(results), on_progress)
+        finally:
+            self._stop.set()
+            decode_thread.join()
+            infer_thread.join()
+
+        if self._error is not None:
+            raise self._error
+
+        logger.info(
+            "Pipeline stage busy time: "
+            + ", ".join(f"{stage}={seconds:.2f}s" for stage, seconds in self.stage_seconds.items())
+        )
+        return results
+
+    def run_inline(
+        self,
+        frames: Iterator[Tuple[int, np.ndarray, FrameAction]],
+        writer: Optional[cv2.VideoWriter] = None,
+        on_progress: Optional[Callable[[int], None]] = None,
+        on_result: Optional[Callable[[int, Any], None]] = None
+    ) -> List[Any]:
+        """Run the same stages one batch at a time on the calling thread"""
+        results: List[Any] = []
+        sink = on_result or self._collect(results)
+        for batch in self._batches(frames):
+            detections = self._infer_items(batch)
+            self._finish_items(batch, detections, writer, sink)
+            if on_progress:
+                on_progress(self._last_index + 1)
+        return results
+
+    def _collect(self, results: List[Any]) -> Callable[[int, Any], None]:
+        """Result sink that appends to a list"""
+        return lambda frame_index, result: results.append(result)
+
+    def _guard(self, stage: Callable, *args) -> None:
+        """Run a stage, recording the first failure and stopping the others"""
+        try:
+            stage(*args)
+        except BaseException as e:
+            if self._error is None:
+                self._error = e
+            self._stop.set()
+
+    def _put(self, target: queue.Queue, item: Any) -> bool:
+        """Put with backpressure, giving up if the pipeline is stopping"""
+        while not self._stop.is_set():
+            try:
+                target.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, source: queue.Queue) -> Any:
+        """Get the next item, returning the end marker if the pipeline is stopping"""
+        while not self._stop.is_set():
+            try:
+                return source.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _END
+
+    def _batches(
+        self,
+        frames: Iterator[Tuple[int, np.ndarray, FrameAction]]
+    ) -> Iterator[List[Tuple[int, np.ndarray, FrameAction]]]:
+        """Group frames into batches of ``batch_size``"""
+        batch: List[Tuple[int, np.ndarray, FrameAction]] = []
+        for item in frames:
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _infer_items(self, batch: List[Tuple[int, np.ndarray, FrameAction]]) -> List[Any]:
+        """Run the model on the frames of a batch that need inference"""
+        to_infer = [frame for _, frame, action in batch if action == FrameAction.INFER]
+        start = time.perf_counter()
+        inferred = iter(self.infer_batch(to_infer) if to_infer else [])
+        self.stage_seconds["infer"] += time.perf_counter() - start
+
+        return [
+            next(inferred) if action == FrameAction.INFER else None
+            for _, _, action in batch
+        ]
+
+    def _finish_items(
+        self,
+        batch: List[Tuple[int, np.ndarray, FrameAction]],
+        detections: List[Any],
+        writer: Optional[cv2.VideoWriter],
+        on_result: Callable[[int, Any], None]
+    ) -> None:
+        """Post-process, annotate and encode a batch, carrying detections forward"""
+        start = time.perf_counter()
+        for (frame_index, frame, action), frame_detections in zip(batch, detections):
+            if frame_index <= self._last_index:
+                raise RuntimeError(
+                    f"Pipeline frame order broken: frame {frame_index} after {self._last_index}"
+                )
+            self._last_index = frame_index
+
+            if action == FrameAction.INFER:
+                self._last_detections = frame_detections
+            result, annotated = self.finish_frame(frame_index, frame, self._last_detections, action)
+
+            if action != FrameAction.PASSTHROUGH:
+                on_result(frame_index, result)
+            if writer is not None and annotated is not None:
+                writer.write(annotated)
+        self.stage_seconds["annotate"] += time.perf_counter() - start
+
+    def _decode(self, frames: Iterator[Tuple[int, np.ndarray, FrameAction]]) -> None:
+        """Decode frames and group them into batches"""
+        batches = self._batches(frames)
+        while not self._stop.is_set():
+            start = time.perf_counter()
+            batch = next(batches, None)
+            self.stage_seconds["decode"] += time.perf_counter() - start
+
+            if batch is None:
+                break
+            if not self._put(self._decoded, batch):
+                return
+
+        self._put(self._decoded, _END)
+
+    def _infer(self) -> None:
+        """Run the model on each decoded batch"""
+        while True:
+            batch = self._get(self._decoded)
+            if batch is _END:
+                break
+
+            detections = self._infer_items(batch)
+            if not self._put(self._inferred, (batch, detections)):
+                return
+
+        self._put(self._inferred, _END)
+
+    def _annotate(
+        self,
+        writer: Optional[cv2.VideoWriter],
+        on_result: Callable[[int, Any], None],
+        on_progress: Optional[Callable[[int], None]]
+    ) -> None:
+        """Post-process, annotate and encode frames in decode order"""
+        while True:
+            item = self._get(self._inferred)
+            if item is _END:
+                break
+
+            batch, detections = item
+            self._finish_items(batch, detections, writer, on_result)
+            if on_progress:
+                on_progress(self._last_index + 1)
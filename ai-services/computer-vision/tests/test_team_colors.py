@@ -0,0 +1,62 @@
+import threading
+
+import numpy as np
+
+from services.team_colors import TeamColorProfile, TeamColorProfileCache
+
+
+def _jerseys(rng, n):
+    """Features of two well separated jersey colours and their fallback team IDs"""
+    team_ids = rng.integers(1, 3, size=n)
+    colours = np.where(team_ids[:, np.newaxis] == 1, [200.0, 30.0, 30.0], [30.0, 30.0, 200.0])
+    return (colours + rng.normal(0, 5, size=(n, 3))).astype(np.float32), team_ids
+
+
+def test_concurrent_observe_fits_once():
+    profile = TeamColorProfile(warmup_detections=200, n_clusters=2)
+    rng = np.random.default_rng(0)
+    batches = [_jerseys(rng, 10) for _ in range(64)]
+    fits = []
+    fit = profile._fit
+    profile._fit = lambda: (fits.append(1), fit())
+    errors = []
+    start = threading.Barrier(8)
+
+    def observe(chunk):
+        start.wait()
+        try:
+            for features, team_ids in chunk:
+                profile.observe(features, team_ids)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=observe, args=(batches[i::8],)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert profile.is_fitted
+    assert len(fits) == 1
+
+    features, team_ids = _jerseys(rng, 50)
+    assert (profile.classify(features) == team_ids).all()
+
+
+def test_cache_returns_one_profile_per_key():
+    cache = TeamColorProfileCache()
+    profiles = []
+    start = threading.Barrier(8)
+
+    def get():
+        start.wait()
+        profiles.append(cache.get("match-1"))
+
+    threads = [threading.Thread(target=get) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(profile) for profile in profiles}) == 1
@@ -0,0 +1,127 @@
+import asyncio
+import socket
+import time
+
+import cv2
+import numpy as np
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("ultralytics")
+
+import services.player_detection as player_detection
+from services.inference_backends import DetectorBoxes, DetectorResult
+from services.player_detection import PlayerDetectionService
+from services.tracking_store import TrackingStore
+from services.video_jobs import JobStatus, VideoJobQueue, VideoJobWorker
+
+FRAMES = 40
+CRASH_FRAME = 22
+
+
+class FakeDetector:
+    """Three people drifting right by one pixel per frame"""
+
+    def __call__(self, images, **kwargs):
+        results = []
+        for image in images:
+            shift = float(image[0, 0, 0])
+            xyxy = np.array([[10 + shift, 20, 30 + shift, 60], [60 + shift, 30, 80 + shift, 70], [110, 40, 130, 80]],
+                            dtype=np.float32)
+            results.append(DetectorResult(DetectorBoxes(
+                xyxy, np.full(3, 0.9, dtype=np.float32), np.zeros(3, dtype=np.float32)
+            )))
+        return results
+
+
+@pytest.fixture
+def video_path(tmp_path):
+    path = str(tmp_path / "clip.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 25, (160, 120))
+    for i in range(FRAMES):
+        # The frame index is encoded in the pixels for FakeDetector
+        writer.write(np.full((120, 160, 3), i, dtype=np.uint8))
+    writer.release()
+    return path
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(player_detection, "load_detector", lambda *args, **kwargs: FakeDetector())
+    return PlayerDetectionService(model_path="fake.pt")
+
+
+def test_resumed_job_continues_player_ids(tmp_path, video_path, service):
+    queue = VideoJobQueue(str(tmp_path / "jobs.db"), str(tmp_path / "jobs"))
+    job_id = queue.submit({"video_path": video_path})
+    worker = VideoJobWorker(queue, service, checkpoint_interval=5)
+
+    # Crash part way through the video, after some checkpoints were saved
+    process_video = service.process_video
+
+    async def crashing(*args, on_result=None, **kwargs):
+        def crash_on_result(frame_index, result):
+            if frame_index >= CRASH_FRAME:
+                raise RuntimeError("crash")
+            on_result(frame_index, result)
+        return await process_video(*args, on_result=crash_on_result, **kwargs)
+
+    service.process_video = crashing
+    with pytest.raises(RuntimeError):
+        asyncio.run(worker._process(queue.claim()))
+    service.process_video = process_video
+
+    checkpoint = queue.get(job_id)["checkpoint"]
+    before = TrackingStore(queue.tracks_path(job_id)).column("player_id")[:checkpoint["track_rows"]]
+    ids_before = set(before[before >= 0].tolist())
+    assert ids_before
+    assert checkpoint["next_player_id"] == max(ids_before) + 1
+
+    # A restarted service finds the crashed job's heartbeat stale
+    queue = VideoJobQueue(queue.db_path, queue.jobs_dir, stale_after=0)
+    assert queue.requeue_interrupted() == 1
+    worker = VideoJobWorker(queue, service, checkpoint_interval=5)
+    asyncio.run(worker._process(queue.claim()))
+
+    store = TrackingStore(queue.tracks_path(job_id))
+    after = store.column("player_id")[checkpoint["track_rows"]:]
+    ids_after = set(after[after >= 0].tolist())
+    assert ids_after
+    assert min(ids_after) == checkpoint["next_player_id"]
+    assert not ids_before & ids_after
+
+
+def test_requeue_leaves_live_jobs_of_other_processes(tmp_path):
+    queue = VideoJobQueue(str(tmp_path / "jobs.db"), str(tmp_path / "jobs"), stale_after=60)
+    other = VideoJobQueue(queue.db_path, queue.jobs_dir, stale_after=60)
+    other.owner = "other-host:1234"
+    job_id = queue.submit({"video_path": "clip.mp4"})
+    other.claim()
+
+    # Another process starting up must not take over a job with a fresh heartbeat
+    assert queue.requeue_interrupted() == 0
+    assert queue.get(job_id)["status"] == JobStatus.RUNNING
+
+    # Without heartbeats the job is requeued once it is stale
+    queue.stale_after = 0.05
+    time.sleep(0.1)
+    assert queue.requeue_interrupted() == 1
+    assert queue.get(job_id)["status"] == JobStatus.QUEUED
+
+    queue.claim()
+    time.sleep(0.1)
+    queue.heartbeat([job_id])
+    other.stale_after = 0.05
+    assert other.requeue_interrupted() == 0
+
+
+def test_requeue_jobs_of_exited_processes_on_this_host(tmp_path):
+    queue = VideoJobQueue(str(tmp_path / "jobs.db"), str(tmp_path / "jobs"), stale_after=60)
+    exited = VideoJobQueue(queue.db_path, queue.jobs_dir)
+    # No process has this ID: it is above the kernel's PID limit
+    exited.owner = f"{socket.gethostname()}:{2 ** 31 - 1}"
+    job_id = queue.submit({"video_path": "clip.mp4"})
+    exited.claim()
+
+    assert queue.requeue_interrupted() == 1
+    assert queue.get(job_id)["status"] == JobStatus.QUEUED
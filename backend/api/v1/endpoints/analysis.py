@@ -4,6 +4,9 @@ from typing import List, Any
 from core.database import get_db
 from core.security import get_current_user
 from models.user import User
+from models.match import MatchTracks
+from models.player import Player
+from services.player_analytics import PlayerAnalyticsService
 
 router = APIRouter()
 
@@ -66,6 +69,32 @@ async def get_team_performance(
     }
 
 
+@router.post("/match/{match_id}/tracks")
+async def aggregate_match_tracks(
+    match_id: int,
+    tracks: MatchTracks,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+) -> Any:
+    """Compute per-player heatmaps, distance and sprints from a match's tracks and store them"""
+    if not (len(tracks.timestamp) == len(tracks.x) == len(tracks.y) == len(tracks.player_id)):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Track columns must have the same length"
+        )
+    
+    analytics_service = PlayerAnalyticsService(db)
+    match = await analytics_service.aggregate_match(match_id, tracks)
+    if not match:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Match not found")
+    
+    return {
+        "match_id": match_id,
+        "players": len(match.heatmaps),
+        "player_performance": match.player_performance
+    }
+
+
 @router.get("/player/{player_id}/stats")
 async def get_player_stats(
     player_id: int,
@@ -73,15 +102,24 @@ async def get_player_stats(
     db: AsyncSession = Depends(get_db)
 ) -> Any:
     """Get player statistics"""
-    # TODO: Implement player statistics
+    player = await db.get(Player, player_id)
+    if not player:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Player not found")
+    
+    # Tracking aggregates are precomputed per match by aggregate_match_tracks
+    tracking = (player.heatmap_data or {}).get("totals", {})
     return {
         "player_id": player_id,
         "stats": {
-            "matches_played": 12,
-            "goals": 5,
-            "assists": 3,
-            "passes_completed": 85,
-            "tackles_won": 24,
-            "avg_rating": 7.2
+            "matches_played": player.appearances,
+            "goals": player.goals,
+            "assists": player.assists,
+            "minutes_played": player.minutes_played,
+            "matches_tracked": tracking.get("matches_tracked", 0),
+            "distance_covered": tracking.get("distance_covered"),
+            "sprints": tracking.get("sprints"),
+            "max_speed": tracking.get("max_speed"),
+            "average_position": tracking.get("average_position"),
+            "heatmap": tracking.get("heatmap")
         }
-    } 
\ No newline at end of file
+    }
\ No newline at end of file
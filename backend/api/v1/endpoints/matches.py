@@ -1,22 +1,37 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Any
+from typing import List, Any, Optional
 from core.database import get_db
 from core.security import get_current_user
 from models.user import User
 from models.match import Match, MatchCreate, MatchResponse
+from services.match_service import MatchService
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[MatchResponse])
 async def get_matches(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ) -> Any:
-    """Get all matches for the current user's team"""
-    # TODO: Implement match retrieval logic
-    return []
+    """Get all matches for the current user's team (all matches without a team), newest first
+    
+    Pass the ``X-Next-Cursor`` response header back as ``cursor`` for the
+    next page; it is absent on the last page.
+    """
+    match_service = MatchService(db)
+    try:
+        matches, next_cursor = await match_service.list_matches(current_user.team_id, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return matches
 
 
 @router.post("/", response_model=MatchResponse)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Measure the authentication overhead per request of get_current_user
+
+Resolves the same bearer token repeatedly with the user cache disabled
+(a database query per request, as before the cache), with only the Redis
+tier and with the in-process tier in front of it. Needs the configured
+PostgreSQL and Redis; a throwaway user is created and deleted.
+
+Usage (from backend):
+    python benchmarks/auth_overhead.py --requests 2000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+from datetime import timedelta
+
+# Add the backend root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import core.security as security
+from core.database import AsyncSessionLocal, close_db, get_redis, init_clients, init_db
+from core.user_cache import UserCache
+from models.user import UserCreate
+from services.user_service import UserService
+
+
+async def measure(token: str, cache: UserCache, requests: int) -> float:
+    """Microseconds per get_current_user call with the given cache"""
+    security.user_cache = cache
+    async with AsyncSessionLocal() as db:
+        # The first call fills the cache tiers that are enabled
+        await security.get_current_user(token, db)
+        start = time.perf_counter()
+        for _ in range(requests):
+            await security.get_current_user(token, db)
+        return (time.perf_counter() - start) / requests * 1e6
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    await init_db()
+    init_clients()
+    redis_client = get_redis()
+    suffix = uuid.uuid4().hex[:8]
+    async with AsyncSessionLocal() as db:
+        user = await UserService(db).create_user(UserCreate(
+            email=f"auth-bench-{suffix}@example.com",
+            username=f"auth-bench-{suffix}",
+            password=uuid.uuid4().hex
+        ))
+    token = security.create_access_token({"sub": user.email}, expires_delta=timedelta(minutes=5))
+
+    modes = [
+        ("database (no cache)", UserCache(None, ttl=0, local_ttl=0)),
+        ("redis", UserCache(redis_client, local_ttl=0)),
+        ("in-process + redis", UserCache(redis_client)),
+    ]
+    try:
+        print(f"🧪 Auth overhead: {args.requests} requests per mode")
+        print("=" * 50)
+        baseline = None
+        for name, cache in modes:
+            micros = await measure(token, cache, args.requests)
+            baseline = baseline or micros
+            print(f"{name:<22} {micros:10.1f} µs/request  ({baseline / micros:5.1f}x)")
+    finally:
+        for _, cache in modes:
+            await cache.invalidate(user.email)
+        async with AsyncSessionLocal() as db:
+            await UserService(db).delete_user(user.id)
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
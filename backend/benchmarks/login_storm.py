@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Measure the latency of an unrelated endpoint while a login storm runs
+
+Probes --probe-path (GET /health by default) at a fixed rate, first on an
+idle server and then while --concurrency clients log in back to back,
+and prints the probe's p50/p95/p99 for both phases together with the
+login throughput, the 503s returned when the hashing queue was full and
+the hashing pool metrics from /metrics. With bcrypt on the event loop
+the probe's p99 grows with every concurrent login; with the hashing
+pool it should stay close to the idle value.
+
+Runs against a server that is already up; a throwaway user is
+registered first.
+
+Usage (from backend, with the API running on port 8000):
+    python benchmarks/login_storm.py --concurrency 50 --seconds 20
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+import httpx
+import numpy as np
+
+
+async def probe(client: httpx.AsyncClient, path: str, interval: float, stop: asyncio.Event) -> list:
+    """Latencies in milliseconds of requests to ``path`` until ``stop`` is set"""
+    latencies = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        response = await client.get(path)
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(max(0.0, interval - (time.perf_counter() - start)))
+    return latencies
+
+
+async def login_loop(client: httpx.AsyncClient, email: str, password: str, statuses: dict, stop: asyncio.Event):
+    """Log in back to back until ``stop`` is set, counting response statuses"""
+    while not stop.is_set():
+        response = await client.post(
+            "/api/v1/auth/login", data={"username": email, "password": password}
+        )
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+
+async def run_phase(client, args, email: str, password: str, storm: bool):
+    """Probe latencies and login statuses of one phase"""
+    stop = asyncio.Event()
+    statuses = {}
+    probe_task = asyncio.create_task(probe(client, args.probe_path, args.probe_interval, stop))
+    logins = [
+        asyncio.create_task(login_loop(client, email, password, statuses, stop))
+        for _ in range(args.concurrency if storm else 0)
+    ]
+    await asyncio.sleep(args.seconds)
+    stop.set()
+    latencies = await probe_task
+    await asyncio.gather(*logins)
+    return np.array(latencies), statuses
+
+
+def report(name: str, latencies: np.ndarray) -> None:
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    print(f"{name:<14} {len(latencies):>7} {p50:9.1f} {p95:9.1f} {p99:9.1f} {latencies.max():9.1f}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=20)
+    parser.add_argument("--probe-path", default="/health")
+    parser.add_argument("--probe-interval", type=float, default=0.02)
+    args = parser.parse_args()
+
+    email = f"storm-{uuid.uuid4().hex[:8]}@example.com"
+    password = "storm-password"
+    limits = httpx.Limits(max_connections=args.concurrency + 10)
+    async with httpx.AsyncClient(base_url=args.url, timeout=60, limits=limits) as client:
+        response = await client.post("/api/v1/auth/register", json={
+            "email": email,
+            "username": email.split("@")[0],
+            "full_name": "Login Storm",
+            "password": password,
+        })
+        response.raise_for_status()
+
+        idle, _ = await run_phase(client, args, email, password, storm=False)
+        loaded, statuses = await run_phase(client, args, email, password, storm=True)
+        metrics = (await client.get("/metrics")).json().get("password_hashing", {})
+
+    print(f"🧪 {args.probe_path} latency, {args.concurrency} concurrent logins for {args.seconds:.0f}s")
+    print("=" * 60)
+    print(f"{'phase':<14} {'requests':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    report("idle", idle)
+    report("login storm", loaded)
+    print()
+    print(f"Logins/s: {statuses.get(200, 0) / args.seconds:.1f}  statuses: {dict(sorted(statuses.items()))}")
+    print(f"Hashing pool: {metrics}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -3,8 +3,11 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from core.config import settings
-import redis
-from neo4j import GraphDatabase
+from core.pool_metrics import InstrumentedAsyncPool
+import asyncio
+from typing import Any, Dict, Optional
+from redis import asyncio as aioredis
+from neo4j import AsyncDriver, AsyncGraphDatabase
 from loguru import logger
 
 # PostgreSQL Database
@@ -14,8 +17,17 @@ DATABASE_URL = settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncp
 engine = create_async_engine(
     DATABASE_URL,
     echo=settings.DEBUG,
-    pool_pre_ping=True,
-    pool_recycle=300,
+    poolclass=InstrumentedAsyncPool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+    pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    connect_args={
+        # SQLAlchemy's cache of prepared statements and asyncpg's own
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    },
 )
 
 # Create session factory
@@ -29,15 +41,12 @@ AsyncSessionLocal = sessionmaker(
 Base = declarative_base()
 
 
-# Redis connection
-redis_client = redis.from_url(settings.REDIS_URL)
+# Redis and Neo4j clients, created by init_clients() in the app lifespan
+redis_client: Optional[aioredis.Redis] = None
+neo4j_driver: Optional[AsyncDriver] = None
 
-
-# Neo4j connection
-neo4j_driver = GraphDatabase.driver(
-    settings.NEO4J_URI,
-    auth=(settings.NEO4J_USER, settings.NEO4J_PASSWORD)
-)
+# Result of the last connectivity check per store
+store_status: Dict[str, str] = {"redis": "unknown", "neo4j": "unknown"}
 
 
 async def get_db():
@@ -53,16 +62,71 @@ async def get_db():
             await session.close()
 
 
-def get_redis():
+def get_redis() -> Optional[aioredis.Redis]:
     """Dependency to get Redis client"""
     return redis_client
 
 
-def get_neo4j():
+def get_neo4j() -> Optional[AsyncDriver]:
     """Dependency to get Neo4j driver"""
     return neo4j_driver
 
 
+def init_clients() -> None:
+    """Create the async Redis and Neo4j clients
+    
+    Both connect lazily, so this returns immediately even when a store is
+    slow or down; ``check_clients`` reports whether they are reachable.
+    """
+    global redis_client, neo4j_driver
+    
+    if redis_client is None:
+        redis_client = aioredis.from_url(
+            settings.REDIS_URL,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+            health_check_interval=30
+        )
+    
+    if neo4j_driver is None:
+        neo4j_driver = AsyncGraphDatabase.driver(
+            settings.NEO4J_URI,
+            auth=(settings.NEO4J_USER, settings.NEO4J_PASSWORD),
+            max_connection_pool_size=settings.NEO4J_MAX_CONNECTION_POOL_SIZE,
+            connection_timeout=settings.NEO4J_CONNECTION_TIMEOUT_SECONDS,
+            connection_acquisition_timeout=settings.NEO4J_ACQUISITION_TIMEOUT_SECONDS
+        )
+    
+    logger.info("Redis and Neo4j clients created")
+
+
+async def check_clients() -> Dict[str, str]:
+    """Ping Redis and Neo4j concurrently and record whether they are reachable"""
+    timeout = settings.STORE_CHECK_TIMEOUT_SECONDS
+    
+    async def check(name: str, ping) -> None:
+        try:
+            await asyncio.wait_for(ping(), timeout)
+            store_status[name] = "connected"
+        except Exception as e:
+            store_status[name] = "unavailable"
+            logger.warning(f"{name} is not reachable: {e}")
+    
+    checks = []
+    if redis_client is not None:
+        checks.append(check("redis", redis_client.ping))
+    if neo4j_driver is not None:
+        checks.append(check("neo4j", neo4j_driver.verify_connectivity))
+    await asyncio.gather(*checks)
+    return dict(store_status)
+
+
+def get_pool_metrics() -> Dict[str, Any]:
+    """Connection pool usage and checkout waits of this process"""
+    return engine.pool.get_metrics()
+
+
 async def init_db():
     """Initialize database tables"""
     async with engine.begin() as conn:
@@ -72,7 +136,13 @@ async def init_db():
 
 async def close_db():
     """Close database connections"""
+    global redis_client, neo4j_driver
+    
     await engine.dispose()
-    redis_client.close()
-    neo4j_driver.close()
+    if redis_client is not None:
+        await redis_client.aclose()
+        redis_client = None
+    if neo4j_driver is not None:
+        await neo4j_driver.close()
+        neo4j_driver = None
     logger.info("Database connections closed") 
\ No newline at end of file
@@ -0,0 +1,116 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from loguru import logger
+
+
+class HashingPoolFullError(RuntimeError):
+    """Raised when too many password operations are already waiting"""
+
+
+class HashingTimeoutError(TimeoutError):
+    """Raised when a password operation does not finish within its timeout"""
+
+
+class HashingPool:
+    """Bounded thread pool for bcrypt hashing and verification
+
+    A bcrypt round costs a few hundred milliseconds of CPU. Called from an
+    async handler it blocks the event loop, so a burst of logins stalls
+    every other request. Here at most ``max_workers`` operations run at
+    once (bcrypt releases the GIL, so threads run in parallel) and at most
+    ``max_queue`` wait for a thread; further calls fail fast with
+    ``HashingPoolFullError`` instead of queueing without bound.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_queue: int = 64, timeout: float = 10.0):
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.max_queue = max_queue
+        self.timeout = timeout
+
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._wait_seconds_total = 0.0
+        self._wait_seconds_max = 0.0
+        self._run_seconds_total = 0.0
+
+    async def run(self, fn: Callable[..., Any], *args) -> Any:
+        """Run ``fn(*args)`` on the pool and await its result"""
+        with self._lock:
+            if self._queued >= self.max_queue:
+                self._rejected += 1
+                raise HashingPoolFullError(
+                    f"Password hashing queue is full ({self._queued} waiting, {self._in_flight} running)"
+                )
+            self._queued += 1
+
+        submitted = time.perf_counter()
+
+        def task() -> Any:
+            started = time.perf_counter()
+            with self._lock:
+                self._queued -= 1
+                self._in_flight += 1
+                wait = started - submitted
+                self._wait_seconds_total += wait
+                self._wait_seconds_max = max(self._wait_seconds_max, wait)
+
+            succeeded = False
+            try:
+                result = fn(*args)
+                succeeded = True
+                return result
+            finally:
+                with self._lock:
+                    self._in_flight -= 1
+                    self._run_seconds_total += time.perf_counter() - started
+                    if succeeded:
+                        self._completed += 1
+                    else:
+                        self._failed += 1
+
+        future = self._pool.submit(task)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            # Release the queue slot if the task never got a thread
+            if future.cancel():
+                with self._lock:
+                    self._queued -= 1
+            with self._lock:
+                self._timed_out += 1
+            logger.warning(f"Password operation timed out after {self.timeout}s")
+            raise HashingTimeoutError(f"Password operation did not finish within {self.timeout}s")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Queue depth, in-flight count and wait statistics"""
+        with self._lock:
+            started = self._completed + self._failed + self._in_flight
+            finished = self._completed + self._failed
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queue_depth": self._queued,
+                "in_flight": self._in_flight,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "timed_out": self._timed_out,
+                "avg_wait_ms": self._wait_seconds_total / started * 1000 if started else 0.0,
+                "max_wait_ms": self._wait_seconds_max * 1000,
+                "avg_run_ms": self._run_seconds_total / finished * 1000 if finished else 0.0,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker threads"""
+        self._pool.shutdown(wait=wait, cancel_futures=True)
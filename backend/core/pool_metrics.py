@@ -0,0 +1,58 @@
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """Async queue pool that records how long checkouts wait for a connection
+
+    Checkouts served from idle connections take microseconds; a high
+    average or maximum wait, or any timeouts, mean the pool is too small
+    for the load (or connections are held too long). ``engine.dispose()``
+    replaces the pool, which starts the counters over.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._metrics_lock = threading.Lock()
+        self._checkouts = 0
+        self._timeouts = 0
+        self._wait_seconds_total = 0.0
+        self._wait_seconds_max = 0.0
+        self._peak_checked_out = 0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except PoolTimeoutError:
+            with self._metrics_lock:
+                self._timeouts += 1
+            raise
+        wait = time.perf_counter() - started
+        with self._metrics_lock:
+            self._checkouts += 1
+            self._wait_seconds_total += wait
+            self._wait_seconds_max = max(self._wait_seconds_max, wait)
+            self._peak_checked_out = max(self._peak_checked_out, self.checkedout())
+        return record
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Connections in use, idle and in overflow, and checkout wait statistics"""
+        with self._metrics_lock:
+            return {
+                "pool_size": self.size(),
+                "max_overflow": max(0, self._max_overflow),
+                "timeout_seconds": self.timeout(),
+                "checked_out": self.checkedout(),
+                "idle": self.checkedin(),
+                "overflow": max(0, self.overflow()),
+                "peak_checked_out": self._peak_checked_out,
+                "checkouts": self._checkouts,
+                "timeouts": self._timeouts,
+                "avg_wait_ms": self._wait_seconds_total / self._checkouts * 1000 if self._checkouts else 0.0,
+                "max_wait_ms": self._wait_seconds_max * 1000,
+            }
@@ -9,11 +9,20 @@ from sqlalchemy import select
 
 from core.config import settings
 from core.database import get_db
+from core.hashing_pool import HashingPool, HashingPoolFullError, HashingTimeoutError
+from core.user_cache import user_cache
 from models.user import User, TokenData
 
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt runs here, off the event loop
+hashing_pool = HashingPool(
+    max_workers=settings.PASSWORD_HASH_WORKERS or None,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+    timeout=settings.PASSWORD_HASH_TIMEOUT_SECONDS
+)
+
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
@@ -28,6 +37,28 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def run_password_operation(fn, *args):
+    """Run a bcrypt call on ``hashing_pool``, answering 503 when it is saturated"""
+    try:
+        return await hashing_pool.run(fn, *args)
+    except (HashingPoolFullError, HashingTimeoutError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against its hash without blocking the event loop"""
+    return await run_password_operation(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password without blocking the event loop"""
+    return await run_password_operation(get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token"""
     to_encode = data.copy()
@@ -50,7 +81,7 @@ async def authenticate_user(db: AsyncSession, email: str, password: str) -> Opti
     if not user:
         return None
     
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password_async(password, user.hashed_password):
         return None
     
     return user
@@ -60,7 +91,11 @@ async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db)
 ) -> User:
-    """Get current user from JWT token"""
+    """Get current user from JWT token
+    
+    The user is looked up in ``user_cache`` first, so most requests
+    authenticate without a database round-trip.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -76,6 +111,10 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
     
+    user = await user_cache.get(token_data.email)
+    if user is not None:
+        return user
+    
     # Get user from database
     result = await db.execute(select(User).where(User.email == token_data.email))
     user = result.scalar_one_or_none()
@@ -83,6 +122,7 @@ async def get_current_user(
     if user is None:
         raise credentials_exception
     
+    await user_cache.set(token_data.email, user)
     return user
 
 
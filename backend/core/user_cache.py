@@ -0,0 +1,152 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from redis import RedisError
+from redis.asyncio import Redis
+from sqlalchemy import DateTime, inspect
+from sqlalchemy.orm import make_transient_to_detached
+from loguru import logger
+
+from core.config import settings
+from models.user import User
+
+# Never leaves the database
+EXCLUDED_COLUMNS = {"hashed_password"}
+
+
+class UserCache:
+    """Short-lived cache of authenticated users keyed by the token subject
+
+    An in-process LRU answers repeated requests without any I/O and Redis
+    shares entries between workers. Entries expire after ``ttl`` seconds
+    in Redis and ``local_ttl`` seconds in process; the local TTL is kept
+    short because another worker's invalidation only deletes the Redis
+    entry. ``UserService`` invalidates a user whenever it changes one.
+
+    Users are cached as their column values without the password hash and
+    rebuilt as detached ``User`` instances. Redis errors are logged and
+    treated as a miss, so authentication falls back to the database.
+    ``redis`` is attached in the app lifespan once the client exists;
+    until then only the in-process tier is used.
+    """
+
+    def __init__(
+        self,
+        redis: Optional[Redis],
+        ttl: int = 60,
+        local_ttl: int = 5,
+        max_entries: int = 1024,
+        prefix: str = "auth:user:"
+    ):
+        self.redis = redis
+        self.ttl = ttl
+        self.local_ttl = local_ttl
+        self.max_entries = max_entries
+        self.prefix = prefix
+
+        self._local: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counts = {"local_hits": 0, "redis_hits": 0, "misses": 0}
+
+    async def get(self, subject: str) -> Optional[User]:
+        """Cached user of a token subject, or None"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._local.get(subject)
+            if entry is not None and entry[0] > now:
+                self._local.move_to_end(subject)
+                self._counts["local_hits"] += 1
+                return self._to_user(entry[1])
+
+        data = None
+        if self.redis is not None and self.ttl > 0:
+            try:
+                raw = await self.redis.get(self.prefix + subject)
+                data = json.loads(raw) if raw else None
+            except (RedisError, ValueError) as e:
+                logger.warning(f"User cache read failed: {e}")
+
+        with self._lock:
+            if data is None:
+                self._local.pop(subject, None)
+                self._counts["misses"] += 1
+                return None
+            self._counts["redis_hits"] += 1
+            self._store_local(subject, data, now)
+        return self._to_user(data)
+
+    async def set(self, subject: str, user: User) -> None:
+        """Cache a user loaded from the database"""
+        data = self._to_data(user)
+        with self._lock:
+            self._store_local(subject, data, time.monotonic())
+        if self.redis is not None and self.ttl > 0:
+            try:
+                await self.redis.set(self.prefix + subject, json.dumps(data), ex=self.ttl)
+            except RedisError as e:
+                logger.warning(f"User cache write failed: {e}")
+
+    async def invalidate(self, *subjects: str) -> None:
+        """Forget users, e.g. after they were updated or deleted"""
+        subjects = [subject for subject in subjects if subject]
+        if not subjects:
+            return
+        with self._lock:
+            for subject in subjects:
+                self._local.pop(subject, None)
+        if self.redis is not None:
+            try:
+                await self.redis.delete(*(self.prefix + subject for subject in subjects))
+            except RedisError as e:
+                logger.warning(f"User cache invalidation failed: {e}")
+
+    def clear_local(self) -> None:
+        """Drop the in-process entries"""
+        with self._lock:
+            self._local.clear()
+
+    def get_metrics(self) -> Dict[str, int]:
+        """Hit and miss counts and the number of in-process entries"""
+        with self._lock:
+            return {**self._counts, "local_entries": len(self._local)}
+
+    def _store_local(self, subject: str, data: Dict[str, Any], now: float) -> None:
+        if self.local_ttl <= 0 or self.max_entries <= 0:
+            return
+        self._local[subject] = (now + self.local_ttl, data)
+        self._local.move_to_end(subject)
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+
+    def _to_data(self, user: User) -> Dict[str, Any]:
+        """JSON-safe column values of a user"""
+        data = {}
+        for column in inspect(User).columns:
+            if column.key in EXCLUDED_COLUMNS:
+                continue
+            value = getattr(user, column.key)
+            data[column.key] = value.isoformat() if isinstance(value, datetime) else value
+        return data
+
+    def _to_user(self, data: Dict[str, Any]) -> User:
+        """Detached user built from cached column values"""
+        values = dict(data)
+        for column in inspect(User).columns:
+            if isinstance(column.type, DateTime) and values.get(column.key):
+                values[column.key] = datetime.fromisoformat(values[column.key])
+        user = User(**values)
+        # Behaves like a user loaded by an earlier session, e.g. for merge()
+        make_transient_to_detached(user)
+        return user
+
+
+user_cache = UserCache(
+    None,
+    ttl=settings.USER_CACHE_TTL_SECONDS,
+    local_ttl=settings.USER_CACHE_LOCAL_TTL_SECONDS,
+    max_entries=settings.USER_CACHE_MAX_ENTRIES
+)
@@ -3,13 +3,17 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
+import asyncio
 import uvicorn
 from loguru import logger
 
 from core.config import settings
-from core.database import engine, Base
+from core.database import (
+    engine, Base, init_clients, check_clients, close_db, get_redis, get_pool_metrics, store_status
+)
 from api.v1.api import api_router
-from core.security import get_current_user
+from core.security import get_current_user, hashing_pool
+from core.user_cache import user_cache
 from services.websocket import websocket_router
 
 
@@ -25,10 +29,19 @@ async def lifespan(app: FastAPI):
     
     logger.info("Database tables created successfully")
     
+    # Redis and Neo4j connect lazily; check them without delaying startup
+    init_clients()
+    user_cache.redis = get_redis()
+    store_check = asyncio.create_task(check_clients())
+    
     yield
     
     # Shutdown
     logger.info("Shutting down AI Coaching Assistant...")
+    store_check.cancel()
+    user_cache.redis = None
+    await close_db()
+    hashing_pool.shutdown(wait=False)
 
 
 # Create FastAPI app
@@ -82,12 +95,23 @@ async def health_check():
         "status": "healthy",
         "services": {
             "database": "connected",
-            "redis": "connected",
+            "redis": store_status["redis"],
+            "neo4j": store_status["neo4j"],
             "ai_services": "running"
         }
     }
 
 
+@app.get("/metrics")
+async def metrics():
+    """Database pool, password hashing pool and user cache metrics of this worker"""
+    return {
+        "database_pool": get_pool_metrics(),
+        "password_hashing": hashing_pool.get_metrics(),
+        "user_cache": user_cache.get_metrics()
+    }
+
+
 @app.get("/protected")
 async def protected_route(current_user=Depends(get_current_user)):
     """Protected route example"""
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from core.database import Base
+
+
+class Competition(Base):
+    __tablename__ = "competitions"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(200), nullable=False)
+    country = Column(String(100))
+    season = Column(String(20))
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Float, Boolean, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Text, Float, Boolean, ForeignKey, JSON, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from core.database import Base
+from models.competition import Competition
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 from datetime import datetime
@@ -59,6 +60,13 @@ class Match(Base):
     home_team = relationship("Team", foreign_keys=[home_team_id])
     away_team = relationship("Team", foreign_keys=[away_team_id])
     competition = relationship("Competition")
+    
+    # Team match lists are read newest first, paged by (match_date, id)
+    __table_args__ = (
+        Index("ix_matches_home_team_id_match_date", "home_team_id", "match_date", "id"),
+        Index("ix_matches_away_team_id_match_date", "away_team_id", "match_date", "id"),
+        Index("ix_matches_match_date_id", "match_date", "id"),
+    )
 
 
 class MatchBase(BaseModel):
@@ -118,4 +126,21 @@ class TacticalAnalysis(BaseModel):
     key_players: List[int]
     strengths: List[str]
     weaknesses: List[str]
-    recommendations: List[str] 
\ No newline at end of file
+    recommendations: List[str] 
+
+
+class MatchTracks(BaseModel):
+    """Tracked player positions of a match, column by column as returned by
+    the computer vision service's tracks endpoints
+    
+    Positions are in pixels of a ``frame_width`` x ``frame_height`` frame and
+    are scaled onto a standard pitch, so distances assume the frame shows
+    the whole pitch. ``player_map`` maps tracker player IDs to player IDs.
+    """
+    frame_width: int
+    frame_height: int
+    timestamp: List[float]
+    x: List[float]
+    y: List[float]
+    player_id: List[int]
+    player_map: Dict[int, int] = {}
\ No newline at end of file
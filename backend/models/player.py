@@ -98,7 +98,11 @@ class PlayerPerformance(BaseModel):
     goals: int = 0
     assists: int = 0
     minutes_played: int = 0
-    position: str
-    rating: float
+    position: Optional[str] = None
+    rating: Optional[float] = None
     heatmap: Dict[str, Any]
-    events: List[Dict[str, Any]] 
\ No newline at end of file
+    distance_covered: Optional[float] = None  # in metres
+    sprints: Optional[int] = None
+    max_speed: Optional[float] = None  # in m/s
+    average_position: Optional[List[float]] = None  # [x, y] in metres
+    events: List[Dict[str, Any]] = [] 
\ No newline at end of file
@@ -0,0 +1,118 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import select, tuple_, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from models.competition import Competition
+from models.match import Match
+from models.team import Team
+
+
+def encode_cursor(match_date: datetime, match_id: int) -> str:
+    """Opaque cursor pointing after a match in the listing order"""
+    raw = json.dumps([match_date.isoformat(), match_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """``(match_date, id)`` of a cursor; raises ValueError for a malformed one"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        match_date, match_id = json.loads(raw)
+        return datetime.fromisoformat(match_date), int(match_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+class MatchService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def list_matches(
+        self,
+        team_id: Optional[int] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """A page of matches, newest first, with team and competition names
+
+        One query joins the team and competition names and selects only
+        the columns of ``MatchResponse``, so the JSON analysis columns are
+        never read and no relationship is lazy-loaded. Pages are keyed on
+        ``(match_date, id)``: the next page starts after the last row of
+        this one via an index range scan, however deep the client pages.
+        For a team, the page is picked from the home and away indexes
+        separately (see ``_team_page``). Returns the rows and the cursor of
+        the next page, or None on the last page.
+        """
+        keyset = None
+        if cursor:
+            match_date, match_id = decode_cursor(cursor)
+            keyset = tuple_(Match.match_date, Match.id) < tuple_(match_date, match_id)
+
+        home_team = aliased(Team)
+        away_team = aliased(Team)
+
+        query = (
+            select(
+                Match.id,
+                Match.home_team_id,
+                Match.away_team_id,
+                Match.competition_id,
+                Match.match_date,
+                Match.status,
+                Match.venue,
+                Match.referee,
+                Match.home_score,
+                Match.away_score,
+                Match.analysis_status,
+                Match.created_at,
+                Match.updated_at,
+                home_team.name.label("home_team_name"),
+                away_team.name.label("away_team_name"),
+                Competition.name.label("competition_name")
+            )
+            .join(home_team, Match.home_team_id == home_team.id)
+            .join(away_team, Match.away_team_id == away_team.id)
+            .outerjoin(Competition, Match.competition_id == Competition.id)
+            .order_by(Match.match_date.desc(), Match.id.desc())
+            .limit(limit + 1)
+        )
+
+        if team_id is not None:
+            page = self._team_page(team_id, limit, keyset)
+            query = query.join(page, Match.id == page.c.id)
+        elif keyset is not None:
+            query = query.where(keyset)
+
+        rows = [dict(row) for row in (await self.db.execute(query)).mappings()]
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["match_date"], rows[-1]["id"])
+        return rows, next_cursor
+
+    @staticmethod
+    def _team_page(team_id: int, limit: int, keyset=None):
+        """Ids of the next ``limit + 1`` matches a team played, as a subquery
+
+        An OR of the home and away team cannot be answered by one ordered
+        index scan, so each side reads at most ``limit + 1`` rows from its
+        own ``(team_id, match_date, id)`` index and the outer query orders
+        and limits the union. A match never has the same home and away
+        team, so UNION ALL returns no duplicates.
+        """
+        sides = []
+        for team_column in (Match.home_team_id, Match.away_team_id):
+            side = select(Match.id, Match.match_date).where(team_column == team_id)
+            if keyset is not None:
+                side = side.where(keyset)
+            side = side.order_by(Match.match_date.desc(), Match.id.desc()).limit(limit + 1)
+            # Wrapped so each side keeps its own ORDER BY/LIMIT in the union
+            sides.append(select(side.subquery()))
+        return union_all(*sides).subquery("team_page")
@@ -0,0 +1,201 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from models.match import Match, MatchTracks
+from models.player import Player, PlayerPerformance
+from typing import Any, Dict, Optional, Tuple
+from loguru import logger
+import numpy as np
+
+# Standard pitch in metres
+PITCH_SIZE = (105.0, 68.0)
+HEATMAP_GRID = (12, 8)
+
+# Speed above which a run counts as a sprint (25.2 km/h) and how long it must last
+SPRINT_SPEED = 7.0
+MIN_SPRINT_SECONDS = 1.0
+
+# Steps longer in time than this, or faster than any player can run, are
+# treated as tracking gaps rather than movement
+MAX_GAP_SECONDS = 1.0
+MAX_SPEED = 12.0
+
+
+def aggregate_tracks(
+    player_ids: np.ndarray,
+    timestamps: np.ndarray,
+    x: np.ndarray,
+    y: np.ndarray,
+    pitch_size: Tuple[float, float] = PITCH_SIZE,
+    grid: Tuple[int, int] = HEATMAP_GRID
+) -> Dict[int, Dict[str, Any]]:
+    """Compute heatmap, distance, sprints and average position for every player
+
+    ``x`` and ``y`` are positions normalised to 0-1 across the pitch. All
+    players are processed together with array operations: the samples are
+    sorted by player and time once, and per-player sums are taken with
+    ``np.bincount``.
+    """
+    if len(player_ids) == 0:
+        return {}
+
+    order = np.lexsort((timestamps, player_ids))
+    player_ids = np.asarray(player_ids)[order]
+    timestamps = np.asarray(timestamps, dtype=np.float64)[order]
+    x = np.clip(np.asarray(x, dtype=np.float64)[order], 0.0, 1.0)
+    y = np.clip(np.asarray(y, dtype=np.float64)[order], 0.0, 1.0)
+
+    players, player_index, samples = np.unique(player_ids, return_inverse=True, return_counts=True)
+    count = len(players)
+    metres_x = x * pitch_size[0]
+    metres_y = y * pitch_size[1]
+
+    # Steps between consecutive samples of the same player
+    dt = np.diff(timestamps)
+    step = np.hypot(np.diff(metres_x), np.diff(metres_y))
+    step_player = player_index[1:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        speed = np.where(dt > 0, step / dt, np.inf)
+    valid = (
+        (player_index[1:] == player_index[:-1])
+        & (dt > 0)
+        & (dt <= MAX_GAP_SECONDS)
+        & (speed <= MAX_SPEED)
+    )
+
+    distance = np.bincount(step_player[valid], weights=step[valid], minlength=count)
+    tracked = np.bincount(step_player[valid], weights=dt[valid], minlength=count)
+    max_speed = np.zeros(count)
+    np.maximum.at(max_speed, step_player[valid], speed[valid])
+
+    # Sprints are runs of consecutive valid steps at sprint speed
+    sprinting = valid & (speed >= SPRINT_SPEED)
+    starts = sprinting & ~np.concatenate([[False], sprinting[:-1]])
+    run_ids = np.cumsum(starts) - 1
+    run_seconds = np.bincount(run_ids[sprinting], weights=dt[sprinting], minlength=int(starts.sum()))
+    long_runs = run_seconds >= MIN_SPRINT_SECONDS
+    sprints = np.bincount(step_player[starts][long_runs], minlength=count)
+
+    # Occupancy grid: samples per cell, as a fraction of the player's samples
+    cell_x = np.minimum((x * grid[0]).astype(np.int64), grid[0] - 1)
+    cell_y = np.minimum((y * grid[1]).astype(np.int64), grid[1] - 1)
+    cells = player_index * grid[0] * grid[1] + cell_x * grid[1] + cell_y
+    occupancy = np.bincount(cells, minlength=count * grid[0] * grid[1]).reshape(count, grid[0], grid[1])
+    occupancy = occupancy / samples[:, np.newaxis, np.newaxis]
+
+    avg_x = np.bincount(player_index, weights=metres_x, minlength=count) / samples
+    avg_y = np.bincount(player_index, weights=metres_y, minlength=count) / samples
+
+    return {
+        int(player_id): {
+            "heatmap": {
+                "grid": np.round(occupancy[i], 4).tolist(),
+                "grid_size": list(grid),
+                "pitch_size": list(pitch_size),
+            },
+            "distance_covered": round(float(distance[i]), 1),
+            "sprints": int(sprints[i]),
+            "max_speed": round(float(max_speed[i]), 2),
+            "average_position": [round(float(avg_x[i]), 1), round(float(avg_y[i]), 1)],
+            "time_tracked": round(float(tracked[i]), 1),
+            "samples": int(samples[i]),
+        }
+        for i, player_id in enumerate(players)
+    }
+
+
+class PlayerAnalyticsService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def aggregate_match(self, match_id: int, tracks: MatchTracks) -> Optional[Match]:
+        """Aggregate a match's player tracks and store the results
+
+        Tracker IDs are mapped to players with ``tracks.player_map``; tracks
+        without a player are skipped. The per-player aggregates are written
+        to ``Match.heatmaps`` and ``Match.player_performance`` and folded
+        into each player's ``heatmap_data``, so reading them later is a
+        single row lookup.
+        """
+        match = await self.db.get(Match, match_id)
+        if not match:
+            return None
+
+        track_ids = np.asarray(tracks.player_id, dtype=np.int64)
+        mapped = np.full(len(track_ids), -1, dtype=np.int64)
+        if tracks.player_map:
+            keys = np.array([int(k) for k in tracks.player_map], dtype=np.int64)
+            values = np.array(list(tracks.player_map.values()), dtype=np.int64)
+            sort = np.argsort(keys)
+            keys, values = keys[sort], values[sort]
+            position = np.clip(np.searchsorted(keys, track_ids), 0, len(keys) - 1)
+            found = keys[position] == track_ids
+            mapped[found] = values[position[found]]
+
+        keep = mapped >= 0
+        if not keep.all():
+            logger.info(f"Match {match_id}: skipping {int((~keep).sum())} track samples without a player")
+
+        aggregates = aggregate_tracks(
+            mapped[keep],
+            np.asarray(tracks.timestamp)[keep],
+            np.asarray(tracks.x)[keep] / tracks.frame_width,
+            np.asarray(tracks.y)[keep] / tracks.frame_height
+        )
+
+        result = await self.db.execute(select(Player).where(Player.id.in_(list(aggregates))))
+        players = {player.id: player for player in result.scalars()}
+
+        match.heatmaps = {str(player_id): stats["heatmap"] for player_id, stats in aggregates.items()}
+        match.player_performance = [
+            PlayerPerformance(
+                player_id=player_id,
+                match_id=match_id,
+                position=players[player_id].position if player_id in players else None,
+                heatmap=stats["heatmap"],
+                distance_covered=stats["distance_covered"],
+                sprints=stats["sprints"],
+                max_speed=stats["max_speed"],
+                average_position=stats["average_position"]
+            ).model_dump()
+            for player_id, stats in aggregates.items()
+        ]
+
+        for player_id, player in players.items():
+            player.heatmap_data = self._fold_match(player.heatmap_data, match_id, aggregates[player_id])
+
+        await self.db.commit()
+        await self.db.refresh(match)
+
+        logger.info(f"Aggregated tracks of {len(aggregates)} players for match {match_id}")
+        return match
+
+    def _fold_match(
+        self,
+        heatmap_data: Optional[Dict[str, Any]],
+        match_id: int,
+        stats: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Add one match to a player's stored aggregates, replacing an earlier run of the same match"""
+        matches = dict((heatmap_data or {}).get("matches", {}))
+        matches[str(match_id)] = stats
+
+        per_match = list(matches.values())
+        samples = np.array([m["samples"] for m in per_match], dtype=np.float64)
+        grids = np.array([m["heatmap"]["grid"] for m in per_match])
+        positions = np.array([m["average_position"] for m in per_match])
+
+        # Totals are kept up to date here so reads never recompute them
+        return {
+            "matches": matches,
+            "totals": {
+                "matches_tracked": len(per_match),
+                "distance_covered": round(sum(m["distance_covered"] for m in per_match), 1),
+                "sprints": sum(m["sprints"] for m in per_match),
+                "max_speed": max(m["max_speed"] for m in per_match),
+                "average_position": np.round(np.average(positions, axis=0, weights=samples), 1).tolist(),
+                "heatmap": {
+                    **stats["heatmap"],
+                    "grid": np.round(np.average(grids, axis=0, weights=samples), 4).tolist(),
+                },
+            },
+        }
@@ -1,7 +1,8 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from models.user import User, UserCreate
-from core.security import get_password_hash
+from core.security import get_password_hash_async
+from core.user_cache import user_cache
 from typing import Optional
 from loguru import logger
 
@@ -28,7 +29,7 @@ class UserService:
     async def create_user(self, user_data: UserCreate) -> User:
         """Create a new user"""
         # Hash the password
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await get_password_hash_async(user_data.password)
         
         # Create user object
         user = User(
@@ -53,6 +54,7 @@ class UserService:
         user = await self.get_by_id(user_id)
         if not user:
             return None
+        previous_email = user.email
         
         # Update fields
         for field, value in update_data.items():
@@ -61,6 +63,7 @@ class UserService:
         
         await self.db.commit()
         await self.db.refresh(user)
+        await user_cache.invalidate(previous_email, user.email)
         
         logger.info(f"Updated user: {user.email}")
         return user
@@ -73,6 +76,7 @@ class UserService:
         
         await self.db.delete(user)
         await self.db.commit()
+        await user_cache.invalidate(user.email)
         
         logger.info(f"Deleted user: {user.email}")
         return True
@@ -86,6 +90,7 @@ class UserService:
         user.is_verified = True
         await self.db.commit()
         await self.db.refresh(user)
+        await user_cache.invalidate(user.email)
         
         logger.info(f"Verified user: {user.email}")
         return user 
\ No newline at end of file